@@ -29,6 +29,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # Import all models to ensure they are registered with Base.metadata
 from papercheck_app.models import *  # noqa: F401, F403
+from papercheck_app.services.partitions import PARTITION_NAME  # noqa: E402
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -37,6 +38,20 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_name(name, type_, parent_names):
+    """Leave the per-extractor partitions to services.partitions."""
+    if type_ == "table":
+        return not PARTITION_NAME.match(name)
+    return True
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip the foreign keys the database clones onto the partitions of referenced tables."""
+    if type_ == "foreign_key_constraint" and reflected:
+        return not PARTITION_NAME.match(object.referred_table.name)
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -53,6 +68,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -76,7 +93,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,28 @@
+"""Add dataset_papers paper_id index
+
+Revision ID: 2d9e4b7a1c05
+Revises: 7f6b0d3e5a21
+Create Date: 2026-10-17 16:12:30.481207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d9e4b7a1c05'
+down_revision: Union[str, Sequence[str], None] = '7f6b0d3e5a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_dataset_papers_paper_id', 'dataset_papers', ['paper_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_dataset_papers_paper_id', table_name='dataset_papers')
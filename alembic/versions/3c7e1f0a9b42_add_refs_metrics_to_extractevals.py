@@ -0,0 +1,36 @@
+"""Add refs metrics to extractevals
+
+Revision ID: 3c7e1f0a9b42
+Revises: 8a359dc4ba46
+Create Date: 2026-10-17 11:40:05.127734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e1f0a9b42'
+down_revision: Union[str, Sequence[str], None] = '8a359dc4ba46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('extractevals', sa.Column('refs_f1', sa.Float(), nullable=True))
+    op.add_column('extractevals', sa.Column('refs_precision', sa.Float(), nullable=True))
+    op.add_column('extractevals', sa.Column('refs_recall', sa.Float(), nullable=True))
+    op.add_column('extractevals', sa.Column('refs_jaccard_index', sa.Float(), nullable=True))
+    op.add_column('extractevals', sa.Column('refs_avg_title_levenshtein', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('extractevals', 'refs_avg_title_levenshtein')
+    op.drop_column('extractevals', 'refs_jaccard_index')
+    op.drop_column('extractevals', 'refs_recall')
+    op.drop_column('extractevals', 'refs_precision')
+    op.drop_column('extractevals', 'refs_f1')
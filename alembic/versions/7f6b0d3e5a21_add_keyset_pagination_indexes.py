@@ -0,0 +1,40 @@
+"""Add keyset pagination indexes
+
+Revision ID: 7f6b0d3e5a21
+Revises: e41a7c9d2b18
+Create Date: 2026-10-17 15:03:44.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f6b0d3e5a21'
+down_revision: Union[str, Sequence[str], None] = 'e41a7c9d2b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ('ix_papers_created_at_id', 'papers', ['created_at', 'id']),
+    ('ix_datasets_created_at_id', 'datasets', ['created_at', 'id']),
+    ('ix_extracts_created_at_id', 'extracts', ['created_at', 'id']),
+    ('ix_extracts_extractor_id_created_at_id', 'extracts', ['extractor_id', 'created_at', 'id']),
+    ('ix_extractevals_created_at_id', 'extractevals', ['created_at', 'id']),
+    ('ix_extractevals_extractor_id_created_at_id', 'extractevals', ['extractor_id', 'created_at', 'id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
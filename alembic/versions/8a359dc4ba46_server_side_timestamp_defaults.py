@@ -0,0 +1,35 @@
+"""Server-side timestamp defaults
+
+Revision ID: 8a359dc4ba46
+Revises: 51b22f3dfe1f
+Create Date: 2026-10-17 09:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a359dc4ba46'
+down_revision: Union[str, Sequence[str], None] = '51b22f3dfe1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('datasets', 'extractors', 'papers', 'extracts', 'ground_truths', 'extractevals')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=None)
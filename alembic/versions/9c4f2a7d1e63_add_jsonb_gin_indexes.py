@@ -0,0 +1,45 @@
+"""Add GIN jsonb_path_ops indexes on refs and authors
+
+Revision ID: 9c4f2a7d1e63
+Revises: 2d9e4b7a1c05
+Create Date: 2026-10-17 17:41:09.316520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f2a7d1e63'
+down_revision: Union[str, Sequence[str], None] = '2d9e4b7a1c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ('ix_extracts_extracted_refs_gin', 'extracts', 'extracted_refs'),
+    ('ix_extracts_extracted_authors_gin', 'extracts', 'extracted_authors'),
+    ('ix_ground_truths_refs_gin', 'ground_truths', 'refs'),
+    ('ix_ground_truths_authors_gin', 'ground_truths', 'authors'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, column in INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'jsonb_path_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,39 @@
+"""Add evaluated_at and metrics_version to extractevals
+
+Revision ID: a7d3e9b1c406
+Revises: f2a9d4c7e815
+Create Date: 2026-10-18 09:12:47.530918
+
+Existing evals take their metrics version from evaluation_details and their
+updated_at as the time they were evaluated.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b1c406'
+down_revision: Union[str, Sequence[str], None] = 'f2a9d4c7e815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('extractevals', sa.Column('evaluated_at', sa.DateTime(), nullable=True))
+    op.add_column('extractevals', sa.Column('metrics_version', sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE extractevals
+        SET evaluated_at = updated_at,
+            metrics_version = (evaluation_details ->> 'metrics_version')::integer
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('extractevals', 'metrics_version')
+    op.drop_column('extractevals', 'evaluated_at')
@@ -0,0 +1,45 @@
+"""Add authors metrics to extractevals
+
+Revision ID: b5d2e8c41f67
+Revises: 3c7e1f0a9b42
+Create Date: 2026-10-17 13:02:48.550913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2e8c41f67'
+down_revision: Union[str, Sequence[str], None] = '3c7e1f0a9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FLOAT_COLUMNS = (
+    'authors_f1',
+    'authors_precision',
+    'authors_recall',
+    'authors_jaccard_index',
+    'authors_avg_name_jaro_winkler',
+    'authors_avg_surname_jaro_winkler',
+    'authors_avg_given_name_jaro_winkler',
+    'authors_affiliation_match_rate',
+    'authors_email_match_rate',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('extractevals', sa.Column('authors_order_preserved', sa.Boolean(), nullable=True))
+    for column in FLOAT_COLUMNS:
+        op.add_column('extractevals', sa.Column(column, sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(FLOAT_COLUMNS):
+        op.drop_column('extractevals', column)
+    op.drop_column('extractevals', 'authors_order_preserved')
@@ -0,0 +1,86 @@
+"""Track extract and ground truth changes with a change sequence
+
+Revision ID: b9e1d5a3c720
+Revises: e6c2a9f4b813
+Create Date: 2026-10-18 21:04:19.372105
+
+extracts and ground_truths get a change_seq column drawn from the change_seq
+sequence on insert and, by trigger, on every update. Evals record the
+change_seq of the extract and ground truth they were scored from, and are
+stale when those differ (see services.evaluation.stale_condition).
+
+Evals that were up to date by the timestamps (evaluated_at not before the
+inputs' updated_at) take the current values; the others are left NULL and
+rescored by the next evaluate_stale. Adding the column rewrites extracts and
+ground_truths.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e1d5a3c720'
+down_revision: Union[str, Sequence[str], None] = 'e6c2a9f4b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('extracts', 'ground_truths')
+
+CREATE_TRIGGER_FUNCTION = """
+CREATE FUNCTION bump_change_seq() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_seq := nextval('change_seq');
+    RETURN NEW;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE SEQUENCE change_seq')
+    op.execute(CREATE_TRIGGER_FUNCTION)
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column('change_seq', sa.BigInteger(), server_default=sa.text("nextval('change_seq')"), nullable=False),
+        )
+        op.execute(
+            f'CREATE TRIGGER {table}_bump_change_seq BEFORE UPDATE ON {table} '
+            'FOR EACH ROW EXECUTE FUNCTION bump_change_seq()'
+        )
+    op.add_column('extractevals', sa.Column('extract_change_seq', sa.BigInteger(), nullable=True))
+    op.add_column('extractevals', sa.Column('ground_truth_change_seq', sa.BigInteger(), nullable=True))
+    op.execute(
+        """
+        UPDATE extractevals
+        SET extract_change_seq = extracts.change_seq
+        FROM extracts
+        WHERE extracts.id = extractevals.extract_id
+          AND extracts.extractor_id = extractevals.extractor_id
+          AND extracts.updated_at <= extractevals.evaluated_at
+        """
+    )
+    op.execute(
+        """
+        UPDATE extractevals
+        SET ground_truth_change_seq = ground_truths.change_seq
+        FROM ground_truths
+        WHERE ground_truths.id = extractevals.ground_truth_id
+          AND ground_truths.updated_at <= extractevals.evaluated_at
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('extractevals', 'ground_truth_change_seq')
+    op.drop_column('extractevals', 'extract_change_seq')
+    for table in TABLES:
+        op.execute(f'DROP TRIGGER {table}_bump_change_seq ON {table}')
+        op.drop_column(table, 'change_seq')
+    op.execute('DROP FUNCTION bump_change_seq()')
+    op.execute('DROP SEQUENCE change_seq')
@@ -0,0 +1,55 @@
+"""Add generated search_vector columns for full-text search
+
+Revision ID: c8e3b6f2d904
+Revises: 9c4f2a7d1e63
+Create Date: 2026-10-17 18:27:51.604118
+
+Adding a stored generated column rewrites the table, computing the vector
+of every existing row, so expect this to take a while on large tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e3b6f2d904'
+down_revision: Union[str, Sequence[str], None] = '9c4f2a7d1e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTORS = (
+    ('extracts', 'extracted_title', 'extracted_abstract'),
+    ('ground_truths', 'title', 'abstract'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, title, abstract in SEARCH_VECTORS:
+        op.add_column(
+            table,
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(
+                    f"setweight(to_tsvector('english'::regconfig, coalesce({title}, '')), 'A') || "
+                    f"setweight(to_tsvector('english'::regconfig, coalesce({abstract}, '')), 'B')",
+                    persisted=True,
+                ),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _, _ in reversed(SEARCH_VECTORS):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,226 @@
+"""Partition extracts, extractevals and extract_minhashes by extractor
+
+Revision ID: d4b8f1e6a297
+Revises: a7d3e9b1c406
+Create Date: 2026-10-18 14:37:02.118645
+
+Each table is rebuilt as a LIST (extractor_id) partitioned table with one
+partition per extractor, created by a trigger on extractors (see
+services.partitions), and its rows copied over. The partition key must be
+part of every unique constraint, so the primary keys become (id,
+extractor_id) and references to extracts carry the extractor ID:
+extract_minhashes and near_duplicate_pairs get extractor ID columns. IDs keep
+coming from the existing sequences.
+
+The rows are copied, so the upgrade takes time and space in proportion to
+the three tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b8f1e6a297'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e9b1c406'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('extracts', 'extractevals', 'extract_minhashes')
+
+# Columns copied between the old and new tables, spelled out so the
+# migration also renders offline (--sql); the generated search_vector is
+# recomputed, not copied
+COLUMNS = {
+    'extracts': (
+        'id', 'paper_id', 'extractor_id', 'extraction_date', 'extracted_title', 'extracted_doi',
+        'extracted_authors', 'extracted_refs', 'extracted_xrefs', 'extracted_abstract', 'extracted_keywords',
+        'processing_time_seconds', 'status', 'error_message', 'created_at', 'updated_at',
+    ),
+    'extractevals': (
+        'id', 'extract_id', 'extractor_id', 'ground_truth_id', 'evaluation_date', 'evaluated_at',
+        'metrics_version', 'title_exact_match', 'title_levenshtein_distance', 'title_semantic_similarity',
+        'title_length_ratio', 'doi_exact_match', 'doi_is_valid', 'abstract_rouge_l', 'abstract_bert_score',
+        'keywords_jaccard_index', 'keywords_f1', 'keywords_precision', 'keywords_recall',
+        'keywords_avg_jaro_winkler', 'refs_f1', 'refs_precision', 'refs_recall', 'refs_jaccard_index',
+        'refs_avg_title_levenshtein', 'authors_order_preserved', 'authors_f1', 'authors_precision',
+        'authors_recall', 'authors_jaccard_index', 'authors_avg_name_jaro_winkler',
+        'authors_avg_surname_jaro_winkler', 'authors_avg_given_name_jaro_winkler',
+        'authors_affiliation_match_rate', 'authors_email_match_rate', 'notes', 'evaluation_details',
+        'created_at', 'updated_at',
+    ),
+    'extract_minhashes': (
+        'id', 'extract_id', 'paper_id', 'signature', 'band_hashes', 'shingle_count', 'created_at', 'updated_at',
+    ),
+}
+# The upgrade adds extractor_id to extract_minhashes before the copy
+PARTITIONED_COLUMNS = {**COLUMNS, 'extract_minhashes': COLUMNS['extract_minhashes'] + ('extractor_id',)}
+
+CREATE_PARTITIONS_FUNCTION = """
+CREATE FUNCTION create_extractor_partitions(extractor integer) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    parent text;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['extracts', 'extractevals', 'extract_minhashes'] LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES IN (%s)',
+            parent || '_extractor_' || extractor, parent, extractor
+        );
+    END LOOP;
+END
+$$
+"""
+
+CREATE_TRIGGER_FUNCTION = """
+CREATE FUNCTION extractors_create_partitions() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM create_extractor_partitions(NEW.id);
+    RETURN NULL;
+END
+$$
+"""
+
+
+def _replace(table: str, partitioned: bool) -> None:
+    """Rename ``table`` to ``<table>_old`` and create an empty copy of its columns in its place."""
+    op.rename_table(table, f'{table}_old')
+    op.drop_constraint(f'{table}_pkey', f'{table}_old', type_='primary')
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS INCLUDING GENERATED)'
+        + (' PARTITION BY LIST (extractor_id)' if partitioned else '')
+    )
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+
+def _copy(table: str, columns: Sequence[str]) -> None:
+    """Move the rows of ``<table>_old`` into ``table`` and drop the old table."""
+    columns = ', '.join(columns)
+    op.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_old')
+    op.drop_table(f'{table}_old')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('extractevals_extract_id_fkey', 'extractevals', type_='foreignkey')
+    op.drop_constraint('extract_minhashes_extract_id_fkey', 'extract_minhashes', type_='foreignkey')
+    op.drop_constraint('near_duplicate_pairs_extract_id_fkey', 'near_duplicate_pairs', type_='foreignkey')
+    op.drop_constraint('near_duplicate_pairs_duplicate_id_fkey', 'near_duplicate_pairs', type_='foreignkey')
+    op.drop_constraint('extract_minhashes_extract_id_key', 'extract_minhashes', type_='unique')
+
+    op.add_column('extract_minhashes', sa.Column('extractor_id', sa.Integer(), nullable=True))
+    op.execute(
+        'UPDATE extract_minhashes SET extractor_id = extracts.extractor_id '
+        'FROM extracts WHERE extracts.id = extract_minhashes.extract_id'
+    )
+    op.alter_column('extract_minhashes', 'extractor_id', nullable=False)
+
+    for table in TABLES:
+        _replace(table, partitioned=True)
+    op.execute(CREATE_PARTITIONS_FUNCTION)
+    op.execute(CREATE_TRIGGER_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER extractors_create_partitions AFTER INSERT ON extractors '
+        'FOR EACH ROW EXECUTE FUNCTION extractors_create_partitions()'
+    )
+    op.execute('SELECT create_extractor_partitions(id) FROM extractors')
+    for table in TABLES:
+        _copy(table, PARTITIONED_COLUMNS[table])
+
+    op.create_primary_key('extracts_pkey', 'extracts', ['id', 'extractor_id'])
+    op.create_foreign_key(None, 'extracts', 'papers', ['paper_id'], ['id'])
+    op.create_foreign_key(None, 'extracts', 'extractors', ['extractor_id'], ['id'])
+    op.create_index(op.f('ix_extracts_id'), 'extracts', ['id'], unique=False)
+    op.create_index(op.f('ix_extracts_paper_id'), 'extracts', ['paper_id'], unique=False)
+    op.create_index('ix_extracts_created_at_id', 'extracts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_extracts_extracted_refs_gin', 'extracts', ['extracted_refs'], unique=False, postgresql_using='gin', postgresql_ops={'extracted_refs': 'jsonb_path_ops'})
+    op.create_index('ix_extracts_extracted_authors_gin', 'extracts', ['extracted_authors'], unique=False, postgresql_using='gin', postgresql_ops={'extracted_authors': 'jsonb_path_ops'})
+    op.create_index('ix_extracts_search_vector', 'extracts', ['search_vector'], unique=False, postgresql_using='gin')
+
+    op.create_primary_key('extractevals_pkey', 'extractevals', ['id', 'extractor_id'])
+    op.create_unique_constraint('_extracteval_extract_uc', 'extractevals', ['extract_id', 'extractor_id'])
+    op.create_foreign_key(None, 'extractevals', 'extracts', ['extract_id', 'extractor_id'], ['id', 'extractor_id'])
+    op.create_foreign_key(None, 'extractevals', 'extractors', ['extractor_id'], ['id'])
+    op.create_foreign_key(None, 'extractevals', 'ground_truths', ['ground_truth_id'], ['id'])
+    op.create_index(op.f('ix_extractevals_id'), 'extractevals', ['id'], unique=False)
+    op.create_index(op.f('ix_extractevals_ground_truth_id'), 'extractevals', ['ground_truth_id'], unique=False)
+    op.create_index('ix_extractevals_created_at_id', 'extractevals', ['created_at', 'id'], unique=False)
+
+    op.create_primary_key('extract_minhashes_pkey', 'extract_minhashes', ['id', 'extractor_id'])
+    op.create_unique_constraint('_extract_minhash_extract_uc', 'extract_minhashes', ['extract_id', 'extractor_id'])
+    op.create_foreign_key(None, 'extract_minhashes', 'extracts', ['extract_id', 'extractor_id'], ['id', 'extractor_id'], ondelete='CASCADE')
+    op.create_foreign_key(None, 'extract_minhashes', 'papers', ['paper_id'], ['id'], ondelete='CASCADE')
+    op.create_index(op.f('ix_extract_minhashes_id'), 'extract_minhashes', ['id'], unique=False)
+    op.create_index(op.f('ix_extract_minhashes_paper_id'), 'extract_minhashes', ['paper_id'], unique=False)
+    op.create_index('ix_extract_minhashes_band_hashes', 'extract_minhashes', ['band_hashes'], unique=False, postgresql_using='gin', postgresql_with={'fastupdate': 'off'})
+
+    op.add_column('near_duplicate_pairs', sa.Column('extractor_id', sa.Integer(), nullable=True))
+    op.add_column('near_duplicate_pairs', sa.Column('duplicate_extractor_id', sa.Integer(), nullable=True))
+    op.execute(
+        'UPDATE near_duplicate_pairs SET extractor_id = a.extractor_id, duplicate_extractor_id = b.extractor_id '
+        'FROM extracts a, extracts b '
+        'WHERE a.id = near_duplicate_pairs.extract_id AND b.id = near_duplicate_pairs.duplicate_id'
+    )
+    op.alter_column('near_duplicate_pairs', 'extractor_id', nullable=False)
+    op.alter_column('near_duplicate_pairs', 'duplicate_extractor_id', nullable=False)
+    op.create_foreign_key(None, 'near_duplicate_pairs', 'extracts', ['extract_id', 'extractor_id'], ['id', 'extractor_id'], ondelete='CASCADE')
+    op.create_foreign_key(None, 'near_duplicate_pairs', 'extracts', ['duplicate_id', 'duplicate_extractor_id'], ['id', 'extractor_id'], ondelete='CASCADE')
+    op.create_index(op.f('ix_near_duplicate_pairs_extractor_id'), 'near_duplicate_pairs', ['extractor_id'], unique=False)
+    op.create_index(op.f('ix_near_duplicate_pairs_duplicate_extractor_id'), 'near_duplicate_pairs', ['duplicate_extractor_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_near_duplicate_pairs_duplicate_extractor_id'), table_name='near_duplicate_pairs')
+    op.drop_index(op.f('ix_near_duplicate_pairs_extractor_id'), table_name='near_duplicate_pairs')
+    op.drop_constraint('near_duplicate_pairs_extract_id_extractor_id_fkey', 'near_duplicate_pairs', type_='foreignkey')
+    op.drop_constraint('near_duplicate_pairs_duplicate_id_duplicate_extractor_id_fkey', 'near_duplicate_pairs', type_='foreignkey')
+    op.drop_column('near_duplicate_pairs', 'duplicate_extractor_id')
+    op.drop_column('near_duplicate_pairs', 'extractor_id')
+    op.drop_constraint('extract_minhashes_extract_id_extractor_id_fkey', 'extract_minhashes', type_='foreignkey')
+    op.drop_constraint('extractevals_extract_id_extractor_id_fkey', 'extractevals', type_='foreignkey')
+
+    for table in TABLES:
+        _replace(table, partitioned=False)
+    op.drop_column('extract_minhashes', 'extractor_id')
+    for table in TABLES:
+        _copy(table, COLUMNS[table])
+    op.execute('DROP TRIGGER extractors_create_partitions ON extractors')
+    op.execute('DROP FUNCTION extractors_create_partitions()')
+    op.execute('DROP FUNCTION create_extractor_partitions(integer)')
+
+    op.create_primary_key('extracts_pkey', 'extracts', ['id'])
+    op.create_foreign_key(None, 'extracts', 'papers', ['paper_id'], ['id'])
+    op.create_foreign_key(None, 'extracts', 'extractors', ['extractor_id'], ['id'])
+    op.create_index(op.f('ix_extracts_id'), 'extracts', ['id'], unique=False)
+    op.create_index(op.f('ix_extracts_paper_id'), 'extracts', ['paper_id'], unique=False)
+    op.create_index(op.f('ix_extracts_extractor_id'), 'extracts', ['extractor_id'], unique=False)
+    op.create_index('ix_extracts_created_at_id', 'extracts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_extracts_extractor_id_created_at_id', 'extracts', ['extractor_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_extracts_extracted_refs_gin', 'extracts', ['extracted_refs'], unique=False, postgresql_using='gin', postgresql_ops={'extracted_refs': 'jsonb_path_ops'})
+    op.create_index('ix_extracts_extracted_authors_gin', 'extracts', ['extracted_authors'], unique=False, postgresql_using='gin', postgresql_ops={'extracted_authors': 'jsonb_path_ops'})
+    op.create_index('ix_extracts_search_vector', 'extracts', ['search_vector'], unique=False, postgresql_using='gin')
+
+    op.create_primary_key('extractevals_pkey', 'extractevals', ['id'])
+    op.create_foreign_key(None, 'extractevals', 'extracts', ['extract_id'], ['id'])
+    op.create_foreign_key(None, 'extractevals', 'extractors', ['extractor_id'], ['id'])
+    op.create_foreign_key(None, 'extractevals', 'ground_truths', ['ground_truth_id'], ['id'])
+    op.create_index(op.f('ix_extractevals_id'), 'extractevals', ['id'], unique=False)
+    op.create_index(op.f('ix_extractevals_extract_id'), 'extractevals', ['extract_id'], unique=True)
+    op.create_index(op.f('ix_extractevals_extractor_id'), 'extractevals', ['extractor_id'], unique=False)
+    op.create_index(op.f('ix_extractevals_ground_truth_id'), 'extractevals', ['ground_truth_id'], unique=False)
+    op.create_index('ix_extractevals_created_at_id', 'extractevals', ['created_at', 'id'], unique=False)
+    op.create_index('ix_extractevals_extractor_id_created_at_id', 'extractevals', ['extractor_id', 'created_at', 'id'], unique=False)
+
+    op.create_primary_key('extract_minhashes_pkey', 'extract_minhashes', ['id'])
+    op.create_unique_constraint(None, 'extract_minhashes', ['extract_id'])
+    op.create_foreign_key(None, 'extract_minhashes', 'extracts', ['extract_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key(None, 'extract_minhashes', 'papers', ['paper_id'], ['id'], ondelete='CASCADE')
+    op.create_index(op.f('ix_extract_minhashes_id'), 'extract_minhashes', ['id'], unique=False)
+    op.create_index(op.f('ix_extract_minhashes_paper_id'), 'extract_minhashes', ['paper_id'], unique=False)
+    op.create_index('ix_extract_minhashes_band_hashes', 'extract_minhashes', ['band_hashes'], unique=False, postgresql_using='gin', postgresql_with={'fastupdate': 'off'})
+
+    op.create_foreign_key(None, 'near_duplicate_pairs', 'extracts', ['extract_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key(None, 'near_duplicate_pairs', 'extracts', ['duplicate_id'], ['id'], ondelete='CASCADE')
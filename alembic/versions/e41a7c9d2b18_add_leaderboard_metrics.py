@@ -0,0 +1,95 @@
+"""Add leaderboard_metrics aggregate table
+
+Revision ID: e41a7c9d2b18
+Revises: b5d2e8c41f67
+Create Date: 2026-10-17 14:21:07.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41a7c9d2b18'
+down_revision: Union[str, Sequence[str], None] = 'b5d2e8c41f67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Metric columns at the time of this revision; booleans count as 0/1
+METRIC_COLUMNS = (
+    'title_exact_match',
+    'title_levenshtein_distance',
+    'title_length_ratio',
+    'doi_exact_match',
+    'doi_is_valid',
+    'abstract_rouge_l',
+    'keywords_jaccard_index',
+    'keywords_f1',
+    'keywords_precision',
+    'keywords_recall',
+    'keywords_avg_jaro_winkler',
+    'authors_order_preserved',
+    'authors_f1',
+    'authors_precision',
+    'authors_recall',
+    'authors_jaccard_index',
+    'authors_avg_name_jaro_winkler',
+    'authors_avg_surname_jaro_winkler',
+    'authors_avg_given_name_jaro_winkler',
+    'authors_affiliation_match_rate',
+    'authors_email_match_rate',
+    'refs_f1',
+    'refs_precision',
+    'refs_recall',
+    'refs_jaccard_index',
+    'refs_avg_title_levenshtein',
+)
+BOOLEAN_COLUMNS = {'authors_order_preserved', 'doi_exact_match', 'doi_is_valid', 'title_exact_match'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('leaderboard_metrics',
+    sa.Column('extractor_id', sa.Integer(), nullable=False),
+    sa.Column('dataset_id', sa.Integer(), nullable=False),
+    sa.Column('metric', sa.String(length=64), nullable=False),
+    sa.Column('value_sum', sa.Float(), nullable=False),
+    sa.Column('value_count', sa.Integer(), nullable=False),
+    sa.Column('eval_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['extractor_id'], ['extractors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('extractor_id', 'dataset_id', 'metric', name='_leaderboard_extractor_dataset_metric_uc')
+    )
+    op.create_index(op.f('ix_leaderboard_metrics_dataset_id'), 'leaderboard_metrics', ['dataset_id'], unique=False)
+    op.create_index(op.f('ix_leaderboard_metrics_extractor_id'), 'leaderboard_metrics', ['extractor_id'], unique=False)
+    op.create_index(op.f('ix_leaderboard_metrics_id'), 'leaderboard_metrics', ['id'], unique=False)
+
+    # Backfill from the evals already stored
+    metric_values = ', '.join(
+        f"('{column}', e.{column}{'::int' if column in BOOLEAN_COLUMNS else ''}::float8)"
+        for column in METRIC_COLUMNS
+    )
+    op.execute(f"""
+        INSERT INTO leaderboard_metrics (extractor_id, dataset_id, metric, value_sum, value_count, eval_count)
+        SELECT e.extractor_id, dp.dataset_id, m.metric, coalesce(sum(m.value), 0), count(m.value), count(*)
+        FROM extractevals e
+        JOIN extracts x ON x.id = e.extract_id
+        JOIN dataset_papers dp ON dp.paper_id = x.paper_id
+        CROSS JOIN LATERAL (VALUES {metric_values}) AS m (metric, value)
+        GROUP BY e.extractor_id, dp.dataset_id, m.metric
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_leaderboard_metrics_id'), table_name='leaderboard_metrics')
+    op.drop_index(op.f('ix_leaderboard_metrics_extractor_id'), table_name='leaderboard_metrics')
+    op.drop_index(op.f('ix_leaderboard_metrics_dataset_id'), table_name='leaderboard_metrics')
+    op.drop_table('leaderboard_metrics')
@@ -0,0 +1,81 @@
+"""Add extract_references
+
+Revision ID: e6c2a9f4b813
+Revises: d4b8f1e6a297
+Create Date: 2026-10-18 19:12:47.530918
+
+One row per extracted reference, partitioned by extractor like extracts:
+create_extractor_partitions now also creates extract_references partitions,
+and they are created here for the existing extractors.
+
+References are normalized in Python, so existing extracts are not loaded
+here: run ``POST /references/load`` (or ``extract_references.load_missing``)
+once after upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6c2a9f4b813'
+down_revision: Union[str, Sequence[str], None] = 'd4b8f1e6a297'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CREATE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_extractor_partitions(extractor integer) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    parent text;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY[%s] LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %%I PARTITION OF %%I FOR VALUES IN (%%s)',
+            parent || '_extractor_' || extractor, parent, extractor
+        );
+    END LOOP;
+END
+$$
+"""
+
+
+def _partitions_function(*tables: str) -> str:
+    return CREATE_PARTITIONS_FUNCTION % ', '.join(f"'{table}'" for table in tables)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('extract_references',
+    sa.Column('extract_id', sa.Integer(), nullable=False),
+    sa.Column('extractor_id', sa.Integer(), nullable=False),
+    sa.Column('ordinal', sa.Integer(), nullable=False),
+    sa.Column('doi', sa.String(length=255), nullable=True),
+    sa.Column('title', sa.Text(), nullable=True),
+    sa.Column('title_normalized', sa.Text(), nullable=True),
+    sa.Column('year', sa.Integer(), nullable=True),
+    sa.Column('raw', sa.Text(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['extract_id', 'extractor_id'], ['extracts.id', 'extracts.extractor_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'extractor_id'),
+    sa.UniqueConstraint('extract_id', 'extractor_id', 'ordinal', name='_extract_reference_ordinal_uc'),
+    postgresql_partition_by='LIST (extractor_id)'
+    )
+    op.create_index(op.f('ix_extract_references_id'), 'extract_references', ['id'], unique=False)
+    op.create_index('ix_extract_references_doi', 'extract_references', ['doi'], unique=False)
+    op.create_index('ix_extract_references_title_normalized', 'extract_references', ['title_normalized'], unique=False)
+
+    op.execute(_partitions_function('extracts', 'extractevals', 'extract_minhashes', 'extract_references'))
+    op.execute('SELECT create_extractor_partitions(id) FROM extractors')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(_partitions_function('extracts', 'extractevals', 'extract_minhashes'))
+    op.drop_index('ix_extract_references_title_normalized', table_name='extract_references')
+    op.drop_index('ix_extract_references_doi', table_name='extract_references')
+    op.drop_index(op.f('ix_extract_references_id'), table_name='extract_references')
+    op.drop_table('extract_references')
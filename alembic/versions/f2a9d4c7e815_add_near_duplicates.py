@@ -0,0 +1,76 @@
+"""Add extract_minhashes and near_duplicate_pairs
+
+Revision ID: f2a9d4c7e815
+Revises: c8e3b6f2d904
+Create Date: 2026-10-17 20:06:33.871402
+
+Signatures are computed in Python, so existing extracts are not backfilled
+here: run ``POST /duplicates/index`` (or ``near_duplicates.index_missing``)
+once after upgrading.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9d4c7e815'
+down_revision: Union[str, Sequence[str], None] = 'c8e3b6f2d904'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('extract_minhashes',
+    sa.Column('extract_id', sa.Integer(), nullable=False),
+    sa.Column('paper_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('band_hashes', postgresql.ARRAY(sa.BigInteger()), nullable=False),
+    sa.Column('shingle_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['extract_id'], ['extracts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['paper_id'], ['papers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('extract_id')
+    )
+    op.create_index(op.f('ix_extract_minhashes_id'), 'extract_minhashes', ['id'], unique=False)
+    op.create_index(op.f('ix_extract_minhashes_paper_id'), 'extract_minhashes', ['paper_id'], unique=False)
+    op.create_index('ix_extract_minhashes_band_hashes', 'extract_minhashes', ['band_hashes'], unique=False, postgresql_using='gin', postgresql_with={'fastupdate': 'off'})
+    op.create_table('near_duplicate_pairs',
+    sa.Column('extract_id', sa.Integer(), nullable=False),
+    sa.Column('duplicate_id', sa.Integer(), nullable=False),
+    sa.Column('paper_id', sa.Integer(), nullable=False),
+    sa.Column('duplicate_paper_id', sa.Integer(), nullable=False),
+    sa.Column('similarity', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['duplicate_id'], ['extracts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['duplicate_paper_id'], ['papers.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['extract_id'], ['extracts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['paper_id'], ['papers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('extract_id', 'duplicate_id', name='_near_duplicate_pair_uc')
+    )
+    op.create_index(op.f('ix_near_duplicate_pairs_duplicate_id'), 'near_duplicate_pairs', ['duplicate_id'], unique=False)
+    op.create_index(op.f('ix_near_duplicate_pairs_duplicate_paper_id'), 'near_duplicate_pairs', ['duplicate_paper_id'], unique=False)
+    op.create_index(op.f('ix_near_duplicate_pairs_id'), 'near_duplicate_pairs', ['id'], unique=False)
+    op.create_index(op.f('ix_near_duplicate_pairs_paper_id'), 'near_duplicate_pairs', ['paper_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_near_duplicate_pairs_paper_id'), table_name='near_duplicate_pairs')
+    op.drop_index(op.f('ix_near_duplicate_pairs_id'), table_name='near_duplicate_pairs')
+    op.drop_index(op.f('ix_near_duplicate_pairs_duplicate_paper_id'), table_name='near_duplicate_pairs')
+    op.drop_index(op.f('ix_near_duplicate_pairs_duplicate_id'), table_name='near_duplicate_pairs')
+    op.drop_table('near_duplicate_pairs')
+    op.drop_index('ix_extract_minhashes_band_hashes', table_name='extract_minhashes', postgresql_using='gin')
+    op.drop_index(op.f('ix_extract_minhashes_paper_id'), table_name='extract_minhashes')
+    op.drop_index(op.f('ix_extract_minhashes_id'), table_name='extract_minhashes')
+    op.drop_table('extract_minhashes')
@@ -0,0 +1,103 @@
+"""Author-list alignment on consortium-sized lists.
+
+Times the authors_* metrics of one extract against its ground truth on a
+1500-author consortium list drawn from a small pool of surnames, so many
+authors share a surname and given-name initial: a noisy extraction with
+full given names, one with initials only and one where no name matches
+exactly, and a list where every author is a "J. Wang", which is matched
+greedily::
+
+    python -m benchmarks.authors [--size 1500] [--seed 1]
+"""
+
+import argparse
+import random
+
+from papercheck_app.services import authors
+
+from .common import measure, mutate, print_table
+
+SURNAMES = (
+    "wang li zhang liu chen yang huang zhao wu zhou xu sun ma zhu hu guo he lin "
+    "smith johnson williams brown jones garcia miller davis rodriguez martinez "
+    "muller schmidt schneider fischer weber meyer wagner becker schulz hoffmann "
+    "kim lee park choi jung kang cho yoon jang lim rossi russo ferrari esposito "
+    "bianchi romano colombo ricci marino greco nguyen tran le pham hoang phan"
+).split()
+GIVEN = (
+    "james john robert michael william david richard joseph thomas charles mary "
+    "patricia jennifer linda elizabeth barbara susan jessica sarah karen wei jing "
+    "min hui yan jun lei tao marco luca giulia anna maria hans peter klaus jan "
+    "eva minh anh thi van hyun jin soo young"
+).split()
+
+
+def consortium(rng: random.Random, size: int):
+    """A ground truth consortium author list with many shared surnames and initials."""
+    return [
+        {"given": rng.choice(GIVEN), "surname": rng.choice(SURNAMES), "email": f"author{n}@example.org"}
+        for n in range(size)
+    ]
+
+
+def noisy_extraction(rng: random.Random, truth, initials: bool = False, typo_rate: float = 0.1):
+    """An extraction of ``truth``: missed and spurious authors, surname typos, initials."""
+    extracted = []
+    for author in truth:
+        if rng.random() < 0.05:
+            continue  # missed by the extractor
+        surname = author["surname"]
+        if rng.random() < typo_rate:
+            surname = mutate(rng, surname, 1)
+        given = author["given"][0] if initials or rng.random() < 0.3 else author["given"]
+        extracted.append({"given": given, "surname": surname})
+    extracted += [{"given": rng.choice(GIVEN), "surname": rng.choice(SURNAMES)} for _ in range(len(truth) // 50)]
+    return {"authors": extracted}
+
+
+def single_block(rng: random.Random, size: int):
+    """Ground truth authors all sharing one surname and initial, and a noisy extraction."""
+    truth = [
+        {"given": "j" + "".join(rng.choice("aeiou") + rng.choice("nmrs") for _ in range(3)), "surname": "wang"}
+        for _ in range(size)
+    ]
+    extracted = [
+        {"given": author["given"][0] if rng.random() < 0.5 else mutate(rng, author["given"], 1), "surname": "wang"}
+        for author in truth
+        if rng.random() >= 0.05
+    ]
+    return {"authors": extracted}, {"authors": truth}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    truth_payload = {"authors": consortium(rng, args.size)}
+    cases = [
+        ("noisy, 30% initials", noisy_extraction(rng, truth_payload["authors"]), truth_payload),
+        ("initials only", noisy_extraction(rng, truth_payload["authors"], initials=True), truth_payload),
+        ("every surname mistyped", noisy_extraction(rng, truth_payload["authors"], typo_rate=1.0), truth_payload),
+        ("one surname and initial", *single_block(rng, args.size)),
+    ]
+    rows = []
+    for name, extracted_payload, truth_payload in cases:
+        extracted = authors.parse_authors(extracted_payload)
+        truth = authors.parse_authors(truth_payload)
+        scores = authors.author_metrics(extracted_payload, truth_payload)
+        rows.append((
+            name,
+            len(extracted),
+            f"{scores['authors_f1']:.3f}",
+            f"{measure(lambda: authors.align_authors(extracted, truth), runs=3) * 1000:.1f}",
+            f"{measure(lambda: authors.author_metrics(extracted_payload, truth_payload), runs=3) * 1000:.1f}",
+        ))
+    print(f"{args.size} ground truth authors")
+    print_table(("extraction", "authors", "authors_f1", "align ms", "author_metrics ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Helpers shared by the benchmark scripts."""
+
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Vocabulary of the synthetic titles and abstracts
+WORDS = (
+    "learning deep neural network model analysis data study effect evidence "
+    "replication bias meta open science survey cognitive social memory attention "
+    "language bayesian inference estimation regression variance sample power "
+    "experiment participants response reaction time priming decision risk reward "
+    "brain imaging structural functional connectivity signal noise framework "
+    "theory prediction validation robust causal longitudinal cross cultural"
+).split()
+
+
+def synthetic_title(rng: random.Random, words: int = 12) -> str:
+    """A title-like string of ``words`` vocabulary words, the first capitalized."""
+    title = " ".join(rng.choice(WORDS) for _ in range(words))
+    return title[:1].upper() + title[1:]
+
+
+def mutate(rng: random.Random, text: str, edits: int) -> str:
+    """``text`` with ``edits`` random single-character insertions, deletions or substitutions."""
+    chars = list(text)
+    for _ in range(edits):
+        position = rng.randrange(len(chars) + 1)
+        operation = rng.choice("ids")
+        if operation == "i" or position == len(chars):
+            chars.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz "))
+        elif operation == "d":
+            del chars[position]
+        else:
+            chars[position] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return "".join(chars)
+
+
+def measure(fn: Callable[[], object], runs: int = 5, warmup: int = 1) -> float:
+    """Median wall time of ``fn()`` in seconds over ``runs`` runs."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def print_table(header: Sequence[str], rows: List[Sequence[object]]) -> None:
+    """Print rows as a plain text table, the first column left-aligned."""
+    cells = [list(map(str, header))] + [[str(value) for value in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+    for n, row in enumerate(cells):
+        print("  ".join(
+            value.ljust(widths[i]) if i == 0 else value.rjust(widths[i]) for i, value in enumerate(row)
+        ))
+        if n == 0:
+            print("  ".join("-" * width for width in widths))
+
+
+@contextmanager
+def rolled_back_session() -> Iterator[Session]:
+    """Session on ``DATABASE_URL`` whose work, service commits included, is rolled back at the end.
+
+    Benchmarks fill the real tables with synthetic rows (new extractors get
+    their own partitions) and leave the database as they found it.
+    """
+    from papercheck_app.core.database import engine
+
+    engine.echo = False
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            # Single-process timings, comparable across machines
+            session.execute(text("SET LOCAL max_parallel_workers_per_gather = 0"))
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+
+def synthetic_papers(db: Session, count: int, tag: str) -> List[int]:
+    """Insert ``count`` papers (pdf_path ``<tag>/<n>.pdf``) and return their IDs in order."""
+    return list(db.scalars(
+        text(
+            "INSERT INTO papers (pdf_path, pdf_actual_start_page) SELECT :tag || '/' || n || '.pdf', 1 "
+            "FROM generate_series(1, :count) AS n ORDER BY n RETURNING id"
+        ),
+        {"tag": tag, "count": count},
+    ))
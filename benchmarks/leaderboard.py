@@ -0,0 +1,204 @@
+"""Leaderboard refresh cost.
+
+Fills the real tables with synthetic papers, ground truths, extracts and
+evals of a few extractors, in two overlapping datasets, inside a transaction
+that is rolled back at the end. Then times:
+
+- upserting a batch of new evals, and re-upserting it with new values, with
+  the incremental aggregate refresh of ``upsert_extractevals`` and as a plain
+  upsert without it;
+- ``rebuild_leaderboard`` of each dataset, the full recount;
+- reading a dataset's leaderboard from the aggregates, against the AVG over
+  ``extractevals`` it replaces.
+
+The incrementally refreshed aggregates are checked against a rebuild::
+
+    python -m benchmarks.leaderboard [--papers 100000] [--extractors 3] [--batch 500]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import Boolean, Float, Integer, cast, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from papercheck_app.models import Dataset, Extract, ExtractEval, Extractor, LeaderboardMetric, dataset_paper_association
+from papercheck_app.services import evaluation, leaderboard
+from papercheck_app.services.metrics import METRIC_COLUMNS
+
+from .common import measure, print_table, rolled_back_session, synthetic_papers
+
+BOOLEAN_METRICS = {m for m in METRIC_COLUMNS if isinstance(ExtractEval.__table__.c[m].type, Boolean)}
+INTEGER_METRICS = {m for m in METRIC_COLUMNS if isinstance(ExtractEval.__table__.c[m].type, Integer)}
+MAX_DISTANCE = 50
+NULL_RATE = 0.1
+
+
+def random_evals(rng: random.Random, pairs: Sequence[Tuple[int, int, int]]) -> List[Dict[str, object]]:
+    """Eval rows with random metric values for ``(extract_id, extractor_id, ground_truth_id)``."""
+    rows = []
+    for extract_id, extractor_id, ground_truth_id in pairs:
+        row: Dict[str, object] = {
+            "extract_id": extract_id,
+            "extractor_id": extractor_id,
+            "ground_truth_id": ground_truth_id,
+            "evaluation_details": {},
+        }
+        for metric in METRIC_COLUMNS:
+            if rng.random() < NULL_RATE:
+                row[metric] = None
+            elif metric in BOOLEAN_METRICS:
+                row[metric] = rng.random() < 0.5
+            elif metric in INTEGER_METRICS:
+                row[metric] = rng.randint(0, MAX_DISTANCE)
+            else:
+                row[metric] = rng.random()
+        rows.append(row)
+    return rows
+
+
+def plain_upsert(db: Session, rows: List[Dict[str, object]]) -> None:
+    """The eval upsert without aggregate maintenance, as before the leaderboard table."""
+    stmt = insert(ExtractEval).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ExtractEval.extract_id, ExtractEval.extractor_id],
+        set_={column: stmt.excluded[column] for column in METRIC_COLUMNS},
+    )
+    db.execute(stmt)
+
+
+def live_averages(db: Session, dataset_id: int) -> list:
+    """Per-extractor metric means of a dataset aggregated from ``extractevals``."""
+    values = [getattr(ExtractEval, m) for m in METRIC_COLUMNS]
+    values = [cast(cast(v, Integer), Float) if isinstance(v.type, Boolean) else v for v in values]
+    return db.execute(
+        select(ExtractEval.extractor_id, func.count(), *(func.avg(v) for v in values))
+        .join(ExtractEval.extract)
+        .join(dataset_paper_association, dataset_paper_association.c.paper_id == Extract.paper_id)
+        .where(dataset_paper_association.c.dataset_id == dataset_id)
+        .group_by(ExtractEval.extractor_id)
+    ).all()
+
+
+def aggregates(db: Session, dataset_id: int) -> dict:
+    return {
+        (row.extractor_id, row.metric): (round(row.value_sum, 6), row.value_count, row.eval_count)
+        for row in db.scalars(select(LeaderboardMetric).where(LeaderboardMetric.dataset_id == dataset_id))
+        if row.eval_count
+    }
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Leaderboard refresh cost")
+    parser.add_argument("--papers", type=int, default=100_000)
+    parser.add_argument("--extractors", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=500, help="evals per upsert, as in an evaluation run")
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with rolled_back_session() as db:
+        start = time.perf_counter()
+        tag = f"bench-leaderboard-{time.time_ns()}"
+        paper_ids = synthetic_papers(db, args.papers, tag)
+        everything, half = Dataset(name=f"{tag}-all"), Dataset(name=f"{tag}-half")
+        extractors = [Extractor(extractor_type="benchmark", version=str(n)) for n in range(args.extractors)]
+        db.add_all([everything, half, *extractors])
+        db.flush()
+        extractor_ids = [extractor.id for extractor in extractors]
+        db.execute(
+            text("INSERT INTO ground_truths (paper_id) SELECT unnest(CAST(:ids AS integer[]))"),
+            {"ids": paper_ids},
+        )
+        db.execute(
+            text(
+                "INSERT INTO dataset_papers (dataset_id, paper_id) "
+                "SELECT :all, id FROM unnest(CAST(:ids AS integer[])) AS id "
+                "UNION ALL SELECT :half, id FROM unnest(CAST(:ids AS integer[])) AS id WHERE id % 2 = 0"
+            ),
+            {"all": everything.id, "half": half.id, "ids": paper_ids},
+        )
+        db.execute(
+            text(
+                "INSERT INTO extracts (paper_id, extractor_id, status) "
+                "SELECT p, x, 'completed' FROM unnest(CAST(:extractors AS integer[])) AS x, "
+                "unnest(CAST(:ids AS integer[])) AS p"
+            ),
+            {"extractors": extractor_ids, "ids": paper_ids},
+        )
+        # The timed batches evaluate extracts that have no eval yet
+        reserved = db.execute(
+            text(
+                "SELECT e.id, e.extractor_id, g.id FROM extracts e JOIN ground_truths g ON g.paper_id = e.paper_id "
+                "WHERE e.extractor_id = :extractor ORDER BY e.id DESC LIMIT :count"
+            ),
+            {"extractor": extractor_ids[0], "count": args.batch * args.batches},
+        ).all()
+        sql_values = {m: "random() < 0.5" for m in BOOLEAN_METRICS}
+        sql_values.update({m: f"floor(random() * {MAX_DISTANCE + 1})::integer" for m in INTEGER_METRICS})
+        metric_values = ", ".join(
+            f"CASE WHEN random() < {NULL_RATE} THEN NULL ELSE {sql_values.get(m, 'random()')} END"
+            for m in METRIC_COLUMNS
+        )
+        db.execute(text("SELECT setseed(:seed)"), {"seed": 1 / (args.seed + 1)})
+        db.execute(
+            text(
+                f"INSERT INTO extractevals (extract_id, extractor_id, ground_truth_id, {', '.join(METRIC_COLUMNS)}) "
+                f"SELECT e.id, e.extractor_id, g.id, {metric_values} "
+                "FROM extracts e JOIN ground_truths g ON g.paper_id = e.paper_id "
+                "WHERE e.extractor_id = ANY(:extractors) AND NOT e.id = ANY(:reserved)"
+            ),
+            {"extractors": extractor_ids, "reserved": [row[0] for row in reserved]},
+        )
+        db.execute(text("ANALYZE papers, ground_truths, dataset_papers, extracts, extractevals"))
+        evals = len(paper_ids) * len(extractor_ids) - len(reserved)
+        print(
+            f"{len(paper_ids)} papers x {len(extractor_ids)} extractors, {evals} evals; "
+            f"datasets of {len(paper_ids)} and {len(paper_ids) // 2} papers "
+            f"(setup {time.perf_counter() - start:.0f} s)\n"
+        )
+
+        rebuild = [timed(leaderboard.rebuild_leaderboard, db, dataset.id) for dataset in (everything, half)]
+
+        batches = [reserved[n * args.batch:(n + 1) * args.batch] for n in range(args.batches)]
+        new = [timed(evaluation.upsert_extractevals, db, random_evals(rng, batch)) for batch in batches]
+        update = [timed(evaluation.upsert_extractevals, db, random_evals(rng, batch)) for batch in batches]
+        # What the incremental refresh kept must be what a recount gives
+        maintained = aggregates(db, everything.id)
+        leaderboard.rebuild_leaderboard(db, everything.id)
+        assert maintained == aggregates(db, everything.id), "incremental aggregates differ from a rebuild"
+        plain = [timed(plain_upsert, db, random_evals(rng, batch)) for batch in batches]
+
+        read = measure(lambda: leaderboard.get_leaderboard(db, everything.id))
+        live = measure(lambda: live_averages(db, everything.id), runs=3)
+
+        def ms(seconds: float) -> str:
+            return f"{seconds * 1000:.1f}"
+
+        print_table(
+            ["operation", "ms"],
+            [
+                [f"upsert {args.batch} new evals + aggregates", ms(statistics.median(new))],
+                [f"upsert {args.batch} changed evals + aggregates", ms(statistics.median(update))],
+                [f"plain upsert of {args.batch} evals", ms(statistics.median(plain))],
+                [f"rebuild_leaderboard, {len(paper_ids)} papers", ms(rebuild[0])],
+                [f"rebuild_leaderboard, {len(paper_ids) // 2} papers", ms(rebuild[1])],
+                ["get_leaderboard (aggregates)", ms(read)],
+                ["AVG over extractevals", ms(live)],
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Per-extractor queries on partitioned and unpartitioned tables.
+
+Builds three copies of the same synthetic extracts and evals in scratch
+tables, inside a transaction that is rolled back at the end:
+
+- ``flat``: one table, the extractors' rows interleaved as they arrive when
+  extractors run side by side, with an index on extractor_id;
+- ``clustered``: one table, each extractor's rows contiguous (as after
+  ``CLUSTER``), with the same index;
+- ``partitioned``: LIST (extractor_id) partitions, as in the schema.
+
+Then times, for one extractor: counting and averaging over its extracts,
+averaging its eval metrics, joining its evals to its extracts, and removing
+all of its data (DELETE, or DETACH + DROP of the partitions)::
+
+    python -m benchmarks.partitioning [--extractors 8] [--extracts 100000]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .common import measure, print_table, rolled_back_session
+
+LAYOUTS = ("flat", "clustered", "partitioned")
+METRICS = 10
+# Bytes of abstract per extract, about the size of a real one
+ABSTRACT_BYTES = 800
+
+
+def create_tables(db: Session, layout: str, extractors: int) -> None:
+    extracts, evals = f"bench_{layout}_extracts", f"bench_{layout}_evals"
+    partition_by = " PARTITION BY LIST (extractor_id)" if layout == "partitioned" else ""
+    metrics = ", ".join(f"m{n} double precision" for n in range(METRICS))
+    db.execute(text(
+        f"CREATE TABLE {extracts} (id integer NOT NULL, extractor_id integer NOT NULL, paper_id integer NOT NULL, "
+        f"status text NOT NULL, title text, abstract text, PRIMARY KEY (id, extractor_id)){partition_by}"
+    ))
+    db.execute(text(
+        f"CREATE TABLE {evals} (id integer NOT NULL, extract_id integer NOT NULL, extractor_id integer NOT NULL, "
+        f"{metrics}, PRIMARY KEY (id, extractor_id)){partition_by}"
+    ))
+    if layout == "partitioned":
+        for extractor in range(extractors):
+            for table in (extracts, evals):
+                db.execute(text(f"CREATE TABLE {table}_{extractor} PARTITION OF {table} FOR VALUES IN ({extractor})"))
+    else:
+        db.execute(text(f"CREATE INDEX ON {extracts} (extractor_id)"))
+        db.execute(text(f"CREATE INDEX ON {evals} (extractor_id)"))
+    db.execute(text(f"CREATE INDEX ON {evals} (extract_id)"))
+
+
+def load(db: Session, layout: str, extractors: int, per_extractor: int) -> None:
+    """The same rows in every layout: extract n belongs to extractor n % extractors."""
+    order = "extractor_id, id" if layout == "clustered" else "id"
+    rows = (
+        "SELECT n AS id, n % :extractors AS extractor_id, n / :extractors AS paper_id FROM generate_series(0, :count - 1) AS n"
+    )
+    params = {"extractors": extractors, "count": extractors * per_extractor}
+    db.execute(text("SELECT setseed(0.5)"))
+    db.execute(
+        text(
+            f"INSERT INTO bench_{layout}_extracts SELECT id, extractor_id, paper_id, "
+            "CASE WHEN random() < 0.05 THEN 'failed' ELSE 'completed' END, md5(id::text), "
+            f"repeat(md5(random()::text), {ABSTRACT_BYTES // 32}) FROM ({rows}) AS r ORDER BY {order}"
+        ),
+        params,
+    )
+    metrics = ", ".join("random()" for _ in range(METRICS))
+    db.execute(
+        text(f"INSERT INTO bench_{layout}_evals SELECT id, id, extractor_id, {metrics} FROM ({rows}) AS r ORDER BY {order}"),
+        params,
+    )
+    db.execute(text(f"ANALYZE bench_{layout}_extracts, bench_{layout}_evals"))
+
+
+def remove_extractor(db: Session, layout: str, extractor: int) -> None:
+    """Drop all rows of one extractor, the way each layout would."""
+    for table in (f"bench_{layout}_evals", f"bench_{layout}_extracts"):
+        if layout == "partitioned":
+            db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {table}_{extractor}"))
+            db.execute(text(f"DROP TABLE {table}_{extractor}"))
+        else:
+            db.execute(text(f"DELETE FROM {table} WHERE extractor_id = :extractor"), {"extractor": extractor})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partitioned against unpartitioned per-extractor queries")
+    parser.add_argument("--extractors", type=int, default=8)
+    parser.add_argument("--extracts", type=int, default=100_000, help="extracts (and evals) per extractor")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    extractor = args.extractors // 2
+
+    queries = {
+        "count, avg over extracts": (
+            "SELECT count(*), avg(length(title)) FROM bench_{layout}_extracts "
+            "WHERE extractor_id = :extractor AND status = 'completed'"
+        ),
+        "avg of eval metrics": (
+            "SELECT " + ", ".join(f"avg(m{n})" for n in range(METRICS)) + " FROM bench_{layout}_evals "
+            "WHERE extractor_id = :extractor"
+        ),
+        "evals joined to extracts": (
+            "SELECT avg(v.m0), count(*) FROM bench_{layout}_evals v JOIN bench_{layout}_extracts e "
+            "ON e.id = v.extract_id AND e.extractor_id = v.extractor_id "
+            "WHERE v.extractor_id = :extractor AND e.status = 'completed'"
+        ),
+    }
+
+    with rolled_back_session() as db:
+        start = time.perf_counter()
+        for layout in LAYOUTS:
+            create_tables(db, layout, args.extractors)
+            load(db, layout, args.extractors, args.extracts)
+        print(
+            f"{args.extractors} extractors x {args.extracts} extracts and evals per layout "
+            f"(setup {time.perf_counter() - start:.0f} s)\n"
+        )
+
+        rows = []
+        for label, sql in queries.items():
+            timings = []
+            for layout in LAYOUTS:
+                statement = text(sql.format(layout=layout))
+                timings.append(measure(lambda: db.execute(statement, {"extractor": extractor}).all(), runs=args.runs))
+            rows.append([label, *(f"{seconds * 1000:.1f}" for seconds in timings)])
+
+        timings = []
+        for layout in LAYOUTS:
+            savepoint = db.begin_nested()
+            timings.append(measure(lambda: remove_extractor(db, layout, extractor), runs=1, warmup=0))
+            savepoint.rollback()
+        rows.append(["remove one extractor", *(f"{seconds * 1000:.1f}" for seconds in timings)])
+
+        print_table(["per-extractor query, ms", *LAYOUTS], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Reference-list matching on 300×300 lists.
+
+Times the refs_* metrics of one extract against its ground truth: parsing,
+blocking and scoring the candidates, the one-to-one assignment, and the
+whole ``reference_metrics`` call, next to scoring every pair of titles
+without blocking::
+
+    python -m benchmarks.references [--size 300] [--seed 1]
+"""
+
+import argparse
+import random
+
+from papercheck_app.services import references
+from papercheck_app.services.assignment import max_weight_matching
+
+from .common import measure, mutate, print_table, synthetic_title
+
+
+def synthetic_lists(rng: random.Random, size: int):
+    """A ground truth reference list and a noisy extraction of it, as refs payloads."""
+    truth = []
+    for n in range(size):
+        item = {"title": synthetic_title(rng, rng.randint(6, 14)), "year": rng.randint(1980, 2024)}
+        if rng.random() < 0.6:
+            item["doi"] = f"10.{1000 + n % 9000}/bench.{n}"
+        truth.append(item)
+    extracted = []
+    for item in truth:
+        if rng.random() < 0.1:
+            continue  # missed by the extractor
+        copy = dict(item, title=mutate(rng, item["title"], rng.randint(0, 4)))
+        if "doi" in copy and rng.random() < 0.3:
+            del copy["doi"]
+        if rng.random() < 0.05:
+            copy["year"] += 1
+        extracted.append(copy)
+    # Spurious references (footnotes, figure captions parsed as references)
+    extracted += [{"title": synthetic_title(rng, 8)} for _ in range(size // 20)]
+    rng.shuffle(extracted)
+    return {"references": extracted}, {"references": truth}
+
+
+def all_pairs(extracted, truth):
+    return {
+        (i, j): score
+        for i, a in enumerate(extracted)
+        for j, b in enumerate(truth)
+        if (score := references.title_similarity(a.title, b.title)) >= references.MATCH_THRESHOLD
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    extracted_payload, truth_payload = synthetic_lists(random.Random(args.seed), args.size)
+    extracted = references.parse_references(extracted_payload)
+    truth = references.parse_references(truth_payload)
+    edges = references.candidate_pairs(extracted, truth)
+    scores = references.reference_metrics(extracted_payload, truth_payload)
+    print(
+        f"{len(extracted)} extracted x {len(truth)} truth references: "
+        f"{len(edges)} candidate pairs of {len(extracted) * len(truth)}, "
+        f"refs_f1 {scores['refs_f1']:.3f}"
+    )
+
+    rows = [
+        ("parse both lists", measure(lambda: (
+            references.parse_references(extracted_payload), references.parse_references(truth_payload)
+        ))),
+        ("blocking + scoring", measure(lambda: references.candidate_pairs(extracted, truth))),
+        ("assignment", measure(lambda: max_weight_matching(edges))),
+        ("reference_metrics (all of the above)", measure(
+            lambda: references.reference_metrics(extracted_payload, truth_payload)
+        )),
+        ("scoring all pairs, no blocking", measure(lambda: all_pairs(extracted, truth), runs=1)),
+    ]
+    print_table(("step", "ms"), [(name, f"{seconds * 1000:.1f}") for name, seconds in rows])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""String similarity kernels on title-length pairs.
+
+Compares the bit-parallel Levenshtein (exact and with a max_distance cutoff)
+and the bitmask Jaro-Winkler with plain O(n·m) / window-scanning versions,
+on synthetic titles of about 90 characters and lightly edited copies of
+them, as in extracted vs ground-truth titles::
+
+    python -m benchmarks.similarity [--pairs 2000] [--seed 1]
+"""
+
+import argparse
+import random
+
+from papercheck_app.services import similarity
+
+from .common import measure, mutate, print_table, synthetic_title
+
+
+def dp_levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def direct_jaro_winkler(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(max(len(a), len(b)) // 2 - 1, 0)
+    flagged = [False] * len(b)
+    matched = []
+    for i, x in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not flagged[j] and b[j] == x:
+                flagged[j] = True
+                matched.append(x)
+                break
+    m = len(matched)
+    if not m:
+        return 0.0
+    transpositions = sum(x != y for x, y in zip(matched, (y for y, f in zip(b, flagged) if f))) / 2
+    score = (m / len(a) + m / len(b) + (m - transpositions) / m) / 3
+    if score < 0.7:
+        return score
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return score + prefix * 0.1 * (1 - score)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = []
+    for _ in range(args.pairs):
+        title = synthetic_title(rng)
+        # Half near-identical (small extraction errors), half unrelated titles
+        other = mutate(rng, title, rng.randint(0, 8)) if rng.random() < 0.5 else synthetic_title(rng)
+        pairs.append((title, other))
+    mean_length = sum(len(a) + len(b) for a, b in pairs) / (2 * len(pairs))
+    dp_sample = pairs[: max(1, args.pairs // 10)]  # the DP is too slow for all pairs
+
+    assert similarity.levenshtein_batch(dp_sample) == [dp_levenshtein(a, b) for a, b in dp_sample]
+
+    cases = [
+        ("Levenshtein, O(n·m) DP", lambda: [dp_levenshtein(a, b) for a, b in dp_sample], len(dp_sample)),
+        ("Levenshtein, bit-parallel", lambda: similarity.levenshtein_batch(pairs), len(pairs)),
+        ("Levenshtein, max_distance=10", lambda: similarity.levenshtein_batch(pairs, 10), len(pairs)),
+        ("Jaro-Winkler, window scan", lambda: [direct_jaro_winkler(a, b) for a, b in pairs], len(pairs)),
+        ("Jaro-Winkler, bitmasks", lambda: similarity.jaro_winkler_batch(pairs), len(pairs)),
+    ]
+    print(f"{len(pairs)} pairs, mean length {mean_length:.0f} characters")
+    rows = []
+    for name, fn, count in cases:
+        seconds = measure(fn, runs=3)
+        rows.append((name, f"{seconds / count * 1e6:.1f}", f"{count / seconds:,.0f}"))
+    print_table(("kernel", "us/pair", "pairs/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Full-text search over extract titles and abstracts against ILIKE.
+
+Loads synthetic extracts (1M by default) under a new extractor, inside a
+transaction that is rolled back at the end. Titles and abstracts are drawn
+from a vocabulary of generated words with a Zipf-like frequency (word ``i``
+is about ``1/i`` as frequent as the first), so terms can be picked by how
+many documents contain them. Then times ``text_search.search_text`` for
+common, mid-frequency and rare terms, two terms, an ``or`` and the second
+page, with and without highlighting, and the ILIKE scans it replaces (for
+the first page's worth of rows, unranked, and for all matches)::
+
+    python -m benchmarks.text_search [--extracts 1000000] [--abstract-words 120]
+"""
+
+import argparse
+import random
+import time
+from typing import List, Optional
+
+from sqlalchemy import LargeBinary, bindparam, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from papercheck_app.models import Extract, Extractor
+from papercheck_app.services import text_search
+
+from .common import measure, print_table, rolled_back_session, synthetic_papers
+
+CONSONANTS = "bdfgklmnprstvz"
+VOWELS = "aeiou"
+PAGE_SIZE = 20
+
+
+def vocabulary(rng: random.Random, size: int) -> List[str]:
+    """``size`` distinct pronounceable nonsense words of three syllables, six letters each."""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(3)))
+    return sorted(words, key=lambda word: rng.random())
+
+
+def load_extracts(db: Session, paper_ids: List[int], extractor_id: int, words: List[str], title_words: int,
+                  abstract_words: int, seed: float) -> None:
+    """Insert one extract per paper with random title and abstract, in SQL.
+
+    The words are packed in one bytea and cut out at fixed offsets:
+    subscripting a text[] walks the array up to the element.
+    """
+    # power(n, random()) is log-uniform on [1, n): word k is drawn with probability ~ 1 / (k ln n)
+    draw = "encode(substring(:words FROM floor(power(:size, random()))::integer * 6 - 5 FOR 6), 'escape')"
+    db.execute(text("SELECT setseed(:seed)"), {"seed": seed})
+    db.execute(
+        text(
+            "INSERT INTO extracts (paper_id, extractor_id, status, extracted_title, extracted_abstract) "
+            "SELECT paper_id, :extractor, 'completed', title, abstract "
+            "FROM unnest(CAST(:ids AS integer[])) AS paper_id, "
+            # Referencing paper_id makes the subqueries run for every row
+            f"LATERAL (SELECT string_agg({draw}, ' ') AS title FROM generate_series(1, :title_words) "
+            "WHERE paper_id > 0) AS t, "
+            f"LATERAL (SELECT string_agg({draw}, ' ') AS abstract FROM generate_series(1, :abstract_words) "
+            "WHERE paper_id > 0) AS a"
+        ).bindparams(bindparam("words", type_=LargeBinary)),
+        {
+            "ids": paper_ids,
+            "extractor": extractor_id,
+            "words": "".join(words).encode(),
+            "size": len(words),
+            "title_words": title_words,
+            "abstract_words": abstract_words,
+        },
+    )
+
+
+def ilike(db: Session, extractor_id: int, terms: List[str], limit: Optional[int] = PAGE_SIZE) -> list:
+    """First rows (all with ``limit=None``) whose title or abstract contains every term, unranked."""
+    conditions = [
+        or_(Extract.extracted_title.ilike(f"%{term}%"), Extract.extracted_abstract.ilike(f"%{term}%"))
+        for term in terms
+    ]
+    return db.execute(
+        select(Extract.id).where(Extract.extractor_id == extractor_id, *conditions).limit(limit)
+    ).all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full-text search against ILIKE")
+    parser.add_argument("--extracts", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--title-words", type=int, default=10)
+    parser.add_argument("--abstract-words", type=int, default=120)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    words = vocabulary(random.Random(args.seed), args.vocabulary)
+
+    with rolled_back_session() as db:
+        start = time.perf_counter()
+        tag = f"bench-text-search-{time.time_ns()}"
+        extractor = Extractor(extractor_type="benchmark", version=tag[-30:])
+        db.add(extractor)
+        db.flush()
+        paper_ids = synthetic_papers(db, args.extracts, tag)
+        load_extracts(
+            db, paper_ids, extractor.id, words, args.title_words, args.abstract_words, 1 / (args.seed + 1)
+        )
+        db.execute(text(f"ANALYZE extracts_extractor_{extractor.id}"))
+        print(
+            f"{args.extracts} extracts of {args.title_words} + {args.abstract_words} words "
+            f"from {args.vocabulary} (setup {time.perf_counter() - start:.0f} s)\n"
+        )
+
+        def matches(q: str) -> int:
+            query = func.websearch_to_tsquery(text_search.SEARCH_CONFIG, q)
+            return db.scalar(
+                select(func.count())
+                .select_from(Extract)
+                .where(Extract.extractor_id == extractor.id, Extract.search_vector.bool_op("@@")(query))
+            )
+
+        def search(q, after=None, highlight=True):
+            return text_search.search_text(
+                db, "extracts", q, after=after, limit=PAGE_SIZE, extractor_id=extractor.id, highlight=highlight
+            )
+
+        # The 1st, 100th and 10000th most frequent words
+        common, mid, rare = words[0], words[99], words[9_999 % len(words)]
+        queries = [
+            ("common term", common, [common]),
+            ("mid term", mid, [mid]),
+            ("rare term", rare, [rare]),
+            ("two mid terms", f"{mid} {words[300]}", [mid, words[300]]),
+            ("rare or rare", f"{rare} or {words[8_000 % len(words)]}", None),
+        ]
+        rows = []
+        for label, q, terms in queries:
+            ranked = measure(lambda: search(q), runs=args.runs)
+            plain = measure(lambda: search(q, highlight=False), runs=args.runs)
+            scans = ["-", "-"]
+            if terms:
+                scans = [
+                    f"{measure(lambda: ilike(db, extractor.id, terms, limit), runs=args.runs) * 1000:.1f}"
+                    for limit in (PAGE_SIZE, None)
+                ]
+            rows.append([label, matches(q), f"{ranked * 1000:.1f}", f"{plain * 1000:.1f}", *scans])
+
+        last = search(mid).items[-1]
+        second = measure(lambda: search(mid, after=(last.rank, last.id)), runs=args.runs)
+        rows.append(["mid term, page 2", matches(mid), f"{second * 1000:.1f}", "-", "-", "-"])
+
+        print_table(
+            ["query", "matches", "page ms", "no highlight ms", f"ILIKE first {PAGE_SIZE} ms", "ILIKE all ms"], rows
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,40 @@
 """FastAPI application for papercheck_app."""
 
-from fastapi import FastAPI, Depends
-from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, Depends, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import text
+
+from papercheck_app.api import api_router
+from papercheck_app.core.cache import response_cache
 from papercheck_app.core.config import settings
-from papercheck_app.core.database import get_db
+from papercheck_app.core.database import get_session, run_with_session
+from papercheck_app.core.monitoring import MetricsMiddleware, track_in_progress
+from papercheck_app.core.querycount import QueryCountMiddleware
+from papercheck_app.services.dispatcher import close_http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release shared resources on shutdown."""
+    yield
+    await close_http_client()
+
 
 app = FastAPI(
     title="PaperCheck DB API",
     description="Config and API for papercheck database -> datasets, papers, extractors, extractor evaluations",
     version="0.1.0",
     debug=settings.is_development,
+    lifespan=lifespan,
+    dependencies=[Depends(track_in_progress)],
 )
+app.include_router(api_router)
+if settings.is_development or settings.query_budget is not None:
+    app.add_middleware(QueryCountMiddleware, budget=settings.query_budget)
+# Outermost, so the timings include the other middleware
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -25,16 +48,32 @@ async def root():
 
 
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db=Depends(get_session)):
     """Health check endpoint."""
     try:
         # Test database connection
-        db.execute("SELECT 1")
-        return {"status": "healthy", "database": "connected"}
+        await run_with_session(db, lambda session: session.execute(text("SELECT 1")))
+        return {
+            "status": "healthy",
+            "database": "connected",
+            "driver": "async" if settings.use_async_db else "sync",
+        }
     except Exception as e:
         return {"status": "unhealthy", "database": "error", "error": str(e)}
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit rate and size of the detail response cache."""
+    return response_cache.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: request latencies, SQL timings, pool usage and job throughput."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1 +1,17 @@
-"""API routes and routers for the papercheck_app."""
\ No newline at end of file
+"""API routes and routers for the papercheck_app."""
+
+from fastapi import APIRouter
+
+from . import datasets, duplicates, extractevals, extractors, extracts, leaderboard, papers, pdfs, references, search
+
+api_router = APIRouter()
+api_router.include_router(datasets.router)
+api_router.include_router(duplicates.router)
+api_router.include_router(extractevals.router)
+api_router.include_router(extractors.router)
+api_router.include_router(extracts.router)
+api_router.include_router(leaderboard.router)
+api_router.include_router(papers.router)
+api_router.include_router(pdfs.router)
+api_router.include_router(references.router)
+api_router.include_router(search.router)
@@ -0,0 +1,161 @@
+"""Dataset API routes."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from ..core.cache import cached_detail, response_cache
+from ..core.database import get_session, run_job, run_with_session
+from ..core.pagination import (
+    PageParams,
+    decode_id_cursor,
+    encode_id_cursor,
+    page_params,
+    paginate,
+)
+from ..models import Dataset
+from ..schemas import (
+    DatasetMembershipCheck,
+    DatasetMembershipResult,
+    DatasetPaperIds,
+    DatasetRead,
+    DatasetScanResult,
+    DatasetSetOperation,
+    DatasetSetOperationResult,
+    DatasetSummary,
+    Page,
+)
+from ..services import details, export, ingest, membership, scanner
+
+router = APIRouter(prefix="/datasets", tags=["datasets"])
+
+
+@router.get("", response_model=Page[DatasetSummary])
+async def list_datasets(page: PageParams = Depends(page_params), db=Depends(get_session)):
+    """List datasets in creation order, one keyset page at a time."""
+    return await run_with_session(db, paginate, select(Dataset), Dataset, DatasetSummary, page)
+
+
+@router.post("/combine", response_model=DatasetSetOperationResult, status_code=201)
+async def combine_datasets(spec: DatasetSetOperation, db=Depends(get_session)):
+    """Create a dataset from the union, intersection or difference of existing ones."""
+    try:
+        return await run_with_session(
+            db,
+            membership.combine_datasets,
+            spec.operation,
+            spec.dataset_ids,
+            spec.name,
+            spec.description,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get("/{dataset_id}", response_model=DatasetRead)
+async def get_dataset(dataset_id: int, request: Request, db=Depends(get_session)):
+    """Dataset with its paper IDs; supports If-None-Match."""
+    return await cached_detail(
+        request, db, "datasets", dataset_id, details.dataset_version, details.get_dataset
+    )
+
+
+async def _require_dataset(db, dataset_id: int) -> None:
+    if await run_with_session(db, ingest.get_dataset_or_none, dataset_id) is None:
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+
+
+@router.get("/{dataset_id}/paper_ids", response_model=Page[int])
+async def list_paper_ids(
+    dataset_id: int,
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(10000, ge=1, le=100000, description="Page size"),
+    db=Depends(get_session),
+):
+    """Paper IDs of a dataset in ascending order, one page at a time."""
+    try:
+        after = decode_id_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await _require_dataset(db, dataset_id)
+    ids = await run_with_session(db, membership.list_paper_ids, dataset_id, after, limit + 1)
+    next_cursor = encode_id_cursor(ids[limit - 1]) if len(ids) > limit else None
+    return Page[int](items=ids[:limit], next_cursor=next_cursor)
+
+
+@router.get("/{dataset_id}/paper_ids/count")
+async def count_papers(dataset_id: int, db=Depends(get_session)):
+    """Number of papers in a dataset."""
+    await _require_dataset(db, dataset_id)
+    return {
+        "dataset_id": dataset_id,
+        "paper_count": await run_with_session(db, membership.count_papers, dataset_id),
+    }
+
+
+@router.post("/{dataset_id}/paper_ids", response_model=DatasetMembershipResult)
+async def add_papers(dataset_id: int, body: DatasetPaperIds, db=Depends(get_session)):
+    """Add existing papers to a dataset in bulk; unknown IDs are reported."""
+    await _require_dataset(db, dataset_id)
+    result = await run_with_session(db, membership.add_papers, dataset_id, body.paper_ids)
+    response_cache.invalidate("datasets", [dataset_id])
+    return result
+
+
+@router.post("/{dataset_id}/paper_ids/remove", response_model=DatasetMembershipResult)
+async def remove_papers(dataset_id: int, body: DatasetPaperIds, db=Depends(get_session)):
+    """Remove papers from a dataset in bulk; the papers themselves are kept."""
+    await _require_dataset(db, dataset_id)
+    result = await run_with_session(db, membership.remove_papers, dataset_id, body.paper_ids)
+    response_cache.invalidate("datasets", [dataset_id])
+    return result
+
+
+@router.post("/{dataset_id}/paper_ids/contains", response_model=DatasetMembershipCheck)
+async def contains_papers(dataset_id: int, body: DatasetPaperIds, db=Depends(get_session)):
+    """Which of the given papers belong to the dataset."""
+    await _require_dataset(db, dataset_id)
+    return await run_with_session(db, membership.contains_papers, dataset_id, body.paper_ids)
+
+
+@router.post("/{dataset_id}/scan", response_model=DatasetScanResult)
+async def scan_dataset_folder(
+    dataset_id: int,
+    max_workers: Optional[int] = Query(None, ge=1, le=256, description="Hashing processes"),
+    db=Depends(get_session),
+):
+    """Hash the new or changed PDFs in the dataset folder and register them as papers of the dataset."""
+    if await run_with_session(db, ingest.get_dataset_or_none, dataset_id) is None:
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+    # Hashing runs in the threadpool, never on the event loop
+    try:
+        result = await run_job(scanner.scan_dataset, dataset_id, max_workers)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    response_cache.invalidate("datasets", [dataset_id])
+    return result
+
+
+@router.get("/{dataset_id}/export/{table}")
+async def export_dataset(
+    dataset_id: int,
+    table: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Output format"),
+    extractor_id: Optional[int] = Query(None, description="Only rows of this extractor"),
+    gzip: bool = Query(False, description="Compress the stream with gzip"),
+    db=Depends(get_session),
+):
+    """Stream every extract or eval of a dataset as NDJSON or CSV, row by row."""
+    if table not in export.TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}'")
+    if await run_with_session(db, ingest.get_dataset_or_none, dataset_id) is None:
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+
+    filename = f"dataset_{dataset_id}_{table}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export.export_stream(table, dataset_id, format, extractor_id, gzip),
+        media_type="application/gzip" if gzip else export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
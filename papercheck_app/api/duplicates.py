@@ -0,0 +1,36 @@
+"""Near-duplicate paper API routes."""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..core.database import get_session, run_job, run_with_session
+from ..models import Dataset
+from ..schemas import DuplicateCluster, DuplicateIndexResult
+from ..services import near_duplicates
+
+router = APIRouter(prefix="/duplicates", tags=["duplicates"])
+
+
+@router.get("/clusters", response_model=List[DuplicateCluster])
+async def get_duplicate_clusters(
+    dataset_id: Optional[int] = Query(None, description="Only papers of this dataset"),
+    threshold: float = Query(
+        near_duplicates.DEFAULT_THRESHOLD,
+        ge=near_duplicates.MIN_SIMILARITY,
+        le=1.0,
+        description="Minimum estimated Jaccard similarity",
+    ),
+    db=Depends(get_session),
+):
+    """Clusters of distinct papers with near-duplicate extracted titles and abstracts."""
+    if dataset_id is not None:
+        if await run_with_session(db, lambda session: session.get(Dataset, dataset_id)) is None:
+            raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+    return await run_with_session(db, near_duplicates.duplicate_clusters, dataset_id, threshold)
+
+
+@router.post("/index", response_model=DuplicateIndexResult)
+async def index_duplicates():
+    """Compute signatures and pairs for extracts stored before they were indexed."""
+    return await run_job(near_duplicates.index_missing)
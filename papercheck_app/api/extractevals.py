@@ -0,0 +1,99 @@
+"""ExtractEval API routes."""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from sqlalchemy import select
+
+from ..core.database import get_session, run_job, run_with_session
+from ..core.pagination import PageParams, page_params, paginate
+from ..models import Dataset, ExtractEval, Extractor
+from ..schemas import EvaluationRunResult, ExtractEvalSummary, Page
+from ..services import arrow_export, evaluation
+
+router = APIRouter(prefix="/extractevals", tags=["extractevals"])
+
+
+@router.get("", response_model=Page[ExtractEvalSummary])
+async def list_extractevals(
+    extractor_id: Optional[int] = Query(None, description="Only evals of this extractor"),
+    page: PageParams = Depends(page_params),
+    db=Depends(get_session),
+):
+    """List evals in creation order, one keyset page at a time."""
+    query = select(ExtractEval)
+    if extractor_id is not None:
+        query = query.where(ExtractEval.extractor_id == extractor_id)
+    return await run_with_session(db, paginate, query, ExtractEval, ExtractEvalSummary, page)
+
+
+@router.post("/evaluate", response_model=EvaluationRunResult)
+async def evaluate_dataset(
+    dataset_id: int = Query(..., description="Dataset whose papers are evaluated"),
+    extractor_id: int = Query(..., description="Extractor whose extracts are evaluated"),
+    batch_size: int = Query(evaluation.DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    max_workers: Optional[int] = Query(None, ge=1, le=256, description="Worker processes"),
+    db=Depends(get_session),
+):
+    """Compute ExtractEval rows for all extracts of an extractor in a dataset."""
+    if await run_with_session(db, lambda session: session.get(Dataset, dataset_id)) is None:
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+    if await run_with_session(db, lambda session: session.get(Extractor, extractor_id)) is None:
+        raise HTTPException(status_code=404, detail=f"Extractor {extractor_id} not found")
+
+    return await run_job(
+        evaluation.evaluate_dataset,
+        dataset_id,
+        extractor_id,
+        batch_size=batch_size,
+        max_workers=max_workers,
+    )
+
+
+@router.post("/evaluate_stale", response_model=EvaluationRunResult)
+async def evaluate_stale(
+    dataset_id: Optional[int] = Query(None, description="Only papers of this dataset"),
+    extractor_id: Optional[int] = Query(None, description="Only extracts of this extractor"),
+    batch_size: int = Query(evaluation.DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    max_workers: Optional[int] = Query(None, ge=1, le=256, description="Worker processes"),
+):
+    """Recompute missing evals and those whose extract, ground truth or metrics changed."""
+    return await run_job(
+        evaluation.evaluate_stale,
+        dataset_id=dataset_id,
+        extractor_id=extractor_id,
+        batch_size=batch_size,
+        max_workers=max_workers,
+    )
+
+
+@router.get("/export")
+async def export_metrics(
+    format: str = Query("parquet", pattern="^(parquet|arrow)$", description="Parquet or Arrow IPC stream"),
+    columns: Optional[List[str]] = Query(None, description="Columns to export, all by default"),
+    dataset_id: Optional[List[int]] = Query(None, description="Only evals of papers in these datasets"),
+    extractor_id: Optional[List[int]] = Query(None, description="Only evals of these extractors"),
+    extractor_type: Optional[List[str]] = Query(None, description="Only evals of these extractor types"),
+):
+    """Stream eval metrics as Parquet or Arrow record batches."""
+    if arrow_export.pa is None:
+        raise HTTPException(status_code=501, detail="Arrow export needs the optional pyarrow dependency")
+    try:
+        columns = arrow_export.resolve_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    extension = "parquet" if format == "parquet" else "arrows"
+    return StreamingResponse(
+        arrow_export.stream_export(
+            format,
+            columns,
+            dataset_ids=dataset_id,
+            extractor_ids=extractor_id,
+            extractor_types=extractor_type,
+        ),
+        media_type=arrow_export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="extractevals.{extension}"'},
+    )
@@ -0,0 +1,42 @@
+"""Extractor API routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+
+from ..core.cache import cached_detail, response_cache
+from ..core.database import get_session, run_job, run_with_session
+from ..core.pagination import PageParams, page_params, paginate
+from ..models import Extractor
+from ..schemas import ExtractorDataDropResult, ExtractorRead, ExtractorSummary, Page
+from ..services import details, partitions
+
+router = APIRouter(prefix="/extractors", tags=["extractors"])
+
+
+@router.get("", response_model=Page[ExtractorSummary])
+async def list_extractors(page: PageParams = Depends(page_params), db=Depends(get_session)):
+    """List extractors in creation order, one keyset page at a time."""
+    return await run_with_session(db, paginate, select(Extractor), Extractor, ExtractorSummary, page)
+
+
+@router.get("/{extractor_id}", response_model=ExtractorRead)
+async def get_extractor(extractor_id: int, request: Request, db=Depends(get_session)):
+    """Extractor detail; supports If-None-Match."""
+    return await cached_detail(
+        request, db, "extractors", extractor_id, details.extractor_version, details.get_extractor
+    )
+
+
+@router.delete("/{extractor_id}/extracts", response_model=ExtractorDataDropResult)
+async def drop_extractor_data(
+    extractor_id: int,
+    archive: bool = Query(False, description="Keep the detached partitions as standalone tables"),
+):
+    """Remove all extracts, evals and signatures of an extractor by detaching its partitions."""
+    try:
+        result = await run_job(partitions.drop_extractor_data, extractor_id, archive=archive)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    response_cache.invalidate("extractors", [extractor_id])
+    response_cache.invalidate("papers")
+    return result
@@ -0,0 +1,64 @@
+"""Extract API routes."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+
+from ..core.cache import response_cache
+from ..core.database import get_session, run_with_session
+from ..core.pagination import PageParams, page_params, paginate
+from ..models import Extract
+from ..schemas import ExtractCacheStatus, ExtractionRunResult, ExtractSummary, Page
+from ..services import dispatcher
+
+router = APIRouter(prefix="/extracts", tags=["extracts"])
+
+
+@router.get("", response_model=Page[ExtractSummary])
+async def list_extracts(
+    extractor_id: Optional[int] = Query(None, description="Only extracts of this extractor"),
+    paper_id: Optional[int] = Query(None, description="Only extracts of this paper"),
+    status: Optional[str] = Query(None, description="Only extracts with this status"),
+    page: PageParams = Depends(page_params),
+    db=Depends(get_session),
+):
+    """List extracts in creation order, one keyset page at a time."""
+    query = select(Extract)
+    if extractor_id is not None:
+        query = query.where(Extract.extractor_id == extractor_id)
+    if paper_id is not None:
+        query = query.where(Extract.paper_id == paper_id)
+    if status is not None:
+        query = query.where(Extract.status == status)
+    return await run_with_session(db, paginate, query, Extract, ExtractSummary, page)
+
+
+@router.post("/dispatch", response_model=ExtractionRunResult)
+async def dispatch_extraction(
+    dataset_id: int = Query(..., description="Dataset whose PDFs are extracted"),
+    extractor_id: int = Query(..., description="Extractor whose endpoint is called"),
+    environment: str = Query("development", pattern="^(development|production)$"),
+    concurrency: int = Query(None, ge=1, le=256, description="Concurrent requests"),
+    use_cache: bool = Query(True, description="Reuse completed extracts of identical PDFs and extractors"),
+):
+    """Send every PDF of a dataset to the extractor endpoint and store the Extract rows."""
+    try:
+        result = await dispatcher.dispatch_dataset(
+            dataset_id, extractor_id, environment, use_cache, concurrency=concurrency
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    # New extracts change the paper detail responses
+    response_cache.invalidate("papers")
+    return result
+
+
+@router.get("/pending", response_model=ExtractCacheStatus)
+async def pending_extraction(
+    dataset_id: int = Query(..., description="Dataset whose papers are checked"),
+    extractor_id: int = Query(..., description="Extractor whose results are reused"),
+    db=Depends(get_session),
+):
+    """Papers of a dataset with no reusable completed extract for this extractor."""
+    return await run_with_session(db, dispatcher.dataset_cache_status, dataset_id, extractor_id)
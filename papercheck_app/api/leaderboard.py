@@ -0,0 +1,37 @@
+"""Leaderboard API routes."""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..core.database import get_session, run_job, run_with_session
+from ..models import Dataset
+from ..schemas import LeaderboardEntry, LeaderboardRefreshResult
+from ..services import leaderboard
+from ..services.metrics import METRIC_COLUMNS
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+@router.get("/{dataset_id}", response_model=List[LeaderboardEntry])
+async def get_leaderboard(
+    dataset_id: int,
+    metric: Optional[str] = Query(None, description="Metric to rank extractors by"),
+    extractor_type: Optional[str] = Query(None, description="Only extractors of this type"),
+    db=Depends(get_session),
+):
+    """Metric aggregates of every evaluated extractor in a dataset."""
+    if metric is not None and metric not in METRIC_COLUMNS:
+        raise HTTPException(status_code=422, detail=f"Unknown metric '{metric}'")
+    if await run_with_session(db, lambda session: session.get(Dataset, dataset_id)) is None:
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+    return await run_with_session(db, leaderboard.get_leaderboard, dataset_id, metric, extractor_type)
+
+
+@router.post("/refresh", response_model=LeaderboardRefreshResult)
+async def refresh_leaderboard(
+    dataset_id: Optional[int] = Query(None, description="Only rebuild this dataset"),
+    extractor_id: Optional[int] = Query(None, description="Only rebuild this extractor"),
+):
+    """Recompute the aggregates from the stored evals."""
+    return await run_job(leaderboard.rebuild_leaderboard, dataset_id, extractor_id)
@@ -0,0 +1,144 @@
+"""Paper API routes."""
+
+import json
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse
+from pydantic import ValidationError
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from ..core.cache import cached_detail, response_cache
+from ..core.database import get_session, run_with_session
+from ..core.pagination import PageParams, page_params, paginate
+from ..models import Paper, dataset_paper_association
+from ..schemas import Page, PaperBulkIngestResult, PaperCreate, PaperRead, PaperSummary
+from ..services import details, ingest, pdf_store
+
+router = APIRouter(prefix="/papers", tags=["papers"])
+
+
+async def _iter_ndjson(request: Request):
+    """Yield decoded objects from an NDJSON request body as it streams in."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if buffer.strip():
+        yield json.loads(buffer)
+
+
+async def _iter_json_list(request: Request):
+    """Yield objects from a JSON array request body."""
+    payload = await request.json()
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array of papers")
+    for item in payload:
+        yield item
+
+
+@router.post("/bulk", response_model=PaperBulkIngestResult)
+async def bulk_ingest_papers(
+    request: Request,
+    dataset_id: Optional[int] = Query(None, description="Dataset to attach the papers to"),
+    batch_size: int = Query(
+        ingest.DEFAULT_BATCH_SIZE,
+        ge=1,
+        le=10000,
+        description="Records per batch, split into statements within the bind parameter limit",
+    ),
+    db=Depends(get_session),
+):
+    """Bulk-create papers from a JSON array or an NDJSON stream of PaperCreate records.
+
+    Records are de-duplicated on pdf_hash and attached to ``dataset_id`` in a
+    single transaction.
+    """
+    if dataset_id is not None:
+        dataset = await run_with_session(db, ingest.get_dataset_or_none, dataset_id)
+        if dataset is None:
+            raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+
+    content_type = request.headers.get("content-type", "")
+    records = _iter_ndjson(request) if "ndjson" in content_type else _iter_json_list(request)
+
+    total = PaperBulkIngestResult(dataset_id=dataset_id)
+    seen_hashes = set()
+    batch = []
+    line = 0
+    try:
+        async for record in records:
+            line += 1
+            batch.append(PaperCreate.model_validate(record))
+            if len(batch) >= batch_size:
+                ingest.merge_ingest_results(
+                    total,
+                    await run_with_session(
+                        db, ingest.ingest_paper_batch, batch, dataset_id, seen_hashes
+                    ),
+                )
+                batch = []
+        if batch:
+            ingest.merge_ingest_results(
+                total,
+                await run_with_session(
+                    db, ingest.ingest_paper_batch, batch, dataset_id, seen_hashes
+                ),
+            )
+        await run_with_session(db, lambda session: session.commit())
+        if total.attached:
+            response_cache.invalidate("datasets", [dataset_id])
+    except json.JSONDecodeError as e:
+        await run_with_session(db, lambda session: session.rollback())
+        raise HTTPException(status_code=422, detail=f"Record {line + 1}: invalid JSON ({e})")
+    except ValidationError as e:
+        await run_with_session(db, lambda session: session.rollback())
+        raise HTTPException(status_code=422, detail=f"Record {line}: {e}")
+    except Exception:
+        await run_with_session(db, lambda session: session.rollback())
+        raise
+    return total
+
+
+@router.get("", response_model=Union[Page[PaperSummary], Page[PaperRead]])
+async def list_papers(
+    dataset_id: Optional[int] = Query(None, description="Only papers of this dataset"),
+    expand: bool = Query(False, description="Full PaperRead items with extracts, ground truth and datasets"),
+    page: PageParams = Depends(page_params),
+    db=Depends(get_session),
+):
+    """List papers in creation order, one keyset page at a time."""
+    query = select(Paper)
+    if dataset_id is not None:
+        query = query.join(
+            dataset_paper_association, dataset_paper_association.c.paper_id == Paper.id
+        ).where(dataset_paper_association.c.dataset_id == dataset_id)
+    schema = PaperRead if expand else PaperSummary
+    return await run_with_session(db, paginate, query, Paper, schema, page)
+
+
+@router.get("/{paper_id}", response_model=PaperRead)
+async def get_paper(paper_id: int, request: Request, db=Depends(get_session)):
+    """Paper with its extracts, ground truth and datasets; supports If-None-Match."""
+    return await cached_detail(
+        request, db, "papers", paper_id, details.paper_version, details.get_paper
+    )
+
+
+@router.get("/{paper_id}/pdf", response_class=RedirectResponse, status_code=307)
+async def get_paper_pdf(paper_id: int, request: Request, db=Depends(get_session)):
+    """Redirect to the paper's PDF in the content-addressed store."""
+    paper = await run_with_session(db, lambda session: session.get(Paper, paper_id))
+    if paper is None:
+        raise HTTPException(status_code=404, detail=f"Paper {paper_id} not found")
+    try:
+        pdf_store.require_store()
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    if await run_in_threadpool(pdf_store.stored_path, paper.pdf_hash) is None:
+        raise HTTPException(status_code=404, detail=f"Paper {paper_id} has no stored PDF")
+    return RedirectResponse(request.url_for("get_pdf", pdf_hash=paper.pdf_hash), status_code=307)
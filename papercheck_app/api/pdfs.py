@@ -0,0 +1,111 @@
+"""PDF store API routes."""
+
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+
+from ..core.cache import etag_matches, response_cache
+from ..core.database import get_session, run_job, run_with_session
+from ..models import Paper
+from ..schemas import PdfBlob, PdfStoreImportResult
+from ..services import ingest, pdf_store
+
+router = APIRouter(prefix="/pdfs", tags=["pdfs"])
+
+# Blobs never change, so clients and proxies may keep them indefinitely
+BLOB_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _store_root() -> str:
+    try:
+        return pdf_store.require_store()
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+
+@router.post("", response_model=PdfBlob)
+async def upload_pdf(
+    request: Request,
+    paper_id: Optional[int] = Query(None, description="Paper the PDF belongs to"),
+    db=Depends(get_session),
+):
+    """Stream a PDF request body into the store.
+
+    With ``paper_id`` the content must match the paper's pdf_hash, or
+    becomes it if the paper has none. Nothing is published unless the whole
+    body arrived, and the hash is recorded on the paper before the blob is
+    published: when it cannot be (409), nothing is left in the store.
+    """
+    _store_root()
+    expected_hash = None
+    if paper_id is not None:
+        paper = await run_with_session(db, lambda session: session.get(Paper, paper_id))
+        if paper is None:
+            raise HTTPException(status_code=404, detail=f"Paper {paper_id} not found")
+        expected_hash = paper.pdf_hash
+    attach = paper_id is not None and expected_hash is None
+
+    writer = await run_in_threadpool(pdf_store.BlobWriter)
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(writer.write, chunk)
+        if attach:
+            try:
+                await run_with_session(db, pdf_store.attach_to_paper, paper_id, writer.pdf_hash)
+            except ValueError as e:
+                raise HTTPException(status_code=409, detail=str(e))
+            response_cache.invalidate("papers", [paper_id])
+        blob = await run_in_threadpool(writer.commit, expected_hash)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        await run_in_threadpool(writer.abort)
+    return blob
+
+
+@router.post("/import", response_model=PdfStoreImportResult)
+async def import_pdfs(
+    dataset_id: Optional[int] = Query(None, description="Only papers of this dataset"),
+    max_workers: Optional[int] = Query(None, ge=1, le=256, description="Copying threads"),
+    db=Depends(get_session),
+):
+    """Copy the files behind papers' pdf_path into the store."""
+    _store_root()
+    if dataset_id is not None:
+        if await run_with_session(db, ingest.get_dataset_or_none, dataset_id) is None:
+            raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+    result = await run_job(pdf_store.import_papers, dataset_id, max_workers)
+    response_cache.invalidate("papers")
+    return result
+
+
+@router.get("/{pdf_hash}", response_class=FileResponse)
+async def get_pdf(pdf_hash: str, request: Request):
+    """Serve a stored PDF; supports Range and If-None-Match.
+
+    The file is streamed from disk (or handed to the server with the ASGI
+    pathsend extension where supported), never read into memory whole.
+    """
+    root = _store_root()
+    try:
+        path = pdf_store.blob_path(pdf_hash, root)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"PDF {pdf_hash} not found")
+    if not await run_in_threadpool(os.path.isfile, path):
+        raise HTTPException(status_code=404, detail=f"PDF {pdf_hash} not found")
+
+    etag = f'"{pdf_hash}"'
+    headers = {"ETag": etag, "Cache-Control": BLOB_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        headers=headers,
+        filename=f"{pdf_hash}.pdf",
+        content_disposition_type="inline",
+    )
@@ -0,0 +1,36 @@
+"""Extract reference API routes."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..core.database import get_session, run_job, run_with_session
+from ..core.pagination import PageParams, page_params
+from ..schemas import ExtractReferenceRead, Page, ReferenceLoadResult
+from ..services import extract_references
+
+router = APIRouter(prefix="/references", tags=["references"])
+
+
+@router.get("", response_model=Page[ExtractReferenceRead])
+async def search_references(
+    doi: Optional[str] = Query(None, description="Cited DOI, normalized before matching"),
+    title: Optional[str] = Query(None, description="Cited title, matched after normalization"),
+    year: Optional[int] = Query(None, description="Only references from this year"),
+    extractor_id: Optional[int] = Query(None, description="Only references extracted by this extractor"),
+    page: PageParams = Depends(page_params),
+    db=Depends(get_session),
+):
+    """Extracted references citing a DOI or title, through the extract_references indexes."""
+    try:
+        return await run_with_session(
+            db, extract_references.search, page, doi, title, year, extractor_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/load", response_model=ReferenceLoadResult)
+async def load_references():
+    """COPY the references of extracts stored before extract_references existed."""
+    return await run_job(extract_references.load_missing)
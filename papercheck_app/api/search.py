@@ -0,0 +1,79 @@
+"""Search API routes: full-text and JSONB."""
+
+import json
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..core.database import get_session, run_with_session
+from ..core.pagination import MAX_PAGE_SIZE, PageParams, decode_rank_cursor, page_params
+from ..schemas import ExtractSummary, GroundTruthSummary, Page, TextSearchHit
+from ..services import jsonb_search, text_search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+# Declared before /{target}/{field}, which would otherwise match /text/...
+@router.get("/text/{target}", response_model=Page[TextSearchHit])
+async def search_text(
+    target: str,
+    q: str = Query(..., min_length=1, description='Words, "phrases", or and -exclusions'),
+    extractor_id: Optional[int] = Query(None, description="extracts only: this extractor"),
+    highlight: bool = Query(True, description="Add title and abstract highlights"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    db=Depends(get_session),
+):
+    """Ranked full-text search over titles and abstracts of extracts or ground truths."""
+    if target not in text_search.TARGETS:
+        raise HTTPException(status_code=404, detail=f"Unknown search target '{target}'")
+    try:
+        after = decode_rank_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await run_with_session(
+        db, text_search.search_text, target, q, after, limit, extractor_id, highlight
+    )
+
+
+@router.get(
+    "/{target}/{field}",
+    response_model=Union[Page[ExtractSummary], Page[GroundTruthSummary]],
+)
+async def search_jsonb(
+    target: str,
+    field: str,
+    contains: Optional[str] = Query(None, description="JSON document the column must contain (@>)"),
+    path: Optional[str] = Query(None, description="jsonpath that must return an item (@?); only its == comparisons use the index"),
+    match: Optional[str] = Query(None, description="jsonpath predicate that must be true (@@); only its == comparisons use the index"),
+    doi: Optional[str] = Query(None, description="refs only: cites this DOI"),
+    author: Optional[str] = Query(None, description="authors only: has an author with this name or surname"),
+    page: PageParams = Depends(page_params),
+    db=Depends(get_session),
+):
+    """Extracts or ground truths whose refs or authors match, through the GIN indexes.
+
+    ``target`` is ``extracts`` or ``ground_truths``, ``field`` is ``refs`` or
+    ``authors``; all given criteria must hold.
+    """
+    if (target, field) not in jsonb_search.COLUMNS:
+        raise HTTPException(status_code=404, detail=f"Unknown search column {target}.{field}")
+    try:
+        document = json.loads(contains) if contains is not None else None
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail=f"contains is not valid JSON: {e}")
+    try:
+        return await run_with_session(
+            db,
+            jsonb_search.search,
+            target,
+            field,
+            page,
+            contains=document,
+            path=path,
+            match=match,
+            doi=doi,
+            author=author,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
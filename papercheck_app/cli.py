@@ -0,0 +1,77 @@
+"""Command line interface for papercheck_app."""
+
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from .core.database import SessionLocal
+from .services import arrow_export, evaluation
+
+
+def export_metrics(args: argparse.Namespace) -> int:
+    """Write ExtractEval metrics to a Parquet or Arrow IPC file."""
+    fmt = args.format or ("arrow" if args.output.endswith((".arrow", ".arrows")) else "parquet")
+    start = time.perf_counter()
+    try:
+        arrow_export.require_pyarrow()
+        columns = arrow_export.resolve_columns(args.columns)
+        with open(args.output, "wb") as sink:
+            rows = arrow_export.write_export(
+                sink,
+                fmt,
+                columns,
+                dataset_ids=args.dataset,
+                extractor_ids=args.extractor,
+                extractor_types=args.extractor_type,
+            )
+    except (RuntimeError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"{rows} rows written to {args.output} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def evaluate_stale(args: argparse.Namespace) -> int:
+    """Recompute missing and out-of-date ExtractEvals."""
+    with SessionLocal() as db:
+        result = evaluation.evaluate_stale(
+            db,
+            dataset_id=args.dataset,
+            extractor_id=args.extractor,
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+        )
+    print(f"{result.pairs_evaluated} evals recomputed in {result.elapsed_seconds:.1f}s")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="papercheck", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export-metrics", help=export_metrics.__doc__)
+    export.add_argument("output", help="Output file (.parquet, .arrow)")
+    export.add_argument("--format", choices=sorted(arrow_export.FORMATS), help="Defaults from the file extension")
+    export.add_argument("--columns", nargs="+", help=f"Columns to export: {', '.join(arrow_export.COLUMNS)}")
+    export.add_argument("--dataset", type=int, action="append", help="Dataset ID (repeatable)")
+    export.add_argument("--extractor", type=int, action="append", help="Extractor ID (repeatable)")
+    export.add_argument("--extractor-type", action="append", help="Extractor type (repeatable)")
+    export.set_defaults(handler=export_metrics)
+
+    stale = commands.add_parser("evaluate-stale", help=evaluate_stale.__doc__)
+    stale.add_argument("--dataset", type=int, help="Dataset ID")
+    stale.add_argument("--extractor", type=int, help="Extractor ID")
+    stale.add_argument("--batch-size", type=int, default=evaluation.DEFAULT_BATCH_SIZE)
+    stale.add_argument("--workers", type=int, help="Worker processes, one per CPU by default")
+    stale.set_defaults(handler=evaluate_stale)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
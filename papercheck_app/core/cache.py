@@ -0,0 +1,141 @@
+"""HTTP response cache for detail reads, with ETag revalidation.
+
+The ETag of a resource is derived from its ID and the ``updated_at`` values
+of the rows its representation is built from (the "version"). Reading the
+version is a single cheap query, so a request whose ``If-None-Match`` still
+matches gets a 304 without loading or serializing anything, and a request
+whose cached body carries the current ETag is answered from memory.
+
+Cached bodies live in a bounded LRU with a TTL and are dropped explicitly
+on writes; since the version is checked on every request, a missed
+invalidation can never serve stale data, it only costs a cache miss.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel as PydanticModel
+
+from .config import settings
+from .database import run_with_session
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized responses with a time-to-live."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, etag: str) -> Optional[bytes]:
+        """Cached body of ``key`` if it is fresh and still has ``etag``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic() and entry[1] == etag:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, etag: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self.not_modified += 1
+
+    def invalidate(self, kind: str, ids: Optional[Iterable[Any]] = None) -> None:
+        """Drop cached responses of ``kind``, or only those of ``ids``."""
+        with self._lock:
+            if ids is None:
+                keys = [key for key in self._entries if key[0] == kind]
+            else:
+                keys = [(kind, id) for id in ids if (kind, id) in self._entries]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+response_cache = ResponseCache(
+    settings.response_cache_max_entries, settings.response_cache_ttl_seconds
+)
+
+
+def make_etag(kind: str, id: Any, version: Iterable[Any]) -> str:
+    """Strong ETag from the resource identity and its version values."""
+    digest = hashlib.sha1(repr((kind, id, tuple(version))).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+async def cached_detail(
+    request: Request,
+    db,
+    kind: str,
+    id: int,
+    version: Callable[..., Optional[tuple]],
+    load: Callable[..., Optional[PydanticModel]],
+) -> Response:
+    """Serve a detail read through the ETag check and the response cache.
+
+    ``version(session, id)`` returns the version tuple (None if the resource
+    does not exist) and ``load(session, id)`` the response schema.
+    """
+    current = await run_with_session(db, version, id)
+    if current is None:
+        raise HTTPException(status_code=404, detail=f"{kind.rstrip('s').capitalize()} {id} not found")
+    etag = make_etag(kind, id, current)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response_cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get((kind, id), etag)
+    if body is None:
+        item = await run_with_session(db, load, id)
+        if item is None:
+            raise HTTPException(status_code=404, detail=f"{kind.rstrip('s').capitalize()} {id} not found")
+        body = item.model_dump_json().encode()
+        response_cache.put((kind, id), etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -26,9 +26,80 @@ class Settings(BaseSettings):
     postgres_host: str = Field(default="localhost", description="PostgreSQL host")
     postgres_port: int = Field(default=5432, description="PostgreSQL port")
 
+    # Async database settings
+    async_database_url: Optional[str] = Field(
+        default=None,
+        description="asyncpg database URL, derived from database_url when not set",
+    )
+    use_async_db: bool = Field(
+        default=False, description="Serve API handlers through the async (asyncpg) engine"
+    )
+
+    # Folder scanning
+    scan_workers: Optional[int] = Field(
+        default=None, description="Hashing processes for folder scans (default: CPU count)"
+    )
+    scan_manifest_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for scan manifests (default: inside each dataset folder)",
+    )
+
+    # Content-addressed PDF store
+    pdf_store_root: Optional[str] = Field(
+        default=None,
+        description="Root directory of the PDF store, sharded by pdf_hash prefix (disabled when unset)",
+    )
+
+    # Extraction dispatcher
+    extraction_concurrency: int = Field(
+        default=4, description="Concurrent requests per extractor endpoint"
+    )
+    extraction_max_connections: int = Field(
+        default=32, description="Size of the shared keep-alive HTTP connection pool"
+    )
+    extraction_timeout_seconds: float = Field(
+        default=180.0, description="Timeout for one extraction request"
+    )
+    extraction_max_retries: int = Field(
+        default=3, description="Retries per PDF on timeouts and transient errors"
+    )
+    extraction_batch_size: int = Field(
+        default=50, description="Extract rows written per database batch"
+    )
+
+    # Reference storage
+    store_refs_jsonb: bool = Field(
+        default=True,
+        description="Also keep the refs payload in extracts.extracted_refs (extract_references always gets the rows)",
+    )
+
+    # HTTP response cache
+    response_cache_max_entries: int = Field(
+        default=2048, description="Serialized detail responses kept in memory (LRU)"
+    )
+    response_cache_ttl_seconds: float = Field(
+        default=300.0, description="Lifetime of a cached response"
+    )
+
+    # SQL statement budget per request (N+1 guard)
+    query_budget: Optional[int] = Field(
+        default=None,
+        description="Fail requests that run more SQL statements than this (500 with the statements)",
+    )
+
     # Environment
     environment: str = Field(default="development", description="Environment name")
 
+    @property
+    def async_db_url(self) -> str:
+        """Database URL for the async engine (postgresql+asyncpg://...)."""
+        if self.async_database_url:
+            return self.async_database_url
+        _, sep, rest = self.database_url.partition("://")
+        if not sep:
+            return self.database_url
+        return f"postgresql+asyncpg://{rest}"
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
@@ -1,10 +1,13 @@
 """Database configuration and session management."""
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from .config import settings
+from .monitoring import TimedAsyncQueuePool, TimedQueuePool, instrument_engine
 
 # Create the SQLAlchemy engine
 engine = create_engine(
@@ -12,11 +15,30 @@ engine = create_engine(
     echo=settings.is_development,  # Enable SQL logging in development
     pool_pre_ping=True,  # Validate connections before use
     pool_recycle=300,  # Recycle connections every 5 minutes
+    poolclass=TimedQueuePool,  # Checkout wait times for /metrics
 )
 
+# Async engine (asyncpg) sharing the same database and pool settings
+async_engine = create_async_engine(
+    settings.async_db_url,
+    echo=settings.is_development,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    poolclass=TimedAsyncQueuePool,
+)
+
+# Statement timings and pool gauges for /metrics
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+
 # Create a configured "Session" class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async sessions keep attributes loaded after commit so results can be serialized
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
+
 # Create a Base class for our models
 Base = declarative_base()
 
@@ -28,3 +50,39 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency used by the API, switched by the USE_ASYNC_DB setting
+get_session = get_async_db if settings.use_async_db else get_db
+
+
+async def run_with_session(db, fn, *args, **kwargs):
+    """Run ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    Services are written against a sync ``Session``. With an ``AsyncSession``
+    they run through ``run_sync`` on the asyncpg connection, otherwise in the
+    threadpool with the sync session.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def run_job(fn, *args, **kwargs):
+    """Run ``fn(session, *args, **kwargs)`` in the threadpool with its own sync session.
+
+    For long jobs (evaluations, scans) that must stay off the event loop even
+    when the API is served through the async engine.
+    """
+
+    def _run():
+        with SessionLocal() as db:
+            return fn(db, *args, **kwargs)
+
+    return await run_in_threadpool(_run)
@@ -0,0 +1,186 @@
+"""Prometheus metrics of the API, the database and the background jobs.
+
+Served in the text exposition format at ``/metrics`` (see ``main.py``):
+
+- ``MetricsMiddleware`` times every request into a histogram per method,
+  route template and status, and the app-wide ``track_in_progress``
+  dependency counts requests in flight per route. Paths matching no route
+  share the ``<unmatched>`` label, so scanners and typos cannot blow up the
+  number of series.
+- ``instrument_engine`` times every SQL statement of an engine through
+  ``before_cursor_execute`` / ``after_cursor_execute``, labelled with the
+  statement's verb only, and reports the size and usage of its pool when
+  scraped.
+- The engines are created with ``TimedQueuePool`` / ``TimedAsyncQueuePool``,
+  which time each checkout: the wait for a free connection (or a new one)
+  before a session can run anything.
+- Services count what the ingestion, extraction and evaluation jobs got
+  through, so throughput is ``rate()`` of those counters.
+
+Metrics live in the default registry, next to the process and platform
+collectors of ``prometheus_client``.
+"""
+
+import time
+from typing import AsyncIterator, Dict
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+UNMATCHED_ROUTE = "<unmatched>"
+SQL_VERBS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "papercheck_http_request_duration_seconds",
+    "Time to handle an HTTP request, up to the response start",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "papercheck_http_requests_in_progress",
+    "HTTP requests being handled",
+    ["method", "route"],
+)
+SQL_STATEMENT_SECONDS = Histogram(
+    "papercheck_sql_statement_duration_seconds",
+    "Execution time of one SQL statement (executemany counts once)",
+    ["engine", "verb"],
+    buckets=SQL_BUCKETS,
+)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "papercheck_db_pool_checkout_seconds",
+    "Time to get a connection from the pool, waiting for a free one or opening a new one",
+    ["engine"],
+    buckets=CHECKOUT_BUCKETS,
+)
+PAPERS_INGESTED = Counter(
+    "papercheck_ingested_papers_total",
+    "Paper records processed by ingestion",
+    ["outcome"],  # inserted, skipped (pdf_hash known), duplicate (repeated in the payload)
+)
+EXTRACTIONS = Counter(
+    "papercheck_extractions_total",
+    "Papers extracted by the dispatcher",
+    ["extractor_id", "outcome"],  # completed, failed, cached (copied from an identical extract)
+)
+EVALUATIONS = Counter(
+    "papercheck_evaluated_pairs_total",
+    "Extract/ground truth pairs scored and stored",
+    ["run"],  # dataset, stale
+)
+
+
+class _TimedCheckout:
+    """Pool mixin observing how long ``connect`` takes into POOL_CHECKOUT_SECONDS."""
+
+    engine_label = ""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT_SECONDS.labels(self.engine_label).observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+class PoolCollector:
+    """Size, checked-out and overflow connections of the engines' pools, read at scrape time."""
+
+    def __init__(self):
+        self.engines: Dict[str, Engine] = {}
+
+    def collect(self):
+        for name, documentation, read in (
+            ("papercheck_db_pool_size", "Connections the pool keeps open", lambda pool: pool.size()),
+            ("papercheck_db_pool_checked_out", "Connections in use", lambda pool: pool.checkedout()),
+            ("papercheck_db_pool_checked_in", "Idle connections in the pool", lambda pool: pool.checkedin()),
+            (
+                "papercheck_db_pool_overflow",
+                "Connections opened beyond the pool size (negative: not yet opened)",
+                lambda pool: pool.overflow(),
+            ),
+        ):
+            family = GaugeMetricFamily(name, documentation, labels=["engine"])
+            for label, engine in self.engines.items():
+                family.add_metric([label], read(engine.pool))
+            yield family
+
+
+POOLS = PoolCollector()
+REGISTRY.register(POOLS)
+
+
+def _verb(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in SQL_VERBS else "OTHER"
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """Time the SQL statements of ``engine`` and report its pool (a sync engine or ``sync_engine``)."""
+    histograms = {verb: SQL_STATEMENT_SECONDS.labels(label, verb) for verb in SQL_VERBS | {"OTHER"}}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._monitoring_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _observe(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_monitoring_start", None)
+        if start is not None:
+            histograms[_verb(statement)].observe(time.perf_counter() - start)
+
+    POOLS.engines[label] = engine
+
+
+def route_template(request: Request) -> str:
+    """Path template of the route that handled ``request``, e.g. ``/papers/{paper_id}``.
+
+    The router records the matched route in the scope, whatever the nesting
+    of the routers it came from.
+    """
+    return getattr(request.scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+async def track_in_progress(request: Request) -> AsyncIterator[None]:
+    """App-wide dependency counting the requests in flight per route.
+
+    A dependency rather than part of the middleware: it runs once routing
+    is done, so the route is known when the request is counted.
+    """
+    in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(request.method, route_template(request))
+    in_progress.inc()
+    try:
+        yield
+    finally:
+        in_progress.dec()
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Observe the latency of every request, per method, route and status."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        status = "500"
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            HTTP_REQUEST_SECONDS.labels(request.method, route_template(request), status).observe(
+                time.perf_counter() - start
+            )
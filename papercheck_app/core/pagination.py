@@ -0,0 +1,115 @@
+"""Keyset pagination with opaque cursors.
+
+Collections are ordered by ``(created_at, id)`` from ``BaseModel`` and a page
+starts strictly after the last row of the previous one, so fetching page N
+is an index range scan costing the same as page 1 (no OFFSET). The cursor is
+the url-safe base64 of that last ``(created_at, id)``; ranked listings such
+as full-text search use ``(rank, id)`` the same way, and plain ID listings
+such as a dataset's paper IDs the last ID.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple, Type
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel as PydanticModel
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from ..schemas import Page
+from ..services.loaders import options_for
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> list:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    return json.loads(raw)
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque cursor pointing after the row ``(created_at, id)``."""
+    return _encode([created_at.isoformat(), id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of ``encode_cursor``; raises ValueError for malformed cursors."""
+    try:
+        created_at, id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+
+def encode_rank_cursor(rank: float, id: int) -> str:
+    """Opaque cursor pointing after the row ``(rank, id)`` of a ranked listing."""
+    return _encode([rank, id])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """Inverse of ``encode_rank_cursor``; raises ValueError for malformed cursors."""
+    try:
+        rank, id = _decode(cursor)
+        return float(rank), int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+
+def encode_id_cursor(id: int) -> str:
+    """Opaque cursor pointing after ``id`` of a listing ordered by ID."""
+    return _encode([id])
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """Inverse of ``encode_id_cursor``; raises ValueError for malformed cursors."""
+    try:
+        (id,) = _decode(cursor)
+        return int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+
+@dataclass
+class PageParams:
+    """Validated ``cursor`` and ``limit`` query parameters."""
+
+    after: Optional[Tuple[datetime, int]]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+) -> PageParams:
+    """Dependency parsing pagination query parameters."""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PageParams(after=after, limit=limit)
+
+
+def paginate(db: Session, query, model, schema: Type[PydanticModel], params: PageParams) -> Page:
+    """One page of ``query`` over ``model``, with items validated as ``schema``.
+
+    ``query`` must select the ``model`` entity; ordering and the loader
+    options of ``schema`` are added here.
+    """
+    query = query.options(*options_for(schema))
+    if params.after is not None:
+        query = query.where(tuple_(model.created_at, model.id) > tuple_(*params.after))
+    rows = db.scalars(query.order_by(model.created_at, model.id).limit(params.limit + 1)).all()
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return Page[schema](items=[schema.model_validate(row) for row in rows], next_cursor=next_cursor)
@@ -0,0 +1,84 @@
+"""Counting SQL statements per request or block, with an optional budget.
+
+A ``before_cursor_execute`` listener on both engines appends each statement
+to the counter active in the current context (a ``ContextVar``, which is
+carried into the threadpool and through ``AsyncSession.run_sync``), so
+concurrent requests are counted separately.
+
+- ``count_queries(budget)`` is a context manager for tests and debugging:
+  it raises ``QueryBudgetExceeded`` when more statements ran than allowed.
+- ``QueryCountMiddleware`` adds an ``X-Query-Count`` header to every
+  response and, with a ``QUERY_BUDGET`` set, turns requests over budget
+  into 500 errors so N+1 regressions fail loudly in development and CI.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from .database import async_engine, engine
+
+_statements: ContextVar[Optional[List[str]]] = ContextVar("query_statements", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More SQL statements ran than the budget allows."""
+
+    def __init__(self, budget: int, statements: List[str]):
+        self.budget = budget
+        self.statements = statements
+        listing = "\n".join(f"  {i + 1}. {sql}" for i, sql in enumerate(statements))
+        super().__init__(f"{len(statements)} SQL statements, budget {budget}:\n{listing}")
+
+
+def _record(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(" ".join(statement.split()))
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def count_queries(budget: Optional[int] = None) -> Iterator[List[str]]:
+    """Collect the SQL statements run in this block; enforce ``budget`` on exit."""
+    statements: List[str] = []
+    token = _statements.set(statements)
+    try:
+        yield statements
+    finally:
+        _statements.reset(token)
+    if budget is not None and len(statements) > budget:
+        raise QueryBudgetExceeded(budget, statements)
+
+
+class QueryCountMiddleware(BaseHTTPMiddleware):
+    """Report (and optionally limit) the SQL statements of each request."""
+
+    def __init__(self, app, budget: Optional[int] = None):
+        super().__init__(app)
+        self.budget = budget
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        statements: List[str] = []
+        token = _statements.set(statements)
+        try:
+            response = await call_next(request)
+        finally:
+            _statements.reset(token)
+        if self.budget is not None and len(statements) > self.budget:
+            error = QueryBudgetExceeded(self.budget, statements)
+            return JSONResponse(
+                status_code=500,
+                content={"detail": str(error).splitlines()[0], "statements": statements},
+                headers={"X-Query-Count": str(len(statements))},
+            )
+        response.headers["X-Query-Count"] = str(len(statements))
+        return response
@@ -6,7 +6,10 @@ from .dataset import Dataset, dataset_paper_association
 from .ground_truth import GroundTruth
 from .extractor import Extractor
 from .extract import Extract
+from .extract_reference import ExtractReference
 from .extracteval import ExtractEval
+from .leaderboard import LeaderboardMetric
+from .near_duplicate import ExtractMinHash, NearDuplicatePair
 
 __all__ = [
     "BaseModel",
@@ -16,5 +19,9 @@ __all__ = [
     "GroundTruth",
     "Extractor",
     "Extract",
+    "ExtractReference",
     "ExtractEval",
+    "LeaderboardMetric",
+    "ExtractMinHash",
+    "NearDuplicatePair",
 ]
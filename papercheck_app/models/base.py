@@ -1,7 +1,6 @@
 """Base model with common fields for all tables."""
 
-from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy import Column, Integer, DateTime, func
 from sqlalchemy.ext.declarative import declared_attr
 
 from ..core.database import Base
@@ -13,8 +12,8 @@ class BaseModel(Base):
     __abstract__ = True
 
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
+    # Timestamps are filled in by the database so bulk inserts need no per-row values
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc), nullable=False
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
     )
-
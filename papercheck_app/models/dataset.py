@@ -1,8 +1,8 @@
 """Dataset model - named collections of papers."""
 
-from sqlalchemy import Column, String, Text, Table, ForeignKey
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Column, String, Text, Table, ForeignKey, Index, func, select
+from sqlalchemy.orm import relationship, column_property
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 
 from .base import BaseModel
 
@@ -13,6 +13,7 @@ dataset_paper_association = Table(
     BaseModel.metadata,
     Column("dataset_id", ForeignKey("datasets.id"), primary_key=True),
     Column("paper_id", ForeignKey("papers.id"), primary_key=True),
+    Index("ix_dataset_papers_paper_id", "paper_id"),  # datasets of a paper
 )
 
 
@@ -21,6 +22,10 @@ class Dataset(BaseModel):
 
     __tablename__ = "datasets"
 
+    __table_args__ = (
+        Index("ix_datasets_created_at_id", "created_at", "id"),  # keyset pagination
+    )
+
     # Dataset information
     name = Column(String(255), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
@@ -42,4 +47,19 @@ class Dataset(BaseModel):
     )
 
     def __repr__(self):
-        return f"<Dataset(id={self.id}, name='{self.name}', papers_count={len(self.papers)})>"
+        # No relationship access: repr must not load the papers
+        return f"<Dataset(id={self.id}, name='{self.name}')>"
+
+
+# Paper IDs of a dataset without loading the papers; deferred, undefer it when serializing
+Dataset.paper_ids = column_property(
+    select(
+        func.array_agg(
+            aggregate_order_by(dataset_paper_association.c.paper_id, dataset_paper_association.c.paper_id)
+        )
+    )
+    .where(dataset_paper_association.c.dataset_id == Dataset.id)
+    .correlate_except(dataset_paper_association)  # the papers -> datasets join includes it
+    .scalar_subquery(),
+    deferred=True,
+)
@@ -1,8 +1,8 @@
 """Extract model - results from extraction processes."""
 
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, JSON, Float
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import JSONB, ARRAY
+from sqlalchemy import BigInteger, Column, Computed, FetchedValue, String, Text, Integer, ForeignKey, JSON, Float, Index, text
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, TSVECTOR
 
 from .base import BaseModel
 
@@ -12,11 +12,36 @@ class Extract(BaseModel):
 
     __tablename__ = "extracts"
 
+    # Partitioned by extractor (extracts_extractor_<id>, created with the
+    # extractor, see services.partitions). The partition key has to be part of
+    # the primary key; id stays unique as it comes from the table's sequence.
+    # Indexes are per partition, so none needs to lead with extractor_id.
+    __table_args__ = (
+        # Keyset pagination, overall and within an extractor's partition
+        Index("ix_extracts_created_at_id", "created_at", "id"),
+        # Containment (@>) and jsonpath (@?, @@) queries, see services.jsonb_search
+        Index(
+            "ix_extracts_extracted_refs_gin",
+            "extracted_refs",
+            postgresql_using="gin",
+            postgresql_ops={"extracted_refs": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_extracts_extracted_authors_gin",
+            "extracted_authors",
+            postgresql_using="gin",
+            postgresql_ops={"extracted_authors": "jsonb_path_ops"},
+        ),
+        # Full-text search, see services.text_search
+        Index("ix_extracts_search_vector", "search_vector", postgresql_using="gin"),
+        {"postgresql_partition_by": "LIST (extractor_id)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+
     # References
     paper_id = Column(Integer, ForeignKey("papers.id"), nullable=False, index=True)
-    extractor_id = Column(
-        Integer, ForeignKey("extractors.id"), nullable=False, index=True
-    )
+    extractor_id = Column(Integer, ForeignKey("extractors.id"), primary_key=True)
 
     # Extraction metadata
     extraction_date = Column(String(50), nullable=True)
@@ -29,6 +54,15 @@ class Extract(BaseModel):
     extracted_xrefs = Column(JSONB, nullable=True) # List of cross-references
     extracted_abstract = Column(Text, nullable=True)  # Abstract text
     extracted_keywords = Column(ARRAY(String), nullable=True)  # List of keywords
+    # Title (weight A) and abstract (weight B) words, maintained by the database
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english'::regconfig, coalesce(extracted_title, '')), 'A') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(extracted_abstract, '')), 'B')",
+            persisted=True,
+        ),
+    ))
 
     # Processing information
     processing_time_seconds = Column(Float, nullable=True)
@@ -36,12 +70,21 @@ class Extract(BaseModel):
         String(50), default="completed", nullable=False
     )  # completed, failed, partial
     error_message = Column(Text, nullable=True)
+    # Drawn from the change_seq sequence on insert and on every update (trigger),
+    # see services.evaluation.stale_condition
+    change_seq = Column(
+        BigInteger, server_default=text("nextval('change_seq')"), server_onupdate=FetchedValue(), nullable=False
+    )
 
     # Relationships
     paper = relationship("Paper", back_populates="extracts")
     extractor = relationship("Extractor", back_populates="extracts")
     extract_eval = relationship(
-        "ExtractEval", back_populates="extract", uselist=False, cascade="all, delete-orphan"
+        "ExtractEval",
+        back_populates="extract",
+        uselist=False,
+        cascade="all, delete-orphan",
+        overlaps="extract_evals,extractor",
     )
 
     def __repr__(self):
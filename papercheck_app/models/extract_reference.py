@@ -0,0 +1,48 @@
+"""Extract reference model - one row per reference of an extract."""
+
+from sqlalchemy import Column, ForeignKeyConstraint, Index, Integer, String, Text, UniqueConstraint
+
+from .base import BaseModel
+
+
+class ExtractReference(BaseModel):
+    """One reference of an extract's reference list, normalized for lookups.
+
+    Loaded with COPY from the refs payload whenever extracts are stored, see
+    services.extract_references; ``extracts.extracted_refs`` only keeps the
+    payload itself when ``STORE_REFS_JSONB`` is on.
+    """
+
+    __tablename__ = "extract_references"
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["extract_id", "extractor_id"],
+            ["extracts.id", "extracts.extractor_id"],
+            ondelete="CASCADE",
+        ),
+        # Also serves the lookup of an extract's references, in order
+        UniqueConstraint("extract_id", "extractor_id", "ordinal", name="_extract_reference_ordinal_uc"),
+        Index("ix_extract_references_doi", "doi"),
+        Index("ix_extract_references_title_normalized", "title_normalized"),
+        # Partitioned like extracts, one partition per extractor
+        {"postgresql_partition_by": "LIST (extractor_id)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+
+    # References
+    extract_id = Column(Integer, nullable=False)
+    extractor_id = Column(Integer, primary_key=True)
+
+    # Position in the extract's reference list, from 0
+    ordinal = Column(Integer, nullable=False)
+
+    doi = Column(String(255), nullable=True)  # Normalized: lowercase, without resolver prefix
+    title = Column(Text, nullable=True)  # As extracted
+    title_normalized = Column(Text, nullable=True)  # references.normalize_title of the title
+    year = Column(Integer, nullable=True)
+    raw = Column(Text, nullable=True)  # Raw reference string
+
+    def __repr__(self):
+        return f"<ExtractReference(extract_id={self.extract_id}, ordinal={self.ordinal}, doi='{self.doi}')>"
@@ -1,6 +1,20 @@
 """ExtractEval model - evaluation results comparing extracts with ground truth."""
 
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, JSON, Float, Boolean
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -11,20 +25,33 @@ class ExtractEval(BaseModel):
 
     __tablename__ = "extractevals"
 
+    # Partitioned like extracts, one partition per extractor
+    __table_args__ = (
+        # Keyset pagination, overall and within an extractor's partition
+        Index("ix_extractevals_created_at_id", "created_at", "id"),
+        # The extract's partition key is part of its key
+        ForeignKeyConstraint(["extract_id", "extractor_id"], ["extracts.id", "extracts.extractor_id"]),
+        UniqueConstraint("extract_id", "extractor_id", name="_extracteval_extract_uc"),
+        {"postgresql_partition_by": "LIST (extractor_id)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+
     # Foreign keys
 
-    extract_id = Column(
-        Integer, ForeignKey("extracts.id"), nullable=False, unique=True, index=True
-    )    
-    extractor_id = Column(
-        Integer, ForeignKey("extractors.id"), nullable=False, index=True
-    )
+    extract_id = Column(Integer, nullable=False)  # Looked up through _extracteval_extract_uc
+    extractor_id = Column(Integer, ForeignKey("extractors.id"), primary_key=True)
     ground_truth_id = Column(
         Integer, ForeignKey("ground_truths.id"), nullable=False, index=True
     )
 
     # Evaluation metadata
     evaluation_date = Column(String(50), nullable=True)
+    # Staleness tracking, see services.evaluation.stale_condition
+    evaluated_at = Column(DateTime, nullable=True)  # When the extract and ground truth were read
+    metrics_version = Column(Integer, nullable=True)  # evaluation.METRICS_VERSION used
+    extract_change_seq = Column(BigInteger, nullable=True)  # change_seq of the extract scored
+    ground_truth_change_seq = Column(BigInteger, nullable=True)  # change_seq of the ground truth scored
 
     # Performance metrics below
 
@@ -73,32 +100,31 @@ class ExtractEval(BaseModel):
         Float, nullable=True
     )  # Average Jaro-Winkler similarity for individual keywords
 
-    # Authors, TODO add later
-    # authors table in jsonb
-    # authors_order_preserved = Column(
-    #     Boolean, nullable=True
-    # )  # 1.0 if author order is preserved, else 0.0
-    
-    # Author list comparison metrics, need to define exact criteria for matching tho
-    # authors_f1 = Column(Float, nullable=True) # F1 score for author matching
-    # authors_precision = Column(Float, nullable=True) # Precision for author matching
-    # authors_recall = Column(Float, nullable=True) # Recall for author matching
-    # authors_jaccard_index = Column(Float, nullable=True) # Jaccard index for author lists
-
-    # # Averaged field-level metrics across matched authors
-    # authors_avg_name_jaro_winkler = Column(Float, nullable=True) # Avg Jaro-Winkler for full names
-    # authors_avg_surname_jaro_winkler = Column(Float, nullable=True) # Avg Jaro-Winkler for surnames
-    # authors_avg_given_name_jaro_winkler = Column(Float, nullable=True) # Avg Jaro-Winkler for given names
+    # Authors (authors table in jsonb)
+    authors_order_preserved = Column(
+        Boolean, nullable=True
+    )  # 1.0 if author order is preserved, else 0.0
+
+    # Author list comparison metrics, authors are aligned on surname/given name similarity
+    authors_f1 = Column(Float, nullable=True) # F1 score for author matching
+    authors_precision = Column(Float, nullable=True) # Precision for author matching
+    authors_recall = Column(Float, nullable=True) # Recall for author matching
+    authors_jaccard_index = Column(Float, nullable=True) # Jaccard index for author lists
+
+    # Averaged field-level metrics across matched authors
+    authors_avg_name_jaro_winkler = Column(Float, nullable=True) # Avg Jaro-Winkler for full names
+    authors_avg_surname_jaro_winkler = Column(Float, nullable=True) # Avg Jaro-Winkler for surnames
+    authors_avg_given_name_jaro_winkler = Column(Float, nullable=True) # Avg Jaro-Winkler for given names
     # authors_avg_affiliation_semantic_similarity = Column(Float, nullable=True) # Avg semantic similarity for affiliations
-    # authors_email_match_rate = Column(Float, nullable=True) # Rate of exact email matches for matched authors
-
-    # References, TODO add later
-
-    # refs_f1 = Column(Float, nullable=True)  # F1 score for reference matching
-    # refs_precision = Column(Float, nullable=True)  # Precision for reference matching
-    # refs_recall = Column(Float, nullable=True)  # Recall for reference matching
-    # refs_jaccard_index = Column(Float, nullable=True)  # Jaccard index
-    # refs_avg_title_levenshtein = Column(Float, nullable=True)  # Avg Levenshtein distance for reference titles
+    authors_affiliation_match_rate = Column(Float, nullable=True) # Rate of matched authors sharing an affiliation
+    authors_email_match_rate = Column(Float, nullable=True) # Rate of exact email matches for matched authors
+
+    # References
+    refs_f1 = Column(Float, nullable=True)  # F1 score for reference matching
+    refs_precision = Column(Float, nullable=True)  # Precision for reference matching
+    refs_recall = Column(Float, nullable=True)  # Recall for reference matching
+    refs_jaccard_index = Column(Float, nullable=True)  # Jaccard index
+    refs_avg_title_levenshtein = Column(Float, nullable=True)  # Avg Levenshtein distance for reference titles
     # refs_avg_ref_levenshtein = Column(Float, nullable=True)  # Avg Levenshtein distance for full reference strings
 
 
@@ -113,8 +139,10 @@ class ExtractEval(BaseModel):
     )  # Details on evaluation methods used
 
     # Relationships
-    extract = relationship("Extract", back_populates="extract_eval", uselist=False)
-    extractor = relationship("Extractor", back_populates="extract_evals")
+    extract = relationship(
+        "Extract", back_populates="extract_eval", uselist=False, overlaps="extract_evals,extractor"
+    )
+    extractor = relationship("Extractor", back_populates="extract_evals", overlaps="extract,extract_eval")
     ground_truth = relationship("GroundTruth", back_populates="extract_evals")
 
     def __repr__(self):
@@ -1,8 +1,8 @@
 """Ground Truth model - ground truth extractions for papers."""
 
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Computed, FetchedValue, String, Text, Integer, ForeignKey, JSON, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from .base import BaseModel
 
@@ -11,7 +11,25 @@ class GroundTruth(BaseModel):
     """Ground Truth model representing ground truth extraction for papers."""
     
     __tablename__ = "ground_truths"
-    
+
+    # Containment (@>) and jsonpath (@?, @@) queries, see services.jsonb_search
+    __table_args__ = (
+        Index(
+            "ix_ground_truths_refs_gin",
+            "refs",
+            postgresql_using="gin",
+            postgresql_ops={"refs": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_ground_truths_authors_gin",
+            "authors",
+            postgresql_using="gin",
+            postgresql_ops={"authors": "jsonb_path_ops"},
+        ),
+        # Full-text search, see services.text_search
+        Index("ix_ground_truths_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     # Reference to paper
     paper_id = Column(Integer, ForeignKey("papers.id"), nullable=False, index=True)
 
@@ -24,6 +42,20 @@ class GroundTruth(BaseModel):
     xrefs = Column(JSONB, nullable=True) # List of cross-references
     abstract = Column(Text, nullable=True)  # Abstract text
     keywords = Column(ARRAY(String), nullable=True)  # List of keywords
+    # Title (weight A) and abstract (weight B) words, maintained by the database
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(abstract, '')), 'B')",
+            persisted=True,
+        ),
+    ))
+    # Drawn from the change_seq sequence on insert and on every update (trigger),
+    # see services.evaluation.stale_condition
+    change_seq = Column(
+        BigInteger, server_default=text("nextval('change_seq')"), server_onupdate=FetchedValue(), nullable=False
+    )
     # Relationships
     paper = relationship("Paper", back_populates="ground_truth", uselist=False)
     extract_evals = relationship(
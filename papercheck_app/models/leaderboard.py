@@ -0,0 +1,46 @@
+"""Leaderboard model - running aggregates of ExtractEval metrics."""
+
+from sqlalchemy import Column, String, Integer, ForeignKey, Float, UniqueConstraint
+
+from .base import BaseModel
+
+
+class LeaderboardMetric(BaseModel):
+    """Sum and counts of one ExtractEval metric for an extractor within a dataset.
+
+    Kept up to date incrementally whenever evals are upserted, so the
+    leaderboard never has to aggregate ``extractevals`` at read time.
+    """
+
+    __tablename__ = "leaderboard_metrics"
+
+    __table_args__ = (
+        UniqueConstraint('extractor_id', 'dataset_id', 'metric', name='_leaderboard_extractor_dataset_metric_uc'),
+    )
+
+    # References
+    extractor_id = Column(
+        Integer, ForeignKey("extractors.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    dataset_id = Column(
+        Integer, ForeignKey("datasets.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    metric = Column(String(64), nullable=False)  # ExtractEval column name
+
+    # Aggregates
+    value_sum = Column(Float, nullable=False, default=0.0)  # Sum of non-null values (booleans as 0/1)
+    value_count = Column(Integer, nullable=False, default=0)  # Evals with a non-null value
+    eval_count = Column(Integer, nullable=False, default=0)  # All evals, including nulls
+
+    @property
+    def mean(self):
+        """Mean of the non-null values."""
+        return self.value_sum / self.value_count if self.value_count else None
+
+    @property
+    def null_rate(self):
+        """Share of evals where the metric is null."""
+        return 1 - self.value_count / self.eval_count if self.eval_count else None
+
+    def __repr__(self):
+        return f"<LeaderboardMetric(extractor_id={self.extractor_id}, dataset_id={self.dataset_id}, metric='{self.metric}', mean={self.mean})>"
@@ -0,0 +1,105 @@
+"""Near-duplicate models - MinHash signatures of extracts and the matching pairs."""
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Float,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    LargeBinary,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from .base import BaseModel
+
+
+class ExtractMinHash(BaseModel):
+    """MinHash signature of the title and abstract shingles of one extract.
+
+    Written whenever extracts are stored, see services.near_duplicates.
+    """
+
+    __tablename__ = "extract_minhashes"
+
+    __table_args__ = (
+        # Candidate lookup: extracts sharing any LSH band bucket (&&). Every
+        # insert is followed by lookups, which would each scan the whole
+        # fastupdate pending list, so entries go straight into the tree.
+        Index(
+            "ix_extract_minhashes_band_hashes",
+            "band_hashes",
+            postgresql_using="gin",
+            postgresql_with={"fastupdate": "off"},
+        ),
+        ForeignKeyConstraint(
+            ["extract_id", "extractor_id"],
+            ["extracts.id", "extracts.extractor_id"],
+            ondelete="CASCADE",
+        ),
+        UniqueConstraint("extract_id", "extractor_id", name="_extract_minhash_extract_uc"),
+        # Partitioned like extracts, one partition per extractor
+        {"postgresql_partition_by": "LIST (extractor_id)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+
+    # References
+    extract_id = Column(Integer, nullable=False)
+    extractor_id = Column(Integer, primary_key=True)
+    paper_id = Column(
+        Integer, ForeignKey("papers.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    # Signature
+    signature = Column(LargeBinary, nullable=False)  # NUM_PERM little-endian uint32 minima
+    band_hashes = Column(ARRAY(BigInteger), nullable=False)  # One hash per LSH band (band index included)
+    shingle_count = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<ExtractMinHash(extract_id={self.extract_id}, paper_id={self.paper_id}, shingles={self.shingle_count})>"
+
+
+class NearDuplicatePair(BaseModel):
+    """Two extracts of different papers whose signatures match.
+
+    Stored once per pair (``extract_id < duplicate_id``) when the later of
+    the two is indexed, if the estimated similarity reaches
+    ``near_duplicates.MIN_SIMILARITY``.
+    """
+
+    __tablename__ = "near_duplicate_pairs"
+
+    __table_args__ = (
+        UniqueConstraint("extract_id", "duplicate_id", name="_near_duplicate_pair_uc"),
+        # Extracts are keyed on (id, extractor_id), see models.extract
+        ForeignKeyConstraint(
+            ["extract_id", "extractor_id"],
+            ["extracts.id", "extracts.extractor_id"],
+            ondelete="CASCADE",
+        ),
+        ForeignKeyConstraint(
+            ["duplicate_id", "duplicate_extractor_id"],
+            ["extracts.id", "extracts.extractor_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+    # References
+    extract_id = Column(Integer, nullable=False)
+    extractor_id = Column(Integer, nullable=False, index=True)
+    duplicate_id = Column(Integer, nullable=False, index=True)
+    duplicate_extractor_id = Column(Integer, nullable=False, index=True)
+    paper_id = Column(
+        Integer, ForeignKey("papers.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    duplicate_paper_id = Column(
+        Integer, ForeignKey("papers.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    similarity = Column(Float, nullable=False)  # Estimated Jaccard similarity of the shingle sets
+
+    def __repr__(self):
+        return f"<NearDuplicatePair(extract_id={self.extract_id}, duplicate_id={self.duplicate_id}, similarity={self.similarity})>"
@@ -1,6 +1,6 @@
 """Paper model - core document entities."""
 
-from sqlalchemy import Column, String, Text, Boolean, Integer
+from sqlalchemy import Column, String, Text, Boolean, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 
@@ -12,6 +12,10 @@ class Paper(BaseModel):
 
     __tablename__ = "papers"
 
+    __table_args__ = (
+        Index("ix_papers_created_at_id", "created_at", "id"),  # keyset pagination
+    )
+
     # File information
     pdf_path = Column(String(500), nullable=True)
     pdf_url = Column(String(500), nullable=True)
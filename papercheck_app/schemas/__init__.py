@@ -1,11 +1,33 @@
 """Schemas package for papercheck_app."""
 
 from .base import BaseSchema, BaseCreateSchema, BaseUpdateSchema, BaseDeleteSchema
-from .paper import Paper, PaperCreate, PaperUpdate, PaperRead, PaperDelete, PaperSummary
-from .dataset import Dataset, DatasetCreate, DatasetUpdate, DatasetRead, DatasetDelete, DatasetSummary
+from .pagination import Page
+from .paper import Paper, PaperCreate, PaperUpdate, PaperRead, PaperDelete, PaperSummary, PaperBulkIngestResult
+from .dataset import (
+    Dataset,
+    DatasetCreate,
+    DatasetUpdate,
+    DatasetRead,
+    DatasetDelete,
+    DatasetSummary,
+    DatasetScanResult,
+    DatasetPaperIds,
+    DatasetMembershipResult,
+    DatasetMembershipCheck,
+    DatasetSetOperation,
+    DatasetSetOperationResult,
+)
 from .ground_truth import GroundTruth, GroundTruthCreate, GroundTruthUpdate, GroundTruthRead, GroundTruthDelete, GroundTruthSummary
-from .extractor import Extractor, ExtractorCreate, ExtractorUpdate, ExtractorRead, ExtractorDelete, ExtractorSummary
-from .extract import Extract, ExtractCreate, ExtractUpdate, ExtractRead, ExtractDelete, ExtractSummary
+from .extractor import (
+    Extractor,
+    ExtractorCreate,
+    ExtractorUpdate,
+    ExtractorRead,
+    ExtractorDelete,
+    ExtractorSummary,
+    ExtractorDataDropResult,
+)
+from .extract import Extract, ExtractCreate, ExtractUpdate, ExtractRead, ExtractDelete, ExtractSummary, ExtractionRunResult, ExtractCacheStatus
 from .extracteval import (
     ExtractEval,
     ExtractEvalCreate,
@@ -13,7 +35,13 @@ from .extracteval import (
     ExtractEvalRead,
     ExtractEvalDelete,
     ExtractEvalSummary,
+    EvaluationRunResult,
 )
+from .leaderboard import MetricAggregate, LeaderboardEntry, LeaderboardRefreshResult
+from .search import TextSearchHit
+from .duplicates import DuplicateCluster, DuplicateIndexResult
+from .pdf_store import PdfBlob, PdfStoreImportResult
+from .reference import ExtractReferenceRead, ReferenceLoadResult
 
 __all__ = [
     # Base schemas
@@ -21,6 +49,7 @@ __all__ = [
     "BaseCreateSchema",
     "BaseUpdateSchema",
     "BaseDeleteSchema",
+    "Page",
     # Paper schemas
     "Paper",
     "PaperCreate",
@@ -28,6 +57,7 @@ __all__ = [
     "PaperRead",
     "PaperDelete",
     "PaperSummary",
+    "PaperBulkIngestResult",
     # Dataset schemas
     "Dataset",
     "DatasetCreate",
@@ -35,6 +65,12 @@ __all__ = [
     "DatasetRead",
     "DatasetDelete",
     "DatasetSummary",
+    "DatasetScanResult",
+    "DatasetPaperIds",
+    "DatasetMembershipResult",
+    "DatasetMembershipCheck",
+    "DatasetSetOperation",
+    "DatasetSetOperationResult",
     # Ground Truth schemas
     "GroundTruth",
     "GroundTruthCreate",
@@ -49,6 +85,7 @@ __all__ = [
     "ExtractorRead",
     "ExtractorDelete",
     "ExtractorSummary",
+    "ExtractorDataDropResult",
     # Extract schemas
     "Extract",
     "ExtractCreate",
@@ -56,6 +93,8 @@ __all__ = [
     "ExtractRead",
     "ExtractDelete",
     "ExtractSummary",
+    "ExtractionRunResult",
+    "ExtractCacheStatus",
     # ExtractEval schemas
     "ExtractEval",
     "ExtractEvalCreate",
@@ -63,4 +102,20 @@ __all__ = [
     "ExtractEvalRead",
     "ExtractEvalDelete",
     "ExtractEvalSummary",
+    "EvaluationRunResult",
+    # Leaderboard schemas
+    "MetricAggregate",
+    "LeaderboardEntry",
+    "LeaderboardRefreshResult",
+    # Search schemas
+    "TextSearchHit",
+    # Near-duplicate schemas
+    "DuplicateCluster",
+    "DuplicateIndexResult",
+    # PDF store schemas
+    "PdfBlob",
+    "PdfStoreImportResult",
+    # Extract reference schemas
+    "ExtractReferenceRead",
+    "ReferenceLoadResult",
 ]
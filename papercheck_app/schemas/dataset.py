@@ -1,7 +1,7 @@
 """Dataset Pydantic schemas."""
 
-from typing import Optional, List
-from pydantic import Field
+from typing import Literal, Optional, List
+from pydantic import AliasChoices, Field, field_validator
 
 from .base import BaseSchema, BaseCreateSchema, BaseUpdateSchema, BaseReadSchema, BaseDeleteSchema
 
@@ -45,7 +45,18 @@ class DatasetRead(BaseReadSchema, DatasetBase):
     # To avoid circular dependency issues, we might not include the full PaperRead here
     # depending on the use case. For now, we can omit it or use a forward reference.
     # For simplicity, we'll define a minimal paper representation or just IDs.
-    papers: List[int] = Field([], description="List of paper IDs in the dataset")
+    # Read from the deferred Dataset.paper_ids aggregate, not the papers relationship
+    papers: List[int] = Field(
+        [],
+        validation_alias=AliasChoices("paper_ids", "papers"),
+        description="List of paper IDs in the dataset",
+    )
+
+    @field_validator("papers", mode="before")
+    @classmethod
+    def paper_ids(cls, value):
+        """Accept the Paper objects of the ORM relationship as well as IDs."""
+        return [getattr(paper, "id", paper) for paper in value or []]
 
 
 class DatasetDelete(BaseDeleteSchema):
@@ -62,6 +73,70 @@ class DatasetSummary(BaseReadSchema):
     version: Optional[str] = None
 
 
+class DatasetScanResult(BaseSchema):
+    """Report of a dataset folder scan."""
+
+    dataset_id: int
+    files_seen: int = Field(0, description="PDF files found in the folder")
+    files_hashed: int = Field(0, description="Files hashed because they were new or changed")
+    files_unchanged: int = Field(0, description="Files skipped as unchanged since the last scan")
+    files_failed: int = Field(0, description="Files that could not be read")
+    bytes_hashed: int = Field(0, description="Bytes read while hashing")
+    elapsed_seconds: float = Field(0.0, description="Wall time spent walking and hashing")
+    files_per_second: float = Field(0.0, description="Hashing throughput in files")
+    bytes_per_second: float = Field(0.0, description="Hashing throughput in bytes")
+    filled: int = Field(0, description="Papers matched by pdf_path whose missing pdf_hash was filled in")
+    inserted: int = Field(0, description="New paper rows created")
+    skipped: int = Field(0, description="Files whose pdf_hash already existed as a paper")
+    duplicates: int = Field(0, description="Files with identical content within the folder")
+    attached: int = Field(0, description="Papers newly linked to the dataset")
+
+
+class DatasetPaperIds(BaseSchema):
+    """Paper IDs to add to, remove from or look up in a dataset."""
+
+    paper_ids: List[int] = Field(..., max_length=100000, description="Paper IDs")
+
+
+class DatasetMembershipResult(BaseSchema):
+    """Report of a bulk membership change."""
+
+    dataset_id: int
+    requested: int = Field(0, description="Distinct paper IDs in the request")
+    changed: int = Field(0, description="Papers actually added or removed")
+    unknown: List[int] = Field([], description="Requested IDs without a paper row (not added)")
+    paper_count: int = Field(0, description="Papers in the dataset afterwards")
+
+
+class DatasetMembershipCheck(BaseSchema):
+    """Which of the requested papers belong to a dataset."""
+
+    dataset_id: int
+    members: List[int] = Field([], description="Requested IDs in the dataset")
+    non_members: List[int] = Field([], description="Requested IDs not in the dataset")
+
+
+class DatasetSetOperation(BaseSchema):
+    """Create a dataset from a set operation over existing datasets."""
+
+    operation: Literal["union", "intersection", "difference"] = Field(
+        ..., description="'difference' keeps the papers of the first dataset found in none of the others"
+    )
+    dataset_ids: List[int] = Field(..., min_length=2, description="Source datasets, in order")
+    name: str = Field(..., max_length=255, description="Name of the new dataset")
+    description: Optional[str] = Field(None, description="Description of the new dataset")
+
+
+class DatasetSetOperationResult(BaseSchema):
+    """The dataset created by a set operation."""
+
+    dataset_id: int
+    name: str
+    operation: str
+    source_dataset_ids: List[int]
+    paper_count: int = Field(0, description="Papers in the new dataset")
+
+
 class Dataset(DatasetBase, BaseSchema):
     """Complete dataset schema for responses, matching the DB model."""
 
@@ -0,0 +1,22 @@
+"""Near-duplicate Pydantic schemas."""
+
+from typing import List
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class DuplicateCluster(BaseSchema):
+    """Distinct papers whose extracted title and abstract are near duplicates."""
+
+    paper_ids: List[int] = Field(..., description="Papers in the cluster, ascending")
+    extract_ids: List[int] = Field(..., description="Extracts that matched across papers")
+    min_similarity: float = Field(..., description="Lowest estimated Jaccard similarity of a matching pair")
+    max_similarity: float = Field(..., description="Highest estimated Jaccard similarity of a matching pair")
+
+
+class DuplicateIndexResult(BaseSchema):
+    """Report of a MinHash signature backfill."""
+
+    scanned: int = Field(0, description="Extracts without a signature that were read")
+    indexed: int = Field(0, description="Signatures written (extracts without any text get none)")
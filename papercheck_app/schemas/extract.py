@@ -79,6 +79,34 @@ class ExtractSummary(BaseReadSchema):
     status: str = "completed"
 
 
+class ExtractionRunResult(BaseSchema):
+    """Report of a dispatcher run sending PDFs to an extractor endpoint."""
+
+    extractor_id: int
+    dataset_id: Optional[int] = None
+    endpoint: str = Field(..., description="Extractor endpoint the PDFs were sent to")
+    papers_total: int = Field(0, description="PDFs dispatched")
+    succeeded: int = Field(0, description="Extracts stored with status 'completed'")
+    failed: int = Field(0, description="Extracts stored with status 'failed'")
+    retries: int = Field(0, description="Requests retried after errors or timeouts")
+    elapsed_seconds: float = Field(0.0, description="Wall time of the run")
+    papers_per_second: float = Field(0.0, description="Dispatch throughput")
+    cache_hits: int = Field(0, description="Papers served from an existing extract")
+    cache_misses: int = Field(0, description="Papers that had to be extracted")
+    cache_hit_ratio: float = Field(0.0, description="cache_hits / (cache_hits + cache_misses)")
+
+
+class ExtractCacheStatus(BaseSchema):
+    """Which papers of a dataset still need extraction by an extractor."""
+
+    extractor_id: int
+    dataset_id: int
+    pending_paper_ids: List[int] = Field(default_factory=list, description="Papers without a reusable extract")
+    cache_hits: int = Field(0, description="Papers with a reusable completed extract")
+    cache_misses: int = Field(0, description="Papers that need extraction")
+    cache_hit_ratio: float = Field(0.0, description="cache_hits / (cache_hits + cache_misses)")
+
+
 class Extract(ExtractBase, BaseSchema):
     """Complete extract schema for responses, matching the DB model."""
 
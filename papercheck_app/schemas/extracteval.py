@@ -28,6 +28,21 @@ class ExtractEvalBase(BaseCreateSchema):
     keywords_precision: Optional[float] = Field(None)
     keywords_recall: Optional[float] = Field(None)
     keywords_avg_jaro_winkler: Optional[float] = Field(None)
+    authors_order_preserved: Optional[bool] = Field(None)
+    authors_f1: Optional[float] = Field(None)
+    authors_precision: Optional[float] = Field(None)
+    authors_recall: Optional[float] = Field(None)
+    authors_jaccard_index: Optional[float] = Field(None)
+    authors_avg_name_jaro_winkler: Optional[float] = Field(None)
+    authors_avg_surname_jaro_winkler: Optional[float] = Field(None)
+    authors_avg_given_name_jaro_winkler: Optional[float] = Field(None)
+    authors_affiliation_match_rate: Optional[float] = Field(None)
+    authors_email_match_rate: Optional[float] = Field(None)
+    refs_f1: Optional[float] = Field(None)
+    refs_precision: Optional[float] = Field(None)
+    refs_recall: Optional[float] = Field(None)
+    refs_jaccard_index: Optional[float] = Field(None)
+    refs_avg_title_levenshtein: Optional[float] = Field(None)
     notes: Optional[str] = Field(None, description="Additional notes")
     evaluation_details: Optional[Dict[str, Any]] = Field(
         None, description="Details on evaluation methods used"
@@ -57,6 +72,21 @@ class ExtractEvalUpdate(BaseUpdateSchema):
     keywords_precision: Optional[float] = Field(None)
     keywords_recall: Optional[float] = Field(None)
     keywords_avg_jaro_winkler: Optional[float] = Field(None)
+    authors_order_preserved: Optional[bool] = Field(None)
+    authors_f1: Optional[float] = Field(None)
+    authors_precision: Optional[float] = Field(None)
+    authors_recall: Optional[float] = Field(None)
+    authors_jaccard_index: Optional[float] = Field(None)
+    authors_avg_name_jaro_winkler: Optional[float] = Field(None)
+    authors_avg_surname_jaro_winkler: Optional[float] = Field(None)
+    authors_avg_given_name_jaro_winkler: Optional[float] = Field(None)
+    authors_affiliation_match_rate: Optional[float] = Field(None)
+    authors_email_match_rate: Optional[float] = Field(None)
+    refs_f1: Optional[float] = Field(None)
+    refs_precision: Optional[float] = Field(None)
+    refs_recall: Optional[float] = Field(None)
+    refs_jaccard_index: Optional[float] = Field(None)
+    refs_avg_title_levenshtein: Optional[float] = Field(None)
     notes: Optional[str] = Field(None)
     evaluation_details: Optional[Dict[str, Any]] = Field(None)
 
@@ -82,6 +112,22 @@ class ExtractEvalSummary(BaseReadSchema):
     evaluation_date: Optional[str] = None
 
 
+class EvaluationRunResult(BaseSchema):
+    """Report of a batch evaluation run, for one dataset and extractor unless stale only."""
+
+    dataset_id: Optional[int] = None
+    extractor_id: Optional[int] = None
+    stale_only: bool = Field(False, description="Only missing and out-of-date evals were computed")
+    metrics_version: int = Field(..., description="Version of the metric definitions used")
+    pairs_evaluated: int = Field(0, description="Extract/ground truth pairs scored")
+    batches: int = Field(0, description="Batches sent to the worker pool")
+    elapsed_seconds: float = Field(0.0, description="Wall time of the run")
+    pairs_per_second: float = Field(0.0, description="Evaluation throughput")
+    metric_seconds: Dict[str, float] = Field(
+        {}, description="CPU time spent per metric group, summed over workers"
+    )
+
+
 class ExtractEval(ExtractEvalBase, BaseSchema):
     """Complete extractor evaluation schema for responses, matching the DB model."""
 
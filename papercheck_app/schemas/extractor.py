@@ -1,6 +1,6 @@
 """Extractor Pydantic schemas."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import date
 from pydantic import Field
 
@@ -120,6 +120,16 @@ class ExtractorDelete(BaseDeleteSchema):
     pass
 
 
+class ExtractorDataDropResult(BaseSchema):
+    """Report of dropping the extracts, evals and signatures of an extractor."""
+
+    extractor_id: int
+    archived: bool = Field(False, description="Partitions were kept as standalone tables")
+    tables: List[str] = Field([], description="Detached partitions, renamed if archived")
+    pairs_deleted: int = Field(0, description="Near-duplicate pairs removed")
+    elapsed_seconds: float = Field(0.0, description="Wall time of the drop")
+
+
 class ExtractorSummary(BaseReadSchema):
     """Summary schema for extractor with minimal fields."""
 
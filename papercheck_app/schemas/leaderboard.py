@@ -0,0 +1,33 @@
+"""Leaderboard Pydantic schemas."""
+
+from typing import Optional, Dict
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class MetricAggregate(BaseSchema):
+    """Aggregate of one ExtractEval metric."""
+
+    mean: Optional[float] = Field(None, description="Mean of the non-null values")
+    count: int = Field(0, description="Evals with a non-null value")
+    null_rate: Optional[float] = Field(None, description="Share of evals where the metric is null")
+
+
+class LeaderboardEntry(BaseSchema):
+    """All metric aggregates of one extractor within a dataset."""
+
+    extractor_id: int
+    extractor_name: str
+    dataset_id: int
+    eval_count: int = Field(0, description="Evals aggregated")
+    metrics: Dict[str, MetricAggregate] = Field(default_factory=dict, description="Aggregates by metric")
+
+
+class LeaderboardRefreshResult(BaseSchema):
+    """Report of a full leaderboard rebuild."""
+
+    dataset_id: Optional[int] = None
+    extractor_id: Optional[int] = None
+    rows: int = Field(0, description="Aggregate rows written")
+    elapsed_seconds: float = Field(0.0, description="Wall time of the rebuild")
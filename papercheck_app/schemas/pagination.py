@@ -0,0 +1,15 @@
+"""Pagination Pydantic schemas."""
+
+from typing import Generic, List, Optional, TypeVar
+from pydantic import Field
+
+from .base import BaseSchema
+
+T = TypeVar("T")
+
+
+class Page(BaseSchema, Generic[T]):
+    """One page of a collection."""
+
+    items: List[T] = Field(default_factory=list, description="Rows of this page")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, null on the last page")
@@ -68,6 +68,16 @@ class PaperSummary(BaseReadSchema):
     source: Optional[str] = None
 
 
+class PaperBulkIngestResult(BaseSchema):
+    """Counts reported by a bulk paper ingest."""
+
+    inserted: int = Field(0, description="New paper rows created")
+    skipped: int = Field(0, description="Records whose pdf_hash already existed in the database")
+    duplicates: int = Field(0, description="Records repeating a pdf_hash seen earlier in the same payload")
+    attached: int = Field(0, description="Papers newly linked to the dataset")
+    dataset_id: Optional[int] = Field(None, description="Dataset the papers were attached to")
+
+
 class Paper(PaperBase, BaseSchema):
     """Complete paper schema for responses, matching the DB model."""
 
@@ -0,0 +1,26 @@
+"""PDF store Pydantic schemas."""
+
+from typing import Optional
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class PdfBlob(BaseSchema):
+    """One PDF written to the content-addressed store."""
+
+    pdf_hash: str = Field(..., description="SHA-256 of the content, the blob's address")
+    size: int = Field(..., description="Size in bytes")
+    created: bool = Field(..., description="False if identical content was already stored")
+
+
+class PdfStoreImportResult(BaseSchema):
+    """Report of copying papers' pdf_path files into the store."""
+
+    dataset_id: Optional[int] = None
+    papers: int = Field(0, description="Papers with a pdf_path considered")
+    stored: int = Field(0, description="Files copied (or found identical) in the store")
+    already_stored: int = Field(0, description="Papers whose pdf_hash was already stored")
+    missing: int = Field(0, description="Files that could not be read")
+    mismatched: int = Field(0, description="Files whose content no longer matches pdf_hash")
+    bytes_stored: int = Field(0, description="Bytes of newly created blobs")
@@ -0,0 +1,26 @@
+"""Extract reference Pydantic schemas."""
+
+from typing import Optional
+from pydantic import Field
+
+from .base import BaseReadSchema, BaseSchema
+
+
+class ExtractReferenceRead(BaseReadSchema):
+    """One reference of an extract."""
+
+    extract_id: int
+    extractor_id: int
+    ordinal: int = Field(..., description="Position in the extract's reference list, from 0")
+    doi: Optional[str] = Field(None, description="Normalized DOI, also taken from the raw string")
+    title: Optional[str] = None
+    year: Optional[int] = None
+    raw: Optional[str] = Field(None, description="Raw reference string")
+
+
+class ReferenceLoadResult(BaseSchema):
+    """Report of loading extract_references from refs payloads."""
+
+    scanned: int = Field(0, description="Extracts with a refs payload and no reference rows that were read")
+    references: int = Field(0, description="Reference rows copied")
+    elapsed_seconds: float = 0.0
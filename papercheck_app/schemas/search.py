@@ -0,0 +1,20 @@
+"""Search Pydantic schemas."""
+
+from typing import Optional
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class TextSearchHit(BaseSchema):
+    """One full-text search result, best matches first."""
+
+    id: int = Field(..., description="Extract or ground truth ID")
+    paper_id: int
+    extractor_id: Optional[int] = Field(None, description="Extractor of an extract hit")
+    rank: float = Field(..., description="ts_rank of the title (weight A) and abstract (weight B)")
+    title: Optional[str] = None
+    title_highlight: Optional[str] = Field(None, description="Title with matches in <mark> tags")
+    abstract_highlight: Optional[str] = Field(
+        None, description="Best abstract fragments with matches in <mark> tags"
+    )
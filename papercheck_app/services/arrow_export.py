@@ -0,0 +1,189 @@
+"""Columnar export of ExtractEval metrics to Parquet or Arrow IPC.
+
+``extractevals`` is read through a server-side cursor joined with the
+extractor name/type and the dataset(s) of the paper. Each chunk of row tuples
+is transposed into one Arrow array per column and written as a record batch,
+so no per-row dicts are built. Columns can be projected and rows filtered by
+dataset, extractor and extractor type in SQL.
+
+Requires the optional ``pyarrow`` dependency (``poetry install -E arrow``).
+"""
+
+from typing import BinaryIO, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Boolean, Float, Integer, func, select
+
+from ..core.database import SessionLocal
+from ..models import Extract, ExtractEval, Extractor, dataset_paper_association
+from .metrics import METRIC_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+EXPORT_BATCH_SIZE = 65536
+FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Same as Extractor.name: type, variant, version and config hash prefixes
+EXTRACTOR_NAME = func.concat_ws(
+    "_",
+    Extractor.extractor_type,
+    Extractor.variant,
+    Extractor.version,
+    "c" + func.left(func.nullif(Extractor.config_hash, ""), 8),
+    "p" + func.left(func.nullif(Extractor.parser_config_hash, ""), 8),
+)
+
+COLUMNS = {
+    "id": ExtractEval.id,
+    "extract_id": ExtractEval.extract_id,
+    "ground_truth_id": ExtractEval.ground_truth_id,
+    "extractor_id": ExtractEval.extractor_id,
+    "extractor_name": EXTRACTOR_NAME.label("extractor_name"),
+    "extractor_type": Extractor.extractor_type,
+    "dataset_id": dataset_paper_association.c.dataset_id,
+    "evaluation_date": ExtractEval.evaluation_date,
+    **{metric: getattr(ExtractEval, metric) for metric in METRIC_COLUMNS},
+}
+
+
+def require_pyarrow() -> None:
+    """Raise a helpful error when the optional dependency is missing."""
+    if pa is None:
+        raise RuntimeError("Arrow export needs pyarrow: poetry install -E arrow")
+
+
+def _arrow_type(column) -> "pa.DataType":
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    return pa.string()
+
+
+def export_schema(columns: Sequence[str]) -> "pa.Schema":
+    """Arrow schema of the projected columns."""
+    require_pyarrow()
+    return pa.schema([pa.field(name, _arrow_type(COLUMNS[name])) for name in columns])
+
+
+def resolve_columns(columns: Optional[Sequence[str]] = None) -> List[str]:
+    """Validate a projection; all columns when none is given."""
+    if not columns:
+        return list(COLUMNS)
+    unknown = [name for name in columns if name not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return list(columns)
+
+
+def metrics_query(
+    columns: Sequence[str],
+    dataset_ids: Optional[Sequence[int]] = None,
+    extractor_ids: Optional[Sequence[int]] = None,
+    extractor_types: Optional[Sequence[str]] = None,
+):
+    """Projected eval rows, one per (eval, dataset of its paper), in eval ID order."""
+    query = (
+        select(*(COLUMNS[name] for name in columns))
+        .select_from(ExtractEval)
+        .join(ExtractEval.extract)
+        .join(Extractor, Extractor.id == ExtractEval.extractor_id)
+        .join(dataset_paper_association, dataset_paper_association.c.paper_id == Extract.paper_id)
+    )
+    if dataset_ids:
+        query = query.where(dataset_paper_association.c.dataset_id.in_(dataset_ids))
+    if extractor_ids:
+        query = query.where(ExtractEval.extractor_id.in_(extractor_ids))
+    if extractor_types:
+        query = query.where(Extractor.extractor_type.in_(extractor_types))
+    return query.order_by(ExtractEval.id, dataset_paper_association.c.dataset_id)
+
+
+def iter_record_batches(
+    query, schema: "pa.Schema", batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator["pa.RecordBatch"]:
+    """Record batches built column-wise from a server-side cursor, with its own session."""
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            arrays = [
+                pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)
+            ]
+            yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _open_writer(sink, schema: "pa.Schema", fmt: str):
+    if fmt == "parquet":
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    return pa.ipc.new_stream(sink, schema)
+
+
+def write_export(
+    sink: BinaryIO, fmt: str = "parquet", columns: Optional[Sequence[str]] = None, **filters
+) -> int:
+    """Write the export to a file object; returns the number of rows written."""
+    require_pyarrow()
+    columns = resolve_columns(columns)
+    schema = export_schema(columns)
+    rows = 0
+    writer = _open_writer(sink, schema, fmt)
+    try:
+        for batch in iter_record_batches(metrics_query(columns, **filters), schema):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        writer.close()
+    return rows
+
+
+class _ChunkSink:
+    """Write-only file object handing written bytes back to a generator."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_export(
+    fmt: str = "parquet", columns: Optional[Sequence[str]] = None, **filters
+) -> Iterator[bytes]:
+    """The export as a byte stream, one record batch at a time."""
+    require_pyarrow()
+    columns = resolve_columns(columns)
+    schema = export_schema(columns)
+    sink = _ChunkSink()
+    writer = _open_writer(sink, schema, fmt)
+    for batch in iter_record_batches(metrics_query(columns, **filters), schema):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
@@ -0,0 +1,125 @@
+"""Optimal one-to-one assignment for reference and author matching.
+
+``linear_sum_assignment`` is the Hungarian algorithm with potentials
+(O(n^2 m) for an n x m cost matrix, n <= m). ``max_weight_matching`` works on a
+sparse set of scored candidate pairs: it splits them into connected components
+and solves each one separately, so well-blocked inputs only ever run the
+Hungarian algorithm on small matrices.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+Edge = Tuple[int, int]
+
+
+def linear_sum_assignment(cost: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """Minimum-cost assignment of rows to columns, as ``(row, col)`` pairs.
+
+    Every row (or column, whichever is fewer) is assigned exactly once.
+    """
+    n = len(cost)
+    m = len(cost[0]) if n else 0
+    if not n or not m:
+        return []
+    if n > m:
+        transposed = [[cost[i][j] for i in range(n)] for j in range(m)]
+        return sorted((i, j) for j, i in linear_sum_assignment(transposed))
+
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)  # p[j]: row assigned to column j (1-based, 0 = free)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = cost[i0 - 1]
+            u_i0 = u[i0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    current = row[j - 1] - u_i0 - v[j]
+                    if current < minv[j]:
+                        minv[j] = current
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    return sorted((p[j] - 1, j - 1) for j in range(1, m + 1) if p[j])
+
+
+def _components(edges: Dict[Edge, float]) -> List[List[Edge]]:
+    """Group candidate pairs into connected components (union-find)."""
+    parent: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+    def find(node):
+        root = node
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for i, j in edges:
+        a, b = find(("r", i)), find(("c", j))
+        if a != b:
+            parent[a] = b
+
+    groups: Dict[Tuple[str, int], List[Edge]] = {}
+    for edge in edges:
+        groups.setdefault(find(("r", edge[0])), []).append(edge)
+    return list(groups.values())
+
+
+def max_weight_matching(edges: Dict[Edge, float]) -> List[Tuple[int, int, float]]:
+    """One-to-one matching maximizing the total score of the given pairs.
+
+    ``edges`` maps ``(row, col)`` to a positive score; pairs not listed can
+    never be matched. Returns ``(row, col, score)`` triples.
+    """
+    matches: List[Tuple[int, int, float]] = []
+    for component in _components(edges):
+        if len(component) == 1:
+            (i, j), = component
+            matches.append((i, j, edges[(i, j)]))
+            continue
+        rows = sorted({i for i, _ in component})
+        cols = sorted({j for _, j in component})
+        if len(rows) == 1 or len(cols) == 1:
+            i, j = max(component, key=lambda edge: edges[edge])
+            matches.append((i, j, edges[(i, j)]))
+            continue
+
+        # Missing pairs cost as much as a zero score and are dropped afterwards
+        top = max(edges[edge] for edge in component)
+        col_index = {j: k for k, j in enumerate(cols)}
+        cost = [[top] * len(cols) for _ in rows]
+        for r, i in enumerate(rows):
+            for j in cols:
+                score = edges.get((i, j))
+                if score is not None:
+                    cost[r][col_index[j]] = top - score
+        for r, c in linear_sum_assignment(cost):
+            edge = (rows[r], cols[c])
+            if edge in edges:
+                matches.append((edge[0], edge[1], edges[edge]))
+    return sorted(matches)
@@ -0,0 +1,388 @@
+"""Author-list alignment between an extract and its ground truth.
+
+Each list is normalized once (accents folded, surname/given name split).
+Authors with identical normalized names are paired first, in order, which
+resolves almost all of a well-extracted list cheaply. The remaining authors
+are blocked on the Soundex code of their surname plus their given-name
+initial (authors without a given name join every block of their surname
+code), and those still unmatched, mostly surname typos, again on surname
+initial and ending plus given-name initial. Within each block the surname
+Jaro-Winkler matrix is computed with ``jaro_winkler_matrix`` over the
+distinct surnames and the assignment is solved with the Hungarian algorithm
+per connected component. Blocks with more than ``BLOCK_CAP`` authors on a
+side, as a consortium list of many "J. Wang" produces, are matched greedily
+by descending score over a sorted neighbourhood instead, so no block costs
+more than linear time. 1500-author consortium lists align well under a
+second (``python -m benchmarks.authors``).
+"""
+
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .assignment import max_weight_matching
+from .similarity import jaro_winkler, jaro_winkler_matrix
+
+SURNAME_THRESHOLD = 0.85  # minimum surname similarity for two authors to match
+MATCH_THRESHOLD = 0.8  # minimum combined name similarity
+SURNAME_WEIGHT = 0.7
+BLOCK_CAP = 50  # authors on a side above which a block is matched greedily
+GREEDY_WINDOW = 20  # neighbours either side an author is scored against in a greedy block
+
+NON_ALNUM = re.compile(r"[^0-9a-z]+")
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+LIST_KEYS = ("authors", "author", "items")
+NAME_KEYS = ("name", "full_name", "fullname", "raw")
+SURNAME_KEYS = ("surname", "last_name", "lastname", "family", "family_name")
+GIVEN_KEYS = ("given", "given_name", "first_name", "firstname", "forename", "forenames")
+AFFILIATION_KEYS = ("affiliations", "affiliation", "institution")
+EMAIL_KEYS = ("email", "emails", "mail")
+
+
+class Author(NamedTuple):
+    """An author normalized once for matching."""
+
+    name: str
+    surname: str
+    given: str
+    affiliations: Set[str]
+    email: str
+
+
+def fold(value: Any) -> str:
+    """Lowercase ASCII alphanumeric words separated by single spaces."""
+    text = unicodedata.normalize("NFKD", str(value or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(NON_ALNUM.split(text.lower())).strip()
+
+
+def _first(item: Dict[str, Any], keys) -> Any:
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return None
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _split_name(name: str) -> Tuple[str, str]:
+    """``(surname, given)`` from "Surname, Given" or "Given Surname"."""
+    if "," in name:
+        surname, _, given = name.partition(",")
+        return fold(surname), fold(given)
+    parts = fold(name).split()
+    if not parts:
+        return "", ""
+    return parts[-1], " ".join(parts[:-1])
+
+
+def _affiliation_text(value: Any) -> str:
+    if isinstance(value, dict):
+        value = _first(value, ("name", "institution", "raw", "text")) or ""
+    return fold(value)
+
+
+def author_items(payload: Any) -> List[Any]:
+    """The list of authors inside an authors JSONB value."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in LIST_KEYS:
+            if isinstance(payload.get(key), list):
+                return payload[key]
+    return []
+
+
+def parse_author(item: Any) -> Author:
+    """Normalize one author given as a dict or a name string."""
+    if isinstance(item, dict):
+        surname = fold(_first(item, SURNAME_KEYS))
+        given = fold(_first(item, GIVEN_KEYS))
+        if not surname:
+            surname, parsed_given = _split_name(str(_first(item, NAME_KEYS) or ""))
+            given = given or parsed_given
+        affiliations = {
+            text
+            for text in (_affiliation_text(a) for a in _as_list(_first(item, AFFILIATION_KEYS)))
+            if text
+        }
+        emails = _as_list(_first(item, EMAIL_KEYS))
+        email = str(emails[0]).strip().lower() if emails else ""
+    else:
+        surname, given = _split_name(str(item or ""))
+        affiliations, email = set(), ""
+    return Author(
+        name=f"{given} {surname}".strip(),
+        surname=surname,
+        given=given,
+        affiliations=affiliations,
+        email=email,
+    )
+
+
+def parse_authors(payload: Any) -> List[Author]:
+    """Normalize an authors JSONB value into a list of authors."""
+    return [parse_author(item) for item in author_items(payload)]
+
+
+def given_similarity(a: str, b: str) -> float:
+    """Jaro-Winkler of given names, treating initials as compatible."""
+    if not a or not b:
+        return 1.0 if a == b else 0.5
+    if len(a) == 1 or len(b) == 1:
+        return 1.0 if a[0] == b[0] else 0.0
+    return jaro_winkler(a, b)
+
+
+def surname_key(surname: str) -> str:
+    """American Soundex code of a folded surname ("" for none)."""
+    letters = [char for char in surname if "a" <= char <= "z"]
+    if not letters:
+        return ""
+    code = letters[0]
+    last = SOUNDEX_CODES.get(letters[0], "")
+    for char in letters[1:]:
+        digit = SOUNDEX_CODES.get(char, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in "hw":  # h and w do not separate equal codes
+            last = digit
+    return code.ljust(4, "0")
+
+
+def _phonetic_keys(surname: str) -> Tuple[str]:
+    return (surname_key(surname),)
+
+
+def _typo_keys(surname: str) -> Set[str]:
+    return {f"^{surname[:1]}", f"{surname[-2:]}$"}
+
+
+def _blocks(
+    extracted: List[Author],
+    truth: List[Author],
+    rows: Iterable[int],
+    cols: Iterable[int],
+    keys: Callable[[str], Iterable[str]],
+) -> List[Tuple[List[int], List[int]]]:
+    """``(rows, cols)`` blocks of authors sharing a surname key and given-name initial."""
+    by_key: Dict[str, Tuple[Dict[str, List[int]], Dict[str, List[int]]]] = {}
+    for side, authors, indexes in ((0, extracted, rows), (1, truth, cols)):
+        for index in indexes:
+            author = authors[index]
+            for key in keys(author.surname):
+                initials = by_key.setdefault(key, ({}, {}))[side]
+                initials.setdefault(author.given[:1], []).append(index)
+    blocks = []
+    for row_initials, col_initials in by_key.values():
+        if not row_initials or not col_initials:
+            continue
+        # Authors without a given name may be any of the others
+        rows_any, cols_any = row_initials.pop("", []), col_initials.pop("", [])
+        initials = sorted(set(row_initials) | set(col_initials)) or [""]
+        for initial in initials:
+            block_rows = row_initials.get(initial, []) + rows_any
+            block_cols = col_initials.get(initial, []) + cols_any
+            if block_rows and block_cols:
+                blocks.append((block_rows, block_cols))
+    return blocks
+
+
+def _block_edges(
+    extracted: List[Author], truth: List[Author], rows: List[int], cols: List[int]
+) -> Dict[Tuple[int, int], float]:
+    """Scored candidate pairs of a block, at or above the match thresholds."""
+    row_surnames = list(dict.fromkeys(extracted[i].surname for i in rows))
+    col_surnames = list(dict.fromkeys(truth[j].surname for j in cols))
+    row_position = {surname: k for k, surname in enumerate(row_surnames)}
+    col_position = {surname: k for k, surname in enumerate(col_surnames)}
+    surname_matrix = jaro_winkler_matrix(row_surnames, col_surnames)
+    given_scores: Dict[Tuple[str, str], float] = {}
+    edges: Dict[Tuple[int, int], float] = {}
+    for i in rows:
+        surname_row = surname_matrix[row_position[extracted[i].surname]]
+        given = extracted[i].given
+        for j in cols:
+            surname_score = surname_row[col_position[truth[j].surname]]
+            if surname_score < SURNAME_THRESHOLD:
+                continue
+            pair = (given, truth[j].given)
+            given_score = given_scores.get(pair)
+            if given_score is None:
+                given_score = given_scores[pair] = given_similarity(*pair)
+            score = SURNAME_WEIGHT * surname_score + (1 - SURNAME_WEIGHT) * given_score
+            if score >= MATCH_THRESHOLD:
+                edges[(i, j)] = score
+    return edges
+
+
+def _pair_score(a: Author, b: Author) -> float:
+    """Combined name similarity, 0.0 below the match thresholds."""
+    surname_score = jaro_winkler(a.surname, b.surname)
+    if surname_score < SURNAME_THRESHOLD:
+        return 0.0
+    score = SURNAME_WEIGHT * surname_score + (1 - SURNAME_WEIGHT) * given_similarity(a.given, b.given)
+    return score if score >= MATCH_THRESHOLD else 0.0
+
+
+def _greedy_block(
+    extracted: List[Author], truth: List[Author], rows: List[int], cols: List[int],
+    used_rows: Set[int], used_cols: Set[int],
+) -> List[Tuple[int, int, float]]:
+    """Best remaining pair first, over a sorted neighbourhood.
+
+    Both sides are sorted by name and each author is only scored against
+    the ``GREEDY_WINDOW`` authors of the other side either side of the same
+    relative rank; each pair of distinct names is scored once.
+    """
+    rows = sorted((i for i in rows if i not in used_rows), key=lambda i: (extracted[i].name, i))
+    cols = sorted((j for j in cols if j not in used_cols), key=lambda j: (truth[j].name, j))
+    if not rows or not cols:
+        return []
+    scores: Dict[Tuple[str, str], float] = {}
+    edges: Dict[Tuple[int, int], float] = {}
+    for rank, i in enumerate(rows):
+        center = rank * len(cols) // len(rows)
+        for j in cols[max(center - GREEDY_WINDOW, 0):center + GREEDY_WINDOW + 1]:
+            names = (extracted[i].name, truth[j].name)
+            score = scores.get(names)
+            if score is None:
+                score = scores[names] = _pair_score(extracted[i], truth[j])
+            if score:
+                edges[(i, j)] = score
+
+    matches = []
+    for (i, j), score in sorted(edges.items(), key=lambda edge: (-edge[1], edge[0])):
+        if i not in used_rows and j not in used_cols:
+            used_rows.add(i)
+            used_cols.add(j)
+            matches.append((i, j, score))
+    return matches
+
+
+def _match_blocks(
+    extracted: List[Author], truth: List[Author], blocks: List[Tuple[List[int], List[int]]]
+) -> List[Tuple[int, int, float]]:
+    """Optimal matching within blocks of up to ``BLOCK_CAP`` authors a side, greedy above."""
+    matches: List[Tuple[int, int, float]] = []
+    used_rows: Set[int] = set()
+    used_cols: Set[int] = set()
+    edges: Dict[Tuple[int, int], float] = {}
+    for rows, cols in blocks:
+        if max(len(rows), len(cols)) > BLOCK_CAP:
+            matches.extend(_greedy_block(extracted, truth, rows, cols, used_rows, used_cols))
+        else:
+            edges.update(_block_edges(extracted, truth, rows, cols))
+    # An author can be in a greedy and an optimal block (no given name, several keys)
+    matches.extend(max_weight_matching({
+        (i, j): score for (i, j), score in edges.items() if i not in used_rows and j not in used_cols
+    }))
+    return matches
+
+
+def align_authors(extracted: List[Author], truth: List[Author]) -> List[Tuple[int, int, float]]:
+    """One-to-one ``(extracted_index, truth_index, score)`` alignment.
+
+    Optimal within every block of at most ``BLOCK_CAP`` authors a side,
+    greedy within larger ones.
+    """
+    matches: List[Tuple[int, int, float]] = []
+
+    # Identical names pair up in order without any similarity computation
+    by_name: Dict[str, List[int]] = {}
+    for j, author in enumerate(truth):
+        by_name.setdefault(author.name, []).append(j)
+    matched_truth: Set[int] = set()
+    rest_rows = []
+    for i, author in enumerate(extracted):
+        candidates = by_name.get(author.name)
+        if author.name and candidates:
+            j = candidates.pop(0)
+            matched_truth.add(j)
+            matches.append((i, j, 1.0))
+        else:
+            rest_rows.append(i)
+    rest_cols = [j for j in range(len(truth)) if j not in matched_truth]
+    if not rest_rows or not rest_cols:
+        return sorted(matches)
+
+    # Surname typos mostly change the Soundex code: the authors left over are
+    # blocked again on surname initial and ending
+    for keys in (_phonetic_keys, _typo_keys):
+        found = _match_blocks(extracted, truth, _blocks(extracted, truth, rest_rows, rest_cols, keys))
+        matches.extend(found)
+        matched_rows = {i for i, _, _ in found}
+        matched_cols = {j for _, j, _ in found}
+        rest_rows = [i for i in rest_rows if i not in matched_rows]
+        rest_cols = [j for j in rest_cols if j not in matched_cols]
+        if not rest_rows or not rest_cols:
+            break
+    return sorted(matches)
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+def author_metrics(extracted_payload: Any, truth_payload: Any) -> Dict[str, Any]:
+    """authors_* metrics for one extract against its ground truth."""
+    truth = parse_authors(truth_payload)
+    if not truth:
+        return {
+            "authors_order_preserved": None,
+            "authors_f1": None,
+            "authors_precision": None,
+            "authors_recall": None,
+            "authors_jaccard_index": None,
+            "authors_avg_name_jaro_winkler": None,
+            "authors_avg_surname_jaro_winkler": None,
+            "authors_avg_given_name_jaro_winkler": None,
+            "authors_affiliation_match_rate": None,
+            "authors_email_match_rate": None,
+        }
+    extracted = parse_authors(extracted_payload)
+    matches = align_authors(extracted, truth)
+    matched = len(matches)
+    precision = matched / len(extracted) if extracted else 0.0
+    recall = matched / len(truth)
+
+    truth_order = [j for _, j, _ in matches]  # matches are sorted by extracted index
+    affiliation_hits = [
+        bool(extracted[i].affiliations & truth[j].affiliations)
+        for i, j, _ in matches
+        if truth[j].affiliations
+    ]
+    email_hits = [extracted[i].email == truth[j].email for i, j, _ in matches if truth[j].email]
+    return {
+        "authors_order_preserved": matched == len(truth) == len(extracted)
+        and truth_order == sorted(truth_order),
+        "authors_f1": 2 * precision * recall / (precision + recall) if matched else 0.0,
+        "authors_precision": precision,
+        "authors_recall": recall,
+        "authors_jaccard_index": matched / (len(extracted) + len(truth) - matched),
+        "authors_avg_name_jaro_winkler": _mean(
+            [jaro_winkler(extracted[i].name, truth[j].name) for i, j, _ in matches]
+        ),
+        "authors_avg_surname_jaro_winkler": _mean(
+            [jaro_winkler(extracted[i].surname, truth[j].surname) for i, j, _ in matches]
+        ),
+        "authors_avg_given_name_jaro_winkler": _mean(
+            [jaro_winkler(extracted[i].given, truth[j].given) for i, j, _ in matches]
+        ),
+        "authors_affiliation_match_rate": _mean(affiliation_hits),
+        "authors_email_match_rate": _mean(email_hits),
+    }
@@ -0,0 +1,71 @@
+"""Detail reads of extractors, datasets and papers, and their cache versions.
+
+A ``*_version`` function returns the ``updated_at`` values (and row counts,
+so deletions show up) of every row the detail representation is built
+from, or None when the resource does not exist. It is what the ETag is
+computed from, see ``core.cache``.
+"""
+
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..models import Dataset, Extract, Extractor, GroundTruth, Paper, dataset_paper_association
+from ..schemas import DatasetRead, ExtractorRead, PaperRead
+from .loaders import options_for
+
+
+def _version(db: Session, query) -> Optional[tuple]:
+    row = db.execute(query).first()
+    return tuple(row) if row is not None else None
+
+
+def extractor_version(db: Session, extractor_id: int) -> Optional[tuple]:
+    return _version(db, select(Extractor.updated_at).where(Extractor.id == extractor_id))
+
+
+def dataset_version(db: Session, dataset_id: int) -> Optional[tuple]:
+    # Membership changes touch datasets.updated_at (see ingest.touch_datasets)
+    return _version(db, select(Dataset.updated_at).where(Dataset.id == dataset_id))
+
+
+def _latest(model, condition) -> tuple:
+    """Latest updated_at and row count of ``model`` rows matching ``condition``."""
+    return (
+        select(func.max(model.updated_at)).where(condition).scalar_subquery(),
+        select(func.count()).select_from(model).where(condition).scalar_subquery(),
+    )
+
+
+def paper_version(db: Session, paper_id: int) -> Optional[tuple]:
+    # Nested two levels deep, so the correlation to papers has to be explicit
+    memberships = (
+        select(dataset_paper_association.c.dataset_id)
+        .where(dataset_paper_association.c.paper_id == Paper.id)
+        .correlate(Paper)
+    )
+    return _version(
+        db,
+        select(
+            Paper.updated_at,
+            *_latest(Extract, Extract.paper_id == Paper.id),
+            *_latest(GroundTruth, GroundTruth.paper_id == Paper.id),
+            *_latest(Dataset, Dataset.id.in_(memberships)),
+        ).where(Paper.id == paper_id),
+    )
+
+
+def get_extractor(db: Session, extractor_id: int) -> Optional[ExtractorRead]:
+    extractor = db.get(Extractor, extractor_id, options=options_for(ExtractorRead))
+    return ExtractorRead.model_validate(extractor) if extractor is not None else None
+
+
+def get_dataset(db: Session, dataset_id: int) -> Optional[DatasetRead]:
+    dataset = db.get(Dataset, dataset_id, options=options_for(DatasetRead))
+    return DatasetRead.model_validate(dataset) if dataset is not None else None
+
+
+def get_paper(db: Session, paper_id: int) -> Optional[PaperRead]:
+    paper = db.get(Paper, paper_id, options=options_for(PaperRead))
+    return PaperRead.model_validate(paper) if paper is not None else None
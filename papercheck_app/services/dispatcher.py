@@ -0,0 +1,340 @@
+"""Async extraction dispatcher.
+
+Streams the PDFs of a dataset to an extractor's GROBID-style endpoint and stores
+the parsed results as ``Extract`` rows:
+
+- one shared keep-alive ``httpx.AsyncClient`` per event loop;
+- a per-endpoint semaphore caps concurrent requests across all runs;
+- a bounded job queue gives backpressure, so PDFs are only read when a worker
+  is free;
+- transport errors, timeouts and 408/429/5xx responses are retried with
+  exponential backoff and full jitter;
+- results are written in batches through a pluggable ``write_batch`` coroutine;
+- papers with a completed extract by an identical extractor configuration
+  (see ``extract_cache``) get a copy of it instead of being re-extracted.
+"""
+
+import asyncio
+import random
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import null, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..core.database import run_job
+from ..core.monitoring import EXTRACTIONS
+from ..models import Extract, Extractor, Paper, dataset_paper_association
+from ..schemas import ExtractCacheStatus, ExtractCreate, ExtractionRunResult
+from . import extract_cache, extract_references, near_duplicates, pdf_store, tei
+
+GROBID_PATH = "/api/processFulltextDocument"
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+WriteBatch = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+# Clients and semaphores are bound to the event loop that created them
+_loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@dataclass
+class PdfJob:
+    """One PDF to send to the extractor."""
+
+    paper_id: int
+    pdf_path: str
+
+
+def _state() -> Dict[str, Any]:
+    return _loop_state.setdefault(asyncio.get_running_loop(), {"client": None, "limits": {}})
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for the running event loop."""
+    state = _state()
+    client = state["client"]
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.extraction_max_connections,
+                max_keepalive_connections=settings.extraction_max_connections,
+            ),
+            timeout=httpx.Timeout(settings.extraction_timeout_seconds, connect=10.0),
+        )
+        state["client"] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared client of the running event loop, if any."""
+    state = _state()
+    if state["client"] is not None:
+        await state["client"].aclose()
+        state["client"] = None
+
+
+def endpoint_semaphore(endpoint: str, limit: int) -> asyncio.Semaphore:
+    """Semaphore limiting concurrent requests to one endpoint."""
+    limits = _state()["limits"]
+    if endpoint not in limits:
+        limits[endpoint] = asyncio.Semaphore(limit)
+    return limits[endpoint]
+
+
+class ExtractionDispatcher:
+    """Sends PDFs to one extractor endpoint and collects Extract rows."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        extractor_id: int,
+        *,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        parse: Callable[[bytes], Dict[str, Any]] = tei.parse_tei,
+        path: str = GROBID_PATH,
+    ):
+        self.endpoint = endpoint.rstrip("/")
+        self.url = self.endpoint if self.endpoint.endswith(path) else self.endpoint + path
+        self.extractor_id = extractor_id
+        self.concurrency = concurrency or settings.extraction_concurrency
+        self.timeout = timeout or settings.extraction_timeout_seconds
+        self.max_retries = settings.extraction_max_retries if max_retries is None else max_retries
+        self.batch_size = batch_size or settings.extraction_batch_size
+        self.client = client
+        self.parse = parse
+        self.result = ExtractionRunResult(extractor_id=extractor_id, endpoint=self.endpoint)
+
+    async def _post(self, pdf: bytes, filename: str) -> httpx.Response:
+        client = self.client or get_http_client()
+        semaphore = endpoint_semaphore(self.endpoint, self.concurrency)
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    response = await client.post(
+                        self.url,
+                        files={"input": (filename, pdf, "application/pdf")},
+                        timeout=self.timeout,
+                    )
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response
+                error: Exception = httpx.HTTPStatusError(
+                    f"{response.status_code} from {self.url}",
+                    request=response.request,
+                    response=response,
+                )
+            except httpx.TransportError as e:
+                error = e
+            if attempt == self.max_retries:
+                raise error
+            self.result.retries += 1
+            await asyncio.sleep(
+                random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))
+            )
+        raise RuntimeError("unreachable")
+
+    async def extract_one(self, job: PdfJob) -> Dict[str, Any]:
+        """Extract one PDF; failures become rows with status 'failed'."""
+        start = time.perf_counter()
+        row: Dict[str, Any] = {
+            "paper_id": job.paper_id,
+            "extractor_id": self.extractor_id,
+            "extraction_date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        try:
+            pdf = await run_in_threadpool(Path(job.pdf_path).read_bytes)
+            response = await self._post(pdf, Path(job.pdf_path).name)
+            row.update(self.parse(response.content))
+            row["status"] = "completed"
+            self.result.succeeded += 1
+        except Exception as e:
+            row["status"] = "failed"
+            row["error_message"] = f"{type(e).__name__}: {e}"
+            self.result.failed += 1
+        row["processing_time_seconds"] = time.perf_counter() - start
+        EXTRACTIONS.labels(str(self.extractor_id), row["status"]).inc()
+        return row
+
+    async def run(self, jobs: Iterable[PdfJob], write_batch: WriteBatch) -> ExtractionRunResult:
+        """Process all jobs with bounded concurrency, writing results in batches."""
+        start = time.perf_counter()
+        job_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        row_queue: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size * 2)
+
+        async def produce():
+            for job in jobs:
+                self.result.papers_total += 1
+                await job_queue.put(job)
+            for _ in range(self.concurrency):
+                await job_queue.put(None)
+
+        async def work():
+            while (job := await job_queue.get()) is not None:
+                await row_queue.put(await self.extract_one(job))
+
+        async def work_all():
+            await asyncio.gather(*(work() for _ in range(self.concurrency)))
+            await row_queue.put(None)
+
+        async def write():
+            batch = []
+            while (row := await row_queue.get()) is not None:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    await write_batch(batch)
+                    batch = []
+            if batch:
+                await write_batch(batch)
+
+        tasks = [asyncio.ensure_future(c) for c in (produce(), work_all(), write())]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        self.result.elapsed_seconds = time.perf_counter() - start
+        if self.result.elapsed_seconds:
+            self.result.papers_per_second = self.result.papers_total / self.result.elapsed_seconds
+        return self.result
+
+
+def insert_extracts(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Bulk-insert Extract rows with their references and near-duplicate signatures and commit."""
+    if rows:
+        values = [ExtractCreate.model_validate(row).model_dump() for row in rows]
+        payloads = [value["extracted_refs"] for value in values]
+        # SQL NULL rather than a JSON null, so readers fall back to extract_references
+        if not settings.store_refs_jsonb:
+            for value in values:
+                value["extracted_refs"] = null()
+        # IDs in the order of values, to pair them with their payloads
+        extract_ids = list(
+            db.scalars(insert(Extract).returning(Extract.id, sort_by_parameter_order=True), values)
+        )
+        extract_references.copy_references(
+            db,
+            (
+                (extract_id, value["extractor_id"], payload)
+                for extract_id, value, payload in zip(extract_ids, values, payloads)
+            ),
+        )
+        near_duplicates.index_extracts(db, extract_ids)
+        db.commit()
+
+
+async def write_extracts(rows: List[Dict[str, Any]]) -> None:
+    """``write_batch`` storing rows through the sync engine off the event loop."""
+    await run_job(insert_extracts, rows)
+
+
+def _hit_ratio(hits: int, misses: int) -> float:
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def dataset_cache_status(db: Session, dataset_id: int, extractor_id: int) -> ExtractCacheStatus:
+    """Papers of a dataset that still need extraction, in a single cache lookup."""
+    paper_ids = list(
+        db.scalars(
+            select(dataset_paper_association.c.paper_id)
+            .where(dataset_paper_association.c.dataset_id == dataset_id)
+            .order_by(dataset_paper_association.c.paper_id)
+        )
+    )
+    pending, cached = extract_cache.papers_needing_extraction(db, extractor_id, paper_ids)
+    return ExtractCacheStatus(
+        extractor_id=extractor_id,
+        dataset_id=dataset_id,
+        pending_paper_ids=pending,
+        cache_hits=len(cached),
+        cache_misses=len(pending),
+        cache_hit_ratio=_hit_ratio(len(cached), len(pending)),
+    )
+
+
+def apply_extract_cache(
+    db: Session, extractor_id: int, jobs: List[PdfJob]
+) -> Tuple[List[PdfJob], int]:
+    """Copy reusable extracts for cache hits; returns the jobs still to run and the hit count."""
+    pending, cached = extract_cache.papers_needing_extraction(
+        db, extractor_id, [job.paper_id for job in jobs]
+    )
+    copied = extract_cache.copy_cached_extracts(db, extractor_id, cached)
+    near_duplicates.index_extracts(db, copied)
+    db.commit()
+    EXTRACTIONS.labels(str(extractor_id), "cached").inc(len(cached))
+    pending_ids = set(pending)
+    return [job for job in jobs if job.paper_id in pending_ids], len(cached)
+
+
+def load_dispatch_plan(
+    db: Session, dataset_id: int, extractor_id: int, environment: str = "development"
+) -> Tuple[str, List[PdfJob]]:
+    """Endpoint of the extractor and the PDFs of the dataset to send to it."""
+    extractor = db.get(Extractor, extractor_id)
+    if extractor is None:
+        raise ValueError(f"Extractor {extractor_id} does not exist")
+    if environment == "production":
+        endpoint, enabled = extractor.production_endpoint, extractor.production_endpoint_enabled
+    else:
+        endpoint, enabled = extractor.development_endpoint, extractor.development_endpoint_enabled
+    if not endpoint or not enabled:
+        raise ValueError(f"Extractor {extractor_id} has no enabled {environment} endpoint")
+
+    rows = db.execute(
+        select(Paper.id, Paper.pdf_path, Paper.pdf_hash)
+        .join(dataset_paper_association, dataset_paper_association.c.paper_id == Paper.id)
+        .where(
+            dataset_paper_association.c.dataset_id == dataset_id,
+            or_(Paper.pdf_path.isnot(None), Paper.pdf_hash.isnot(None)),
+        )
+        .order_by(Paper.id)
+    ).all()
+    # Prefer the local content-addressed copy over wherever pdf_path points
+    jobs = []
+    for row in rows:
+        path = pdf_store.stored_path(row.pdf_hash) or row.pdf_path
+        if path:
+            jobs.append(PdfJob(paper_id=row.id, pdf_path=path))
+    return endpoint, jobs
+
+
+async def dispatch_dataset(
+    dataset_id: int,
+    extractor_id: int,
+    environment: str = "development",
+    use_cache: bool = True,
+    **options: Any,
+) -> ExtractionRunResult:
+    """Extract every PDF of a dataset with an extractor and store the results.
+
+    With ``use_cache``, papers that already have a reusable completed extract
+    are copied and only the remaining ones are sent to the endpoint.
+    """
+    endpoint, jobs = await run_job(load_dispatch_plan, dataset_id, extractor_id, environment)
+    hits = 0
+    if use_cache:
+        jobs, hits = await run_job(apply_extract_cache, extractor_id, jobs)
+    dispatcher = ExtractionDispatcher(endpoint, extractor_id, **options)
+    dispatcher.result.dataset_id = dataset_id
+    result = await dispatcher.run(jobs, write_extracts)
+    result.cache_hits, result.cache_misses = hits, len(jobs)
+    result.cache_hit_ratio = _hit_ratio(hits, len(jobs))
+    return result
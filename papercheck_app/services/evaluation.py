@@ -0,0 +1,325 @@
+"""Batch evaluation engine.
+
+Pairs every ``Extract`` of an extractor in a dataset with its paper's
+``GroundTruth``, scores the pairs in batches across a process pool and
+bulk-upserts the results into ``extractevals`` keyed on ``extract_id``.
+Pairs come ordered by paper, so the extracts of a paper (one per extractor
+in a run over several) land in the same batch and share the prepared
+ROUGE-L scorer of its ground truth abstract.
+
+Each eval records the ``change_seq`` of the extract and ground truth it was
+scored from and the ``METRICS_VERSION`` it was scored with. An eval is stale
+when its extract or ground truth changed since, a newer ground truth was
+added, or the metric definitions changed; ``evaluate_stale`` rescores only
+those, so a nightly pass costs in proportion to what changed.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
+
+from ..core.monitoring import EVALUATIONS
+from ..models import Extract, ExtractEval, GroundTruth, dataset_paper_association
+from ..schemas import EvaluationRunResult
+from . import authors, extract_references, leaderboard, metrics, references
+from .metrics import METRIC_COLUMNS
+from .rouge import RougeLScorer
+
+# Bump when a metric definition changes so stored evals can be told apart
+METRICS_VERSION = 4
+DEFAULT_BATCH_SIZE = 500
+
+
+class EvalPair(NamedTuple):
+    """Plain-data view of an extract and its ground truth, cheap to pickle."""
+
+    extract_id: int
+    extractor_id: int
+    paper_id: int
+    ground_truth_id: int
+    extracted_title: Optional[str]
+    title: Optional[str]
+    extracted_doi: Optional[str]
+    doi: Optional[str]
+    extracted_abstract: Optional[str]
+    abstract: Optional[str]
+    extracted_keywords: Optional[List[str]]
+    keywords: Optional[List[str]]
+    extracted_authors: Optional[Any]
+    authors: Optional[Any]
+    extracted_refs: Optional[Any]
+    refs: Optional[Any]
+    extract_change_seq: Optional[int]
+    ground_truth_change_seq: Optional[int]
+
+
+def score_pair(pair: EvalPair, abstract_scorer: Optional[RougeLScorer] = None) -> Dict[str, object]:
+    """Compute all metrics for one pair, with per-metric-group timings.
+
+    ``abstract_scorer`` is a RougeLScorer of the ground truth abstract, to
+    reuse across the extracts of a paper.
+    """
+    row: Dict[str, object] = {}
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    row.update(metrics.title_metrics(pair.extracted_title, pair.title))
+    timings["title"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    row.update(metrics.doi_metrics(pair.extracted_doi, pair.doi))
+    timings["doi"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    row.update(metrics.abstract_metrics(pair.extracted_abstract, pair.abstract, abstract_scorer))
+    timings["abstract"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    row.update(metrics.keyword_metrics(pair.extracted_keywords, pair.keywords))
+    timings["keywords"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    row.update(authors.author_metrics(pair.extracted_authors, pair.authors))
+    timings["authors"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    row.update(references.reference_metrics(pair.extracted_refs, pair.refs))
+    timings["refs"] = time.perf_counter() - start
+
+    row["extract_id"] = pair.extract_id
+    row["extractor_id"] = pair.extractor_id
+    row["ground_truth_id"] = pair.ground_truth_id
+    row["extract_change_seq"] = pair.extract_change_seq
+    row["ground_truth_change_seq"] = pair.ground_truth_change_seq
+    row["evaluation_details"] = {
+        "metrics_version": METRICS_VERSION,
+        "timings_ms": {name: round(seconds * 1000, 3) for name, seconds in timings.items()},
+    }
+    return row
+
+
+def score_batch(pairs: Sequence[EvalPair]) -> List[Dict[str, object]]:
+    """Worker entry point: score a batch of pairs, one abstract scorer per ground truth."""
+    scorers: Dict[int, RougeLScorer] = {}
+    rows = []
+    for pair in pairs:
+        scorer = scorers.get(pair.ground_truth_id)
+        if scorer is None:
+            scorer = scorers[pair.ground_truth_id] = RougeLScorer(pair.abstract)
+        rows.append(score_pair(pair, scorer))
+    return rows
+
+
+def stale_condition():
+    """True for extracts whose eval is missing or out of date.
+
+    Meant for ``pair_query``, over ``Extract`` joined to its latest
+    ``GroundTruth`` and outer joined to its ``ExtractEval``. Every insert and
+    update draws a new ``change_seq``, and an eval stores the values of the
+    rows it was scored from, so a change committed during a run is caught
+    by the next one whatever the commit order (``updated_at`` is the writing
+    transaction's start time and cannot tell).
+    """
+    return or_(
+        ExtractEval.id.is_(None),
+        ExtractEval.metrics_version.is_distinct_from(METRICS_VERSION),
+        ExtractEval.extract_change_seq.is_distinct_from(Extract.change_seq),
+        ExtractEval.ground_truth_id.is_distinct_from(GroundTruth.id),
+        ExtractEval.ground_truth_change_seq.is_distinct_from(GroundTruth.change_seq),
+    )
+
+
+def pair_query(
+    dataset_id: Optional[int], extractor_id: Optional[int], stale_only: bool = False
+):
+    """Select extract/ground-truth pairs, of an extractor and within a dataset if given.
+
+    If a paper has several ground truths the most recent one is used. With
+    ``stale_only`` only extracts whose eval is out of date are selected.
+    Pairs are ordered by paper, then extract.
+    """
+    truth = aliased(GroundTruth)
+    latest_truth = select(func.max(truth.id)).where(truth.paper_id == Extract.paper_id).scalar_subquery()
+    query = (
+        select(
+            Extract.id,
+            Extract.extractor_id,
+            Extract.paper_id,
+            GroundTruth.id,
+            Extract.extracted_title,
+            GroundTruth.title,
+            Extract.extracted_doi,
+            GroundTruth.doi,
+            Extract.extracted_abstract,
+            GroundTruth.abstract,
+            Extract.extracted_keywords,
+            GroundTruth.keywords,
+            Extract.extracted_authors,
+            GroundTruth.authors,
+            # Rebuilt from extract_references when the payload is not stored
+            func.coalesce(Extract.extracted_refs, extract_references.refs_payload()),
+            GroundTruth.refs,
+            Extract.change_seq,
+            GroundTruth.change_seq,
+        )
+        .join(GroundTruth, GroundTruth.id == latest_truth)
+        .where(Extract.status != "failed")
+        .order_by(Extract.paper_id, Extract.id)
+    )
+    if dataset_id is not None:
+        query = query.join(
+            dataset_paper_association,
+            dataset_paper_association.c.paper_id == Extract.paper_id,
+        ).where(dataset_paper_association.c.dataset_id == dataset_id)
+    if extractor_id is not None:
+        query = query.where(Extract.extractor_id == extractor_id)
+    if stale_only:
+        query = query.outerjoin(Extract.extract_eval).where(stale_condition())
+    return query
+
+
+def iter_pair_batches(
+    db: Session, query, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[List[EvalPair]]:
+    """Page through ``query`` by (paper, extract) ID, so commits between pages are safe."""
+    last = (0, 0)
+    while True:
+        rows = db.execute(
+            query.where(tuple_(Extract.paper_id, Extract.id) > last).limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        pairs = [EvalPair(*row) for row in rows]
+        yield pairs
+        last = (pairs[-1].paper_id, pairs[-1].extract_id)
+
+
+def upsert_extractevals(db: Session, rows: Sequence[Dict[str, object]]) -> None:
+    """Insert or update eval rows keyed on the unique extract_id.
+
+    The leaderboard aggregates are adjusted in the same transaction. New
+    evals are inserted first: an insert racing another run's waits for it
+    and is then skipped, so only the winner counts it as new. The remaining
+    evals are locked and read (the values they replace) before the update.
+    """
+    if not rows:
+        return
+    # One lock order for concurrent runs
+    rows = sorted(rows, key=lambda row: row["extract_id"])
+    inserted = set(
+        db.scalars(
+            insert(ExtractEval)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[ExtractEval.extract_id, ExtractEval.extractor_id])
+            .returning(ExtractEval.extract_id)
+        )
+    )
+    existing = [row for row in rows if row["extract_id"] not in inserted]
+    old_rows = leaderboard.locked_eval_values(db, [row["extract_id"] for row in existing])
+    if existing:
+        stmt = insert(ExtractEval).values(existing)
+        update_columns = METRIC_COLUMNS + (
+            "extractor_id",
+            "ground_truth_id",
+            "evaluation_date",
+            "evaluated_at",
+            "metrics_version",
+            "extract_change_seq",
+            "ground_truth_change_seq",
+            "evaluation_details",
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ExtractEval.extract_id, ExtractEval.extractor_id],
+            set_={
+                **{column: stmt.excluded[column] for column in update_columns},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+    leaderboard.record_eval_upsert(db, old_rows, rows)
+
+
+def evaluate_pairs(
+    db: Session,
+    batches: Iterator[List[EvalPair]],
+    result: EvaluationRunResult,
+    max_workers: Optional[int] = None,
+) -> EvaluationRunResult:
+    """Score pair batches in a process pool and upsert them as they complete.
+
+    The evals are stamped with the database time at its start; staleness
+    goes by the ``change_seq`` values carried in the pairs.
+    """
+    evaluation_date = datetime.now(timezone.utc).date().isoformat()
+    # Same clock and type as updated_at
+    evaluated_at = db.scalar(select(func.localtimestamp()))
+    workers = max_workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    def flush(rows: List[Dict[str, object]]) -> None:
+        for row in rows:
+            row["evaluation_date"] = evaluation_date
+            row["evaluated_at"] = evaluated_at
+            row["metrics_version"] = METRICS_VERSION
+            for name, ms in row["evaluation_details"]["timings_ms"].items():
+                result.metric_seconds[name] = result.metric_seconds.get(name, 0.0) + ms / 1000
+        upsert_extractevals(db, rows)
+        db.commit()
+        result.pairs_evaluated += len(rows)
+        EVALUATIONS.labels("stale" if result.stale_only else "dataset").inc(len(rows))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(score_batch, batch))
+            result.batches += 1
+            # Bound in-flight batches so memory does not grow with the dataset
+            while len(pending) >= workers * 2:
+                flush(pending.popleft().result())
+        while pending:
+            flush(pending.popleft().result())
+
+    result.elapsed_seconds = time.perf_counter() - start
+    if result.elapsed_seconds:
+        result.pairs_per_second = result.pairs_evaluated / result.elapsed_seconds
+    return result
+
+
+def evaluate_dataset(
+    db: Session,
+    dataset_id: int,
+    extractor_id: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: Optional[int] = None,
+) -> EvaluationRunResult:
+    """Compute and store ExtractEval rows for every extract of an extractor in a dataset."""
+    result = EvaluationRunResult(
+        dataset_id=dataset_id, extractor_id=extractor_id, metrics_version=METRICS_VERSION
+    )
+    batches = iter_pair_batches(db, pair_query(dataset_id, extractor_id), batch_size)
+    return evaluate_pairs(db, batches, result, max_workers=max_workers)
+
+
+def evaluate_stale(
+    db: Session,
+    dataset_id: Optional[int] = None,
+    extractor_id: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: Optional[int] = None,
+) -> EvaluationRunResult:
+    """Recompute only the missing and out-of-date evals, optionally of one dataset or extractor."""
+    result = EvaluationRunResult(
+        dataset_id=dataset_id,
+        extractor_id=extractor_id,
+        stale_only=True,
+        metrics_version=METRICS_VERSION,
+    )
+    batches = iter_pair_batches(db, pair_query(dataset_id, extractor_id, stale_only=True), batch_size)
+    return evaluate_pairs(db, batches, result, max_workers=max_workers)
@@ -0,0 +1,115 @@
+"""Streaming export of a dataset's extracts and evaluations.
+
+Rows are read through a server-side cursor (``yield_per``) and encoded one
+partition at a time as NDJSON or CSV, optionally gzip-compressed on the fly,
+so memory use does not depend on the size of the dataset.
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from ..core.database import SessionLocal
+from ..models import Extract, ExtractEval, dataset_paper_association
+
+EXPORT_CHUNK_SIZE = 1000
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+TABLES = {"extracts": Extract, "extractevals": ExtractEval}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_columns(table: str) -> List:
+    """Stored columns of ``table``; generated ones like search vectors are left out."""
+    return [column for column in TABLES[table].__table__.columns if column.computed is None]
+
+
+def export_query(table: str, dataset_id: int, extractor_id: Optional[int] = None):
+    """All stored columns of ``table`` for the papers of a dataset, in ID order."""
+    model = TABLES[table]
+    query = select(*export_columns(table))
+    if model is ExtractEval:
+        query = query.join(ExtractEval.extract)
+    query = query.join(
+        dataset_paper_association, dataset_paper_association.c.paper_id == Extract.paper_id
+    ).where(dataset_paper_association.c.dataset_id == dataset_id)
+    if extractor_id is not None:
+        query = query.where(model.extractor_id == extractor_id)
+    return query.order_by(model.id)
+
+
+def iter_row_chunks(query, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Stream ``query`` in chunks of row mappings from a server-side cursor.
+
+    Uses its own session, which stays open for as long as the response streams.
+    """
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=chunk_size))
+        for partition in result.mappings().partitions():
+            yield partition
+
+
+def encode_ndjson(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """One JSON object per line."""
+    for rows in chunks:
+        yield "".join(json.dumps(dict(row), default=_json_default) + "\n" for row in rows).encode()
+
+
+def encode_csv(chunks: Iterable[List[Dict[str, Any]]], columns: List[str]) -> Iterator[bytes]:
+    """CSV with a header row; JSON columns are written as JSON strings."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows([_csv_value(row[column]) for column in columns] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into a single gzip member as it goes."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(
+    table: str,
+    dataset_id: int,
+    fmt: str = "ndjson",
+    extractor_id: Optional[int] = None,
+    compress: bool = False,
+) -> Iterator[bytes]:
+    """Encoded (and optionally gzipped) export of ``table`` for a dataset."""
+    query = export_query(table, dataset_id, extractor_id)
+    chunks = iter_row_chunks(query)
+    if fmt == "csv":
+        stream = encode_csv(chunks, [column.name for column in export_columns(table)])
+    else:
+        stream = encode_ndjson(chunks)
+    return gzip_stream(stream) if compress else stream
@@ -0,0 +1,153 @@
+"""Reuse of completed extracts across identical PDFs and extractor configurations.
+
+An extractor's identity is the tuple behind ``_extractor_version_variant_config_uc``
+(type, version, variant, config hash, parser config hash), compared NULL-safely
+since the unique constraint lets rows with NULLs repeat. A completed extract of
+the paper by an identical extractor is a cache hit and can be copied instead of
+running the extractor again.
+
+Content identity needs no join: ``papers.pdf_hash`` is unique, so ingestion and
+folder scans resolve the same PDF to one paper row and a paper's own extracts
+are all the extracts of that content.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import Integer, and_, any_, func, literal, null, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session, aliased
+
+from ..core.config import settings
+from ..models import Extract, ExtractReference, Extractor
+
+IDENTITY_COLUMNS = ("extractor_type", "version", "variant", "config_hash", "parser_config_hash")
+COPIED_COLUMNS = (
+    "extraction_date",
+    "extracted_title",
+    "extracted_doi",
+    "extracted_authors",
+    "extracted_refs",
+    "extracted_xrefs",
+    "extracted_abstract",
+    "extracted_keywords",
+    "processing_time_seconds",
+    "status",
+    "error_message",
+)
+
+
+def any_id(ids: Sequence[int]):
+    """Bind a list of IDs as a single integer array parameter."""
+    return any_(literal(list(ids), ARRAY(Integer)))
+
+
+def equivalent_extractor_ids(db: Session, extractor_id: int) -> List[int]:
+    """IDs of all extractors sharing the identity of ``extractor_id`` (itself included)."""
+    target = aliased(Extractor)
+    conditions = [
+        getattr(Extractor, column).is_not_distinct_from(getattr(target, column))
+        for column in IDENTITY_COLUMNS
+    ]
+    return list(
+        db.scalars(
+            select(Extractor.id).join(target, and_(*conditions)).where(target.id == extractor_id)
+        )
+    )
+
+
+def find_cached_extracts(
+    db: Session, extractor_id: int, paper_ids: Sequence[int]
+) -> Dict[int, Tuple[int, bool]]:
+    """Map paper ID -> (completed extract ID, whether it already belongs to this paper and extractor).
+
+    Runs as one query for any number of papers. Extracts by the extractor
+    itself are preferred over those of an identical one.
+    """
+    if not paper_ids:
+        return {}
+    extractor_ids = equivalent_extractor_ids(db, extractor_id)
+    own = Extract.extractor_id == extractor_id
+    ranked = (
+        select(
+            Extract.paper_id,
+            Extract.id,
+            own.label("own"),
+            func.row_number()
+            .over(partition_by=Extract.paper_id, order_by=(own.desc(), Extract.id.desc()))
+            .label("rank"),
+        )
+        .where(
+            Extract.paper_id == any_id(paper_ids),
+            Extract.extractor_id == any_id(extractor_ids),
+            Extract.status == "completed",
+        )
+        .subquery()
+    )
+    rows = db.execute(select(ranked.c.paper_id, ranked.c.id, ranked.c.own).where(ranked.c.rank == 1)).all()
+    return {paper_id: (extract_id, is_own) for paper_id, extract_id, is_own in rows}
+
+
+def papers_needing_extraction(
+    db: Session, extractor_id: int, paper_ids: Sequence[int]
+) -> Tuple[List[int], Dict[int, Tuple[int, bool]]]:
+    """Split papers into those that still need extraction and cache hits."""
+    cached = find_cached_extracts(db, extractor_id, paper_ids)
+    return [paper_id for paper_id in paper_ids if paper_id not in cached], cached
+
+
+def copy_cached_extracts(
+    db: Session, extractor_id: int, cached: Dict[int, Tuple[int, bool]]
+) -> List[int]:
+    """Copy cache hits that belong to another (identical) extractor; returns the IDs created.
+
+    Their extract_references rows are copied along. Does not commit.
+    """
+    to_copy = [(paper_id, extract_id) for paper_id, (extract_id, is_own) in cached.items() if not is_own]
+    if not to_copy:
+        return []
+    sources = {
+        row.id: row
+        for row in db.execute(
+            select(Extract.id, *(getattr(Extract, c) for c in COPIED_COLUMNS)).where(
+                Extract.id == any_id([extract_id for _, extract_id in to_copy])
+            )
+        )
+    }
+    values = [
+        {
+            "paper_id": paper_id,
+            "extractor_id": extractor_id,
+            **{column: getattr(sources[extract_id], column) for column in COPIED_COLUMNS},
+        }
+        for paper_id, extract_id in to_copy
+    ]
+    # The copies get the rows below instead of the payload
+    if not settings.store_refs_jsonb:
+        for value in values:
+            value["extracted_refs"] = null()
+    copied = list(
+        db.scalars(insert(Extract).returning(Extract.id, sort_by_parameter_order=True), values)
+    )
+    copy_references(
+        db, extractor_id, [(source_id, copy_id) for (_, source_id), copy_id in zip(to_copy, copied)]
+    )
+    return copied
+
+
+def copy_references(db: Session, extractor_id: int, copies: Sequence[Tuple[int, int]]) -> None:
+    """Duplicate the extract_references rows of each ``(source extract, copy)`` pair, in SQL."""
+    pairs = func.unnest(
+        literal([source_id for source_id, _ in copies], ARRAY(Integer)),
+        literal([copy_id for _, copy_id in copies], ARRAY(Integer)),
+    ).table_valued("source_id", "copy_id").render_derived(name="copies")
+    columns = ("ordinal", "doi", "title", "title_normalized", "year", "raw")
+    db.execute(
+        insert(ExtractReference).from_select(
+            ["extract_id", "extractor_id", *columns],
+            select(
+                pairs.c.copy_id,
+                literal(extractor_id, Integer),
+                *(getattr(ExtractReference, c) for c in columns),
+            ).join(pairs, ExtractReference.extract_id == pairs.c.source_id),
+        )
+    )
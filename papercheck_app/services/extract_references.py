@@ -0,0 +1,167 @@
+"""Normalized reference rows of extracts (``extract_references``).
+
+An extract's refs payload is one JSON document shaped by its extractor, so
+a reference-level question ("which extracts cite DOI X", "which cite a work
+with this title") would otherwise unnest every document. Each reference is
+stored as one row with its ordinal, normalized DOI, title, normalized title,
+year and raw string (see ``references.reference_fields``), indexed on DOI
+and normalized title, so those questions and joins on them are index scans.
+
+Rows are written with COPY in one round trip per batch of extracts, straight
+from the payloads as extracts are stored; extracts stored before the table
+existed are loaded by ``load_missing``. With ``STORE_REFS_JSONB`` off the
+payload is not kept in ``extracts.extracted_refs`` and ``refs_payload``
+rebuilds it from the rows.
+"""
+
+import io
+import time
+from typing import Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from ..core.pagination import PageParams, paginate
+from ..models import Extract, ExtractReference
+from ..schemas import ExtractReferenceRead, Page, ReferenceLoadResult
+from . import references
+from .metrics import normalize_doi
+
+COLUMNS = ("extract_id", "extractor_id", "ordinal", "doi", "title", "title_normalized", "year", "raw")
+LOAD_BATCH = 2000
+# B-tree entries are limited to about a third of a page; longer keys are not
+# DOIs or titles, and one of them would fail the whole COPY
+MAX_KEY_LENGTH = 1000
+MAX_YEAR = 9999
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _key(value: str) -> Optional[str]:
+    return value if value and len(value) <= MAX_KEY_LENGTH else None
+
+
+def reference_rows(extract_id: int, extractor_id: int, payload: Any) -> List[tuple]:
+    """``COLUMNS`` tuples of the references in a refs payload, in list order."""
+    rows = []
+    for ordinal, item in enumerate(references.reference_items(payload)):
+        raw, doi, title, year = references.reference_fields(item)
+        rows.append((
+            extract_id,
+            extractor_id,
+            ordinal,
+            _key(doi),
+            title,
+            _key(references.normalize_title(title)),
+            year if year is not None and 0 < year <= MAX_YEAR else None,
+            raw or None,
+        ))
+    return rows
+
+
+def _copy_line(row: tuple) -> str:
+    """One line of COPY text format: tab-separated, backslash-escaped, \\N for NULL."""
+    return "\t".join("\\N" if value is None else str(value).translate(_ESCAPES) for value in row) + "\n"
+
+
+def copy_references(db: Session, extracts: Iterable[Tuple[int, int, Any]]) -> int:
+    """COPY the references of ``(extract_id, extractor_id, refs payload)`` triples; returns the rows.
+
+    The extracts must not have reference rows yet. Runs in the session's
+    transaction and does not commit.
+    """
+    buffer = io.StringIO()
+    count = 0
+    for extract_id, extractor_id, payload in extracts:
+        for row in reference_rows(extract_id, extractor_id, payload):
+            buffer.write(_copy_line(row))
+            count += 1
+    if not count:
+        return 0
+    buffer.seek(0)
+    with db.connection().connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY extract_references ({', '.join(COLUMNS)}) FROM STDIN", buffer)
+    return count
+
+
+def load_missing(db: Session, batch_size: int = LOAD_BATCH) -> ReferenceLoadResult:
+    """Load the reference rows of extracts whose refs payload has none, committing per batch."""
+    start = time.perf_counter()
+    result = ReferenceLoadResult()
+    after = 0
+    has_rows = select(ExtractReference.id).where(
+        ExtractReference.extract_id == Extract.id,
+        ExtractReference.extractor_id == Extract.extractor_id,
+    )
+    while True:
+        rows = db.execute(
+            select(Extract.id, Extract.extractor_id, Extract.extracted_refs)
+            .where(Extract.id > after, Extract.extracted_refs.isnot(None), ~has_rows.exists())
+            .order_by(Extract.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        result.references += copy_references(db, rows)
+        db.commit()
+        result.scanned += len(rows)
+        after = rows[-1].id
+    result.elapsed_seconds = time.perf_counter() - start
+    return result
+
+
+def refs_payload():
+    """Correlated subquery rebuilding an extract's refs payload from its rows."""
+    item = func.jsonb_build_object(
+        "raw", ExtractReference.raw,
+        "doi", ExtractReference.doi,
+        "title", ExtractReference.title,
+        "year", ExtractReference.year,
+    )
+    return (
+        select(func.jsonb_build_object("references", func.jsonb_agg(aggregate_order_by(item, ExtractReference.ordinal))))
+        .where(
+            ExtractReference.extract_id == Extract.id,
+            ExtractReference.extractor_id == Extract.extractor_id,
+        )
+        .correlate(Extract)
+        .scalar_subquery()
+    )
+
+
+def cites_doi(doi: str):
+    """Extracts with a reference to ``doi``, through the DOI index."""
+    return tuple_(Extract.id, Extract.extractor_id).in_(
+        select(ExtractReference.extract_id, ExtractReference.extractor_id).where(
+            ExtractReference.doi == normalize_doi(doi)
+        )
+    )
+
+
+def search(
+    db: Session,
+    params: PageParams,
+    doi: Optional[str] = None,
+    title: Optional[str] = None,
+    year: Optional[int] = None,
+    extractor_id: Optional[int] = None,
+) -> Page:
+    """One keyset page of references with this DOI and/or (normalized) title.
+
+    ``year`` and ``extractor_id`` narrow the match further. Raises ValueError
+    without a DOI or title, the two indexed keys.
+    """
+    conditions = []
+    if doi:
+        conditions.append(ExtractReference.doi == normalize_doi(doi))
+    if title:
+        conditions.append(ExtractReference.title_normalized == references.normalize_title(title))
+    if not conditions:
+        raise ValueError("Give a doi or a title")
+    if year is not None:
+        conditions.append(ExtractReference.year == year)
+    if extractor_id is not None:
+        conditions.append(ExtractReference.extractor_id == extractor_id)
+    return paginate(
+        db, select(ExtractReference).where(*conditions), ExtractReference, ExtractReferenceRead, params
+    )
@@ -0,0 +1,170 @@
+"""Bulk paper ingestion.
+
+Papers are written with multi-row ``INSERT ... ON CONFLICT (pdf_hash) DO NOTHING``
+statements and linked to a dataset through ``dataset_papers`` in the same
+transaction, instead of one ORM object per ``PaperCreate``. A batch larger than
+one statement can bind is split over several statements. Papers that already
+existed may have evals: when they are attached, those are added to the
+dataset's leaderboard aggregates.
+"""
+
+from typing import Iterable, Iterator, List, Optional, Sequence, Set
+
+from sqlalchemy import String, any_, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from ..core.monitoring import PAPERS_INGESTED
+from ..models import Dataset, Paper, dataset_paper_association
+from ..schemas import PaperBulkIngestResult, PaperCreate
+from . import leaderboard
+
+DEFAULT_BATCH_SIZE = 1000
+# Bind parameters asyncpg accepts in one statement; a multi-row VALUES binds
+# one per column and row
+MAX_BIND_PARAMETERS = 32767
+
+
+def statement_chunks(rows: List[dict]) -> Iterator[List[dict]]:
+    """Split multi-row VALUES ``rows`` into chunks within MAX_BIND_PARAMETERS."""
+    size = max(1, MAX_BIND_PARAMETERS // max(1, len(rows[0]))) if rows else 1
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def get_dataset_or_none(db: Session, dataset_id: int) -> Optional[Dataset]:
+    """Return the dataset with the given ID, or None."""
+    return db.get(Dataset, dataset_id)
+
+
+def touch_datasets(db: Session, dataset_ids: Iterable[int]) -> None:
+    """Bump updated_at of datasets whose membership changed, so their ETags change."""
+    db.execute(
+        update(Dataset).where(Dataset.id.in_(list(dataset_ids))).values(updated_at=func.now())
+    )
+
+
+def ingest_paper_batch(
+    db: Session,
+    papers: Sequence[PaperCreate],
+    dataset_id: Optional[int] = None,
+    seen_hashes: Optional[Set[str]] = None,
+) -> PaperBulkIngestResult:
+    """Insert one batch of papers and attach them to a dataset, without committing.
+
+    ``seen_hashes`` carries the pdf_hashes of earlier batches of the same
+    payload so repeats across batches are counted as duplicates.
+    """
+    result = PaperBulkIngestResult(dataset_id=dataset_id)
+    if seen_hashes is None:
+        seen_hashes = set()
+
+    rows = []
+    batch_hashes: List[str] = []
+    for paper in papers:
+        if paper.pdf_hash is not None:
+            if paper.pdf_hash in seen_hashes:
+                result.duplicates += 1
+                continue
+            seen_hashes.add(paper.pdf_hash)
+            batch_hashes.append(paper.pdf_hash)
+        rows.append(paper.model_dump())
+    PAPERS_INGESTED.labels("duplicate").inc(result.duplicates)
+
+    if not rows:
+        return result
+
+    inserted = []
+    for chunk in statement_chunks(rows):
+        stmt = (
+            insert(Paper)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=[Paper.pdf_hash])
+            .returning(Paper.id, Paper.pdf_hash)
+        )
+        inserted.extend(db.execute(stmt).all())
+    result.inserted = len(inserted)
+    result.skipped = len(rows) - result.inserted
+    PAPERS_INGESTED.labels("inserted").inc(result.inserted)
+    PAPERS_INGESTED.labels("skipped").inc(result.skipped)
+
+    if dataset_id is None:
+        return result
+
+    paper_ids = [row.id for row in inserted]
+    inserted_hashes = {row.pdf_hash for row in inserted}
+    existing_hashes = [h for h in batch_hashes if h not in inserted_hashes]
+    existing_ids = set()
+    if existing_hashes:
+        existing_ids.update(
+            db.scalars(
+                select(Paper.id).where(
+                    Paper.pdf_hash == any_(literal(existing_hashes, ARRAY(String)))
+                )
+            )
+        )
+        paper_ids.extend(existing_ids)
+
+    links = [{"dataset_id": dataset_id, "paper_id": pid} for pid in paper_ids]
+    attached = []
+    for chunk in statement_chunks(links):
+        link_stmt = (
+            insert(dataset_paper_association)
+            .values(chunk)
+            .on_conflict_do_nothing()
+            .returning(dataset_paper_association.c.paper_id)
+        )
+        attached.extend(db.scalars(link_stmt))
+    result.attached = len(attached)
+    if attached:
+        touch_datasets(db, [dataset_id])
+        # Papers inserted just now have no evals yet
+        leaderboard.record_membership_change(db, dataset_id, [pid for pid in attached if pid in existing_ids])
+    return result
+
+
+def merge_ingest_results(
+    total: PaperBulkIngestResult, batch: PaperBulkIngestResult
+) -> PaperBulkIngestResult:
+    """Add the counts of ``batch`` to ``total`` in place and return it."""
+    total.inserted += batch.inserted
+    total.skipped += batch.skipped
+    total.duplicates += batch.duplicates
+    total.attached += batch.attached
+    return total
+
+
+def bulk_ingest_papers(
+    db: Session,
+    papers: Iterable[PaperCreate],
+    dataset_id: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> PaperBulkIngestResult:
+    """Ingest papers in batches and attach them to a dataset in one transaction.
+
+    Papers whose pdf_hash already exists are skipped (but still attached to the
+    dataset), repeats within ``papers`` are counted as duplicates.
+    """
+    if dataset_id is not None and get_dataset_or_none(db, dataset_id) is None:
+        raise ValueError(f"Dataset {dataset_id} does not exist")
+
+    total = PaperBulkIngestResult(dataset_id=dataset_id)
+    seen_hashes: Set[str] = set()
+    batch: List[PaperCreate] = []
+    try:
+        for paper in papers:
+            batch.append(paper)
+            if len(batch) >= batch_size:
+                merge_ingest_results(
+                    total, ingest_paper_batch(db, batch, dataset_id, seen_hashes)
+                )
+                batch = []
+        if batch:
+            merge_ingest_results(
+                total, ingest_paper_batch(db, batch, dataset_id, seen_hashes)
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return total
@@ -0,0 +1,143 @@
+"""Indexed queries over the refs and authors JSONB columns.
+
+The four columns carry GIN ``jsonb_path_ops`` indexes, which serve the
+containment operator ``@>`` and the jsonpath operators ``@?`` (path exists)
+and ``@@`` (predicate) — but not key-existence operators like ``?``. Every
+condition built here is one of those three, so "which extracts cite DOI X"
+is a bitmap index scan rather than a scan of every JSONB document.
+
+The index stores hashes of (path, value) pairs, so a jsonpath is only served
+through its ``==`` comparisons with constants: ``$.references[*] ? (@.doi ==
+"X")`` or ``$[*].surname == "X"``. Ranges (``<``, ``>``), ``like_regex``,
+``starts with``, bare paths (``$.references[*].doi``, existence only) and
+``.**`` give it nothing to look up; the plan still shows a bitmap scan of the
+GIN index, but it returns every indexed document and the recheck filters them,
+a full scan in disguise. Combine such paths with a containment or ``==``
+condition to keep them cheap. ``tests/test_jsonb_search.py`` checks both.
+
+For extracts, the DOI shortcut uses the DOI index of ``extract_references``
+instead, which also holds the references of extracts stored without their
+refs payload.
+
+Extractors nest their lists differently (``{"references": [...]}``,
+``{"refs": [...]}``, a bare list, ...), so the DOI and author shortcuts OR
+one containment document per shape the matchers accept.
+
+Selectivity estimates for these operators are generic constants, so under
+the ``ORDER BY created_at, id LIMIT n`` of a keyset page the planner likes
+to walk the pagination index and filter every row instead. ``search``
+fences the match in a ``MATERIALIZED`` CTE so it is always answered from
+the GIN index and only the matches are sorted; a page of a very broad
+predicate therefore costs in proportion to all of its matches.
+"""
+
+from typing import Any, List, Optional
+
+from sqlalchemy import cast, literal, or_, select
+from sqlalchemy.dialects.postgresql import JSONPATH
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, aliased
+
+from ..core.pagination import PageParams, paginate
+from ..models import Extract, GroundTruth
+from ..schemas import ExtractSummary, GroundTruthSummary, Page
+from . import authors, extract_references, references
+from .metrics import normalize_doi
+
+MODELS = {"extracts": Extract, "ground_truths": GroundTruth}
+SCHEMAS = {"extracts": ExtractSummary, "ground_truths": GroundTruthSummary}
+COLUMNS = {
+    ("extracts", "refs"): Extract.extracted_refs,
+    ("extracts", "authors"): Extract.extracted_authors,
+    ("ground_truths", "refs"): GroundTruth.refs,
+    ("ground_truths", "authors"): GroundTruth.authors,
+}
+LIST_KEYS = {"refs": references.LIST_KEYS, "authors": authors.LIST_KEYS}
+AUTHOR_NAME_KEYS = ("name", "surname")
+
+
+def _item_documents(field: str, item: dict) -> List[Any]:
+    """Containment documents matching ``item`` in any list shape of ``field``."""
+    return [[item]] + [{key: [item]} for key in LIST_KEYS[field]]
+
+
+def contains_any(column, documents: List[Any]):
+    """``column @> document`` for any of ``documents``."""
+    return or_(*(column.contains(document) for document in documents))
+
+
+def cites_doi(column, doi: str):
+    """References containing ``doi``, as given or normalized."""
+    variants = dict.fromkeys([doi.strip(), normalize_doi(doi)])
+    return contains_any(
+        column, [doc for value in variants for doc in _item_documents("refs", {"doi": value})]
+    )
+
+
+def has_author(column, name: str):
+    """Authors whose full name or surname is exactly ``name``."""
+    return contains_any(
+        column,
+        [doc for key in AUTHOR_NAME_KEYS for doc in _item_documents("authors", {key: name})],
+    )
+
+
+def search_query(
+    target: str,
+    field: str,
+    contains: Any = None,
+    path: Optional[str] = None,
+    match: Optional[str] = None,
+    doi: Optional[str] = None,
+    author: Optional[str] = None,
+):
+    """Rows of ``target`` whose ``field`` column satisfies every given criterion.
+
+    ``contains`` is a JSON document for ``@>``, ``path`` a jsonpath that must
+    return an item (``@?``) and ``match`` a jsonpath predicate (``@@``).
+    Raises ValueError for unknown targets or fields, or without criteria.
+    """
+    if (target, field) not in COLUMNS:
+        raise ValueError(f"Unknown search column {target}.{field}")
+    column = COLUMNS[(target, field)]
+    conditions = []
+    if contains is not None:
+        conditions.append(column.contains(contains))
+    if path:
+        conditions.append(column.path_exists(path))
+    if match:
+        conditions.append(column.path_match(match))
+    if doi:
+        if field != "refs":
+            raise ValueError("doi only applies to refs")
+        if target == "extracts":
+            # Also covers extracts whose refs payload is not stored
+            conditions.append(extract_references.cites_doi(doi))
+        else:
+            conditions.append(cites_doi(column, doi))
+    if author:
+        if field != "authors":
+            raise ValueError("author only applies to authors")
+        conditions.append(has_author(column, author))
+    if not conditions:
+        raise ValueError("Give at least one of contains, path, match, doi or author")
+    return select(MODELS[target]).where(*conditions)
+
+
+def check_jsonpath(db: Session, path: str) -> None:
+    """Raise ValueError if Postgres cannot parse ``path`` as a jsonpath."""
+    try:
+        with db.begin_nested():
+            db.execute(select(cast(literal(path), JSONPATH)))
+    except DBAPIError as e:
+        raise ValueError(f"Invalid jsonpath '{path}': {str(e.orig).splitlines()[0]}") from e
+
+
+def search(db: Session, target: str, field: str, params: PageParams, **criteria) -> Page:
+    """One keyset page of ``search_query`` results as summaries."""
+    query = search_query(target, field, **criteria)
+    for key in ("path", "match"):
+        if criteria.get(key):
+            check_jsonpath(db, criteria[key])
+    matches = aliased(MODELS[target], query.cte("matches").prefix_with("MATERIALIZED"))
+    return paginate(db, select(matches), matches, SCHEMAS[target], params)
@@ -0,0 +1,278 @@
+"""Per-extractor, per-dataset leaderboard aggregates.
+
+``leaderboard_metrics`` holds, for every (extractor, dataset, metric), the sum
+of the non-null values, the number of non-null values and the number of evals.
+Mean and null rate follow from these, and all three can be adjusted by deltas:
+when eval rows are upserted, the previous values of the affected rows are
+subtracted and the new ones added, for every dataset containing the paper;
+when papers join or leave a dataset, their evals are added to or subtracted
+from that dataset's rows. The leaderboard itself only ever reads this table.
+
+``rebuild_leaderboard`` recomputes the aggregates from ``extractevals`` in one
+statement, to clear float drift or after changes that bypassed the services:
+an eval upserted while its paper joins or leaves a dataset in a concurrent
+transaction can be missed by both.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import Boolean, Float, Integer, String, cast, column, delete, func, literal, select, true, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from ..models import Extract, ExtractEval, Extractor, LeaderboardMetric, dataset_paper_association
+from ..schemas import LeaderboardEntry, LeaderboardRefreshResult, MetricAggregate
+from .extract_cache import any_id
+from .metrics import METRIC_COLUMNS
+
+# Metrics where a smaller value ranks higher
+LOWER_IS_BETTER = {"title_levenshtein_distance", "refs_avg_title_levenshtein"}
+
+Key = Tuple[int, int, str]  # (extractor_id, dataset_id, metric)
+
+
+def _accumulate(
+    deltas: Dict[Key, List[float]],
+    row: Mapping[str, Any],
+    dataset_ids: Iterable[int],
+    sign: int,
+) -> None:
+    for dataset_id in dataset_ids:
+        for metric in METRIC_COLUMNS:
+            delta = deltas.setdefault((row["extractor_id"], dataset_id, metric), [0.0, 0, 0])
+            value = row.get(metric)
+            if value is not None:
+                delta[0] += sign * float(value)
+                delta[1] += sign
+            delta[2] += sign
+
+
+def eval_deltas(
+    old_rows: Sequence[Mapping[str, Any]],
+    new_rows: Sequence[Mapping[str, Any]],
+    datasets: Mapping[int, List[int]],
+) -> Dict[Key, List[float]]:
+    """``[sum, value_count, eval_count]`` changes caused by replacing old rows with new ones."""
+    deltas: Dict[Key, List[float]] = {}
+    for rows, sign in ((old_rows, -1), (new_rows, 1)):
+        for row in rows:
+            _accumulate(deltas, row, datasets.get(row["extract_id"], ()), sign)
+    return {key: delta for key, delta in deltas.items() if any(delta)}
+
+
+def apply_deltas(db: Session, deltas: Dict[Key, List[float]]) -> None:
+    """Add deltas to the aggregates, creating missing rows."""
+    if not deltas:
+        return
+    stmt = insert(LeaderboardMetric).values(
+        [
+            {
+                "extractor_id": extractor_id,
+                "dataset_id": dataset_id,
+                "metric": metric,
+                "value_sum": value_sum,
+                "value_count": value_count,
+                "eval_count": eval_count,
+            }
+            # Sorted so concurrent refreshes lock rows in the same order
+            for (extractor_id, dataset_id, metric), (value_sum, value_count, eval_count) in sorted(
+                deltas.items()
+            )
+        ]
+    )
+    db.execute(_adding(stmt))
+
+
+def _adding(stmt):
+    """``stmt``, an insert of aggregate rows, adding to the existing rows instead of conflicting."""
+    return stmt.on_conflict_do_update(
+        constraint="_leaderboard_extractor_dataset_metric_uc",
+        set_={
+            "value_sum": LeaderboardMetric.value_sum + stmt.excluded.value_sum,
+            "value_count": LeaderboardMetric.value_count + stmt.excluded.value_count,
+            "eval_count": LeaderboardMetric.eval_count + stmt.excluded.eval_count,
+            "updated_at": func.now(),
+        },
+    )
+
+
+def locked_eval_values(db: Session, extract_ids: Sequence[int]) -> List[Mapping[str, Any]]:
+    """Current metric values of existing evals, locked until the transaction ends.
+
+    The row lock waits for a concurrent writer of the same eval and then
+    reads its committed values, so they are what an update will replace.
+    """
+    if not extract_ids:
+        return []
+    return [
+        row._mapping
+        for row in db.execute(
+            select(
+                ExtractEval.extract_id,
+                ExtractEval.extractor_id,
+                *(getattr(ExtractEval, metric) for metric in METRIC_COLUMNS),
+            )
+            .where(ExtractEval.extract_id == any_id(extract_ids))
+            .order_by(ExtractEval.extract_id)
+            .with_for_update()
+        )
+    ]
+
+
+def record_eval_upsert(
+    db: Session, old_rows: Sequence[Mapping[str, Any]], new_rows: Sequence[Mapping[str, Any]]
+) -> None:
+    """Update the aggregates for upserted eval rows, in the upsert's transaction.
+
+    ``old_rows`` are the replaced values from ``locked_eval_values``, read
+    after inserting the new evals and before updating the existing ones; see
+    ``evaluation.upsert_extractevals``.
+    """
+    if not new_rows:
+        return
+    extract_ids = [row["extract_id"] for row in new_rows]
+    datasets: Dict[int, List[int]] = {}
+    for extract_id, dataset_id in db.execute(
+        select(Extract.id, dataset_paper_association.c.dataset_id)
+        .join(dataset_paper_association, dataset_paper_association.c.paper_id == Extract.paper_id)
+        .where(Extract.id == any_id(extract_ids))
+    ):
+        datasets.setdefault(extract_id, []).append(dataset_id)
+    apply_deltas(db, eval_deltas(old_rows, new_rows, datasets))
+
+
+def _metric_value(metric: str):
+    value = getattr(ExtractEval, metric)
+    if isinstance(value.type, Boolean):
+        value = cast(value, Integer)
+    return cast(value, Float)
+
+
+def _unpivot():
+    """Lateral (metric, value) rows of an ExtractEval, one per metric column."""
+    return (
+        values(column("metric", String), column("value", Float), name="metric_values")
+        .data([(metric, _metric_value(metric)) for metric in METRIC_COLUMNS])
+        .lateral()
+    )
+
+
+def record_membership_change(db: Session, dataset_id: int, paper_ids: Sequence[int], sign: int = 1) -> None:
+    """Add the evals of papers that joined a dataset to its aggregates, or subtract them (``sign=-1``).
+
+    ``paper_ids`` are the papers whose ``dataset_papers`` row was just
+    inserted (or deleted). The deltas are summed by one statement, in the
+    caller's transaction; does not commit.
+    """
+    if not paper_ids:
+        return
+    unpivot = _unpivot()
+    query = (
+        select(
+            ExtractEval.extractor_id,
+            literal(dataset_id),
+            unpivot.c.metric,
+            sign * func.coalesce(func.sum(unpivot.c.value), 0.0),
+            sign * func.count(unpivot.c.value),
+            sign * func.count(),
+        )
+        .join(ExtractEval.extract)
+        .join(unpivot, true())
+        .where(Extract.paper_id == any_id(paper_ids))
+        .group_by(ExtractEval.extractor_id, unpivot.c.metric)
+        # Rows locked in the order of apply_deltas
+        .order_by(ExtractEval.extractor_id, unpivot.c.metric)
+    )
+    db.execute(
+        _adding(
+            insert(LeaderboardMetric).from_select(
+                ["extractor_id", "dataset_id", "metric", "value_sum", "value_count", "eval_count"], query
+            )
+        )
+    )
+
+
+def rebuild_leaderboard(
+    db: Session, dataset_id: Optional[int] = None, extractor_id: Optional[int] = None
+) -> LeaderboardRefreshResult:
+    """Recompute the aggregates from scratch, optionally for one dataset and/or extractor."""
+    start = time.perf_counter()
+    unpivot = _unpivot()
+    query = (
+        select(
+            ExtractEval.extractor_id,
+            dataset_paper_association.c.dataset_id,
+            unpivot.c.metric,
+            func.coalesce(func.sum(unpivot.c.value), 0.0),
+            func.count(unpivot.c.value),
+            func.count(),
+        )
+        .join(ExtractEval.extract)
+        .join(dataset_paper_association, dataset_paper_association.c.paper_id == Extract.paper_id)
+        .join(unpivot, true())
+        .group_by(ExtractEval.extractor_id, dataset_paper_association.c.dataset_id, unpivot.c.metric)
+    )
+    clear = delete(LeaderboardMetric)
+    if dataset_id is not None:
+        query = query.where(dataset_paper_association.c.dataset_id == dataset_id)
+        clear = clear.where(LeaderboardMetric.dataset_id == dataset_id)
+    if extractor_id is not None:
+        query = query.where(ExtractEval.extractor_id == extractor_id)
+        clear = clear.where(LeaderboardMetric.extractor_id == extractor_id)
+
+    db.execute(clear)
+    rows = db.execute(
+        insert(LeaderboardMetric).from_select(
+            ["extractor_id", "dataset_id", "metric", "value_sum", "value_count", "eval_count"], query
+        )
+    ).rowcount
+    db.commit()
+    return LeaderboardRefreshResult(
+        dataset_id=dataset_id,
+        extractor_id=extractor_id,
+        rows=rows,
+        elapsed_seconds=time.perf_counter() - start,
+    )
+
+
+def get_leaderboard(
+    db: Session,
+    dataset_id: int,
+    metric: Optional[str] = None,
+    extractor_type: Optional[str] = None,
+) -> List[LeaderboardEntry]:
+    """Leaderboard of a dataset, ranked by ``metric`` when given."""
+    query = (
+        select(LeaderboardMetric, Extractor)
+        .join(Extractor, Extractor.id == LeaderboardMetric.extractor_id)
+        .where(LeaderboardMetric.dataset_id == dataset_id)
+        .order_by(LeaderboardMetric.extractor_id, LeaderboardMetric.metric)
+    )
+    if extractor_type is not None:
+        query = query.where(Extractor.extractor_type == extractor_type)
+
+    entries: Dict[int, LeaderboardEntry] = {}
+    for aggregate, extractor in db.execute(query).tuples():
+        entry = entries.get(extractor.id)
+        if entry is None:
+            entry = entries[extractor.id] = LeaderboardEntry(
+                extractor_id=extractor.id,
+                extractor_name=extractor.name,
+                dataset_id=dataset_id,
+            )
+        entry.eval_count = max(entry.eval_count, aggregate.eval_count)
+        entry.metrics[aggregate.metric] = MetricAggregate(
+            mean=aggregate.mean, count=aggregate.value_count, null_rate=aggregate.null_rate
+        )
+
+    ranked = list(entries.values())
+    if metric is not None:
+        sign = 1 if metric in LOWER_IS_BETTER else -1
+
+        def rank(entry: LeaderboardEntry):
+            mean = entry.metrics[metric].mean if metric in entry.metrics else None
+            return (mean is None, sign * mean if mean is not None else 0.0)
+
+        ranked.sort(key=rank)
+    return ranked
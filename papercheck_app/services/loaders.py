@@ -0,0 +1,54 @@
+"""Loader options matching the nesting of each read schema.
+
+Relationships stay lazy on the models; every query that is serialized into
+a read schema adds the options registered here, so a page of N rows costs
+a fixed number of statements instead of 1 + N per nested relationship.
+Collections use ``selectinload`` (one extra ``IN`` query), many-to-one and
+one-to-one relationships ``joinedload``.
+"""
+
+from typing import Dict, Tuple, Type
+
+from pydantic import BaseModel as PydanticModel
+from sqlalchemy.orm import joinedload, selectinload, undefer
+
+from ..models import Dataset, Paper
+from ..schemas import (
+    DatasetRead,
+    DatasetSummary,
+    ExtractEvalRead,
+    ExtractEvalSummary,
+    ExtractorRead,
+    ExtractorSummary,
+    ExtractRead,
+    ExtractReferenceRead,
+    ExtractSummary,
+    GroundTruthRead,
+    PaperRead,
+    PaperSummary,
+)
+
+READ_OPTIONS: Dict[Type[PydanticModel], Tuple] = {
+    PaperRead: (
+        selectinload(Paper.extracts),
+        joinedload(Paper.ground_truth),
+        selectinload(Paper.datasets).undefer(Dataset.paper_ids),
+    ),
+    DatasetRead: (undefer(Dataset.paper_ids),),
+    # Flat schemas: column attributes only
+    PaperSummary: (),
+    DatasetSummary: (),
+    ExtractorRead: (),
+    ExtractorSummary: (),
+    ExtractRead: (),
+    ExtractSummary: (),
+    ExtractReferenceRead: (),
+    ExtractEvalRead: (),
+    ExtractEvalSummary: (),
+    GroundTruthRead: (),
+}
+
+
+def options_for(schema: Type[PydanticModel]) -> Tuple:
+    """Loader options needed to serialize ``schema`` without lazy loads."""
+    return READ_OPTIONS.get(schema, ())
@@ -0,0 +1,169 @@
+"""Dataset membership, read and written directly on ``dataset_papers``.
+
+Nothing here loads ``Paper`` or ``Dataset.papers``: IDs are bound as one
+integer array parameter, additions are ``INSERT ... SELECT ... ON CONFLICT
+DO NOTHING`` and set operations between datasets run as a single
+``UNION`` / ``INTERSECT`` / ``EXCEPT`` feeding the new dataset's rows, so
+the cost is that of the association index, not of the ORM. The papers that
+actually joined or left a dataset are returned by those statements, and
+their evals are added to or subtracted from the dataset's leaderboard
+aggregates in the same transaction.
+"""
+
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Integer, delete, except_, exists, func, intersect, literal, select, union
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from ..models import Dataset, Paper, dataset_paper_association
+from ..schemas import DatasetMembershipCheck, DatasetMembershipResult, DatasetSetOperationResult
+from . import leaderboard
+from .extract_cache import any_id
+from .ingest import touch_datasets
+
+dp = dataset_paper_association
+
+SET_OPERATIONS = {"union": union, "intersection": intersect, "difference": except_}
+
+
+def _unique(paper_ids: Sequence[int]) -> List[int]:
+    return sorted(set(paper_ids))
+
+
+def count_papers(db: Session, dataset_id: int) -> int:
+    """Number of papers in a dataset."""
+    return db.scalar(select(func.count()).select_from(dp).where(dp.c.dataset_id == dataset_id))
+
+
+def list_paper_ids(
+    db: Session, dataset_id: int, after: Optional[int] = None, limit: Optional[int] = None
+) -> List[int]:
+    """Paper IDs of a dataset in ascending order, optionally after ``after``."""
+    query = select(dp.c.paper_id).where(dp.c.dataset_id == dataset_id)
+    if after is not None:
+        query = query.where(dp.c.paper_id > after)
+    return list(db.scalars(query.order_by(dp.c.paper_id).limit(limit)))
+
+
+def unknown_paper_ids(db: Session, paper_ids: Sequence[int]) -> List[int]:
+    """The IDs among ``paper_ids`` that have no paper row."""
+    if not paper_ids:
+        return []
+    requested = func.unnest(literal(_unique(paper_ids), ARRAY(Integer))).table_valued("paper_id").render_derived()
+    return list(
+        db.scalars(
+            select(requested.c.paper_id)
+            .where(~exists().where(Paper.id == requested.c.paper_id))
+            .order_by(requested.c.paper_id)
+        )
+    )
+
+
+def contains_papers(db: Session, dataset_id: int, paper_ids: Sequence[int]) -> DatasetMembershipCheck:
+    """Split ``paper_ids`` into members and non-members of a dataset."""
+    requested = _unique(paper_ids)
+    members = set()
+    if requested:
+        members = set(
+            db.scalars(
+                select(dp.c.paper_id).where(
+                    dp.c.dataset_id == dataset_id, dp.c.paper_id == any_id(requested)
+                )
+            )
+        )
+    return DatasetMembershipCheck(
+        dataset_id=dataset_id,
+        members=[pid for pid in requested if pid in members],
+        non_members=[pid for pid in requested if pid not in members],
+    )
+
+
+def add_papers(db: Session, dataset_id: int, paper_ids: Sequence[int]) -> DatasetMembershipResult:
+    """Attach existing papers to a dataset; IDs without a paper are reported, not added."""
+    requested = _unique(paper_ids)
+    result = DatasetMembershipResult(dataset_id=dataset_id, requested=len(requested))
+    if requested:
+        stmt = (
+            insert(dp)
+            .from_select(
+                ["dataset_id", "paper_id"],
+                select(literal(dataset_id), Paper.id).where(Paper.id == any_id(requested)),
+            )
+            .on_conflict_do_nothing()
+            .returning(dp.c.paper_id)
+        )
+        added = list(db.scalars(stmt))
+        leaderboard.record_membership_change(db, dataset_id, added)
+        result.changed = len(added)
+        result.unknown = unknown_paper_ids(db, requested)
+    return _finish(db, result)
+
+
+def remove_papers(db: Session, dataset_id: int, paper_ids: Sequence[int]) -> DatasetMembershipResult:
+    """Detach papers from a dataset; the papers themselves are kept."""
+    requested = _unique(paper_ids)
+    result = DatasetMembershipResult(dataset_id=dataset_id, requested=len(requested))
+    if requested:
+        stmt = (
+            delete(dp)
+            .where(dp.c.dataset_id == dataset_id, dp.c.paper_id == any_id(requested))
+            .returning(dp.c.paper_id)
+        )
+        removed = list(db.scalars(stmt))
+        leaderboard.record_membership_change(db, dataset_id, removed, sign=-1)
+        result.changed = len(removed)
+    return _finish(db, result)
+
+
+def _finish(db: Session, result: DatasetMembershipResult) -> DatasetMembershipResult:
+    if result.changed:
+        touch_datasets(db, [result.dataset_id])
+    result.paper_count = count_papers(db, result.dataset_id)
+    db.commit()
+    return result
+
+
+def combine_datasets(
+    db: Session,
+    operation: str,
+    dataset_ids: Sequence[int],
+    name: str,
+    description: Optional[str] = None,
+) -> DatasetSetOperationResult:
+    """Create a dataset from the union, intersection or difference of others.
+
+    ``difference`` keeps the papers of the first dataset that are in none of
+    the others. Raises ValueError for an unknown operation or dataset.
+    """
+    if operation not in SET_OPERATIONS:
+        raise ValueError(f"Unknown set operation '{operation}'")
+    missing = set(dataset_ids) - set(db.scalars(select(Dataset.id).where(Dataset.id.in_(dataset_ids))))
+    if missing:
+        raise ValueError(f"Datasets {sorted(missing)} do not exist")
+    if db.scalar(select(Dataset.id).where(Dataset.name == name)) is not None:
+        raise ValueError(f"A dataset named '{name}' already exists")
+
+    try:
+        dataset = Dataset(name=name, description=description)
+        db.add(dataset)
+        db.flush()
+        members = SET_OPERATIONS[operation](
+            *(select(dp.c.paper_id).where(dp.c.dataset_id == id) for id in dataset_ids)
+        ).subquery()
+        stmt = insert(dp).from_select(
+            ["dataset_id", "paper_id"], select(literal(dataset.id), members.c.paper_id)
+        ).returning(dp.c.paper_id)
+        paper_ids = list(db.scalars(stmt))
+        leaderboard.record_membership_change(db, dataset.id, paper_ids)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return DatasetSetOperationResult(
+        dataset_id=dataset.id,
+        name=name,
+        operation=operation,
+        source_dataset_ids=list(dataset_ids),
+        paper_count=len(paper_ids),
+    )
@@ -0,0 +1,140 @@
+"""Metric functions comparing an extract with its ground truth.
+
+All functions take plain Python values (no ORM objects) so they can run in
+worker processes. Missing ground truth gives ``None`` metrics.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+from .rouge import RougeLScorer, rouge_l
+from .similarity import jaro_winkler_matrix, levenshtein
+
+DOI_PATTERN = re.compile(r"^10\.\d{4,9}/\S+$")
+DOI_PREFIXES = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:")
+
+# ExtractEval columns filled by the evaluation engine
+METRIC_COLUMNS = (
+    "title_exact_match",
+    "title_levenshtein_distance",
+    "title_length_ratio",
+    "doi_exact_match",
+    "doi_is_valid",
+    "abstract_rouge_l",
+    "keywords_jaccard_index",
+    "keywords_f1",
+    "keywords_precision",
+    "keywords_recall",
+    "keywords_avg_jaro_winkler",
+    "authors_order_preserved",
+    "authors_f1",
+    "authors_precision",
+    "authors_recall",
+    "authors_jaccard_index",
+    "authors_avg_name_jaro_winkler",
+    "authors_avg_surname_jaro_winkler",
+    "authors_avg_given_name_jaro_winkler",
+    "authors_affiliation_match_rate",
+    "authors_email_match_rate",
+    "refs_f1",
+    "refs_precision",
+    "refs_recall",
+    "refs_jaccard_index",
+    "refs_avg_title_levenshtein",
+)
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Collapse whitespace; ``None`` becomes an empty string."""
+    if not value:
+        return ""
+    return " ".join(value.split())
+
+
+def normalize_doi(value: Optional[str]) -> str:
+    """Lowercase a DOI and strip resolver prefixes."""
+    doi = (value or "").strip().lower()
+    for prefix in DOI_PREFIXES:
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+            break
+    return doi.strip()
+
+
+def title_metrics(extracted: Optional[str], truth: Optional[str]) -> Dict[str, object]:
+    """title_exact_match, title_levenshtein_distance and title_length_ratio."""
+    truth_norm = normalize_text(truth)
+    if not truth_norm:
+        return {
+            "title_exact_match": None,
+            "title_levenshtein_distance": None,
+            "title_length_ratio": None,
+        }
+    extracted_norm = normalize_text(extracted)
+    return {
+        "title_exact_match": extracted_norm == truth_norm,
+        "title_levenshtein_distance": levenshtein(extracted_norm, truth_norm),
+        "title_length_ratio": len(extracted_norm) / len(truth_norm),
+    }
+
+
+def doi_metrics(extracted: Optional[str], truth: Optional[str]) -> Dict[str, object]:
+    """doi_exact_match and doi_is_valid."""
+    extracted_norm = normalize_doi(extracted)
+    truth_norm = normalize_doi(truth)
+    return {
+        "doi_exact_match": extracted_norm == truth_norm if truth_norm else None,
+        "doi_is_valid": bool(DOI_PATTERN.match(extracted_norm)) if extracted_norm else None,
+    }
+
+
+def _keyword_set(keywords: Optional[Iterable[str]]) -> List[str]:
+    seen = {}
+    for keyword in keywords or ():
+        norm = normalize_text(keyword).lower()
+        if norm:
+            seen.setdefault(norm, None)
+    return list(seen)
+
+
+def keyword_metrics(
+    extracted: Optional[Iterable[str]], truth: Optional[Iterable[str]]
+) -> Dict[str, Optional[float]]:
+    """Set overlap and fuzzy similarity between keyword lists."""
+    truth_list = _keyword_set(truth)
+    if not truth_list:
+        return {
+            "keywords_jaccard_index": None,
+            "keywords_f1": None,
+            "keywords_precision": None,
+            "keywords_recall": None,
+            "keywords_avg_jaro_winkler": None,
+        }
+    extracted_list = _keyword_set(extracted)
+    truth_set, extracted_set = set(truth_list), set(extracted_list)
+    overlap = len(truth_set & extracted_set)
+    precision = overlap / len(extracted_set) if extracted_set else 0.0
+    recall = overlap / len(truth_set)
+    f1 = 2 * precision * recall / (precision + recall) if overlap else 0.0
+    # Best fuzzy match in the extracted list for each ground truth keyword
+    if extracted_list:
+        matrix = jaro_winkler_matrix(truth_list, extracted_list)
+        avg_jw = sum(max(row) for row in matrix) / len(truth_list)
+    else:
+        avg_jw = 0.0
+    return {
+        "keywords_jaccard_index": overlap / len(truth_set | extracted_set),
+        "keywords_f1": f1,
+        "keywords_precision": precision,
+        "keywords_recall": recall,
+        "keywords_avg_jaro_winkler": avg_jw,
+    }
+
+
+def abstract_metrics(
+    extracted: Optional[str], truth: Optional[str], scorer: Optional[RougeLScorer] = None
+) -> Dict[str, Optional[float]]:
+    """abstract_rouge_l; ``scorer`` is a prepared RougeLScorer of ``truth``."""
+    if scorer is not None:
+        return {"abstract_rouge_l": scorer.score(extracted)}
+    return {"abstract_rouge_l": rouge_l(extracted, truth)}
@@ -0,0 +1,327 @@
+"""Near-duplicate papers from MinHash signatures of extracted text.
+
+``Paper.pdf_hash`` only catches byte-identical PDFs; a preprint and its
+published version share neither hash nor DOI but have nearly the same title
+and abstract. Each extract gets a MinHash signature of the word 3-shingles of
+its title and abstract, stored as ``NUM_PERM`` packed uint32 (512 bytes),
+whose fraction of equal positions estimates the Jaccard similarity of the
+shingle sets. It is a one-permutation MinHash: every shingle is hashed once
+and the hash picks a bin and a value, each bin keeping its minimum, with
+empty bins filled from the next non-empty one (rotation densification). That
+is one hash per shingle instead of one per shingle and permutation.
+
+Candidates come from LSH banding: the signature is cut into ``BANDS`` bands
+of ``ROWS`` values and each band hashed to one bigint. Two extracts share a
+bucket with probability ``1 - (1 - s**ROWS)**BANDS`` for Jaccard ``s``
+(about 0.71 at the 50% point), and the ``band_hashes`` GIN index answers
+"shares any bucket" with ``&&``, so finding the candidates of one extract is
+an index lookup rather than a comparison with every other extract.
+
+Matching is incremental: when extracts are stored (dispatcher, extract
+cache) their signatures are written and their candidates verified on the
+full signature, and pairs above ``MIN_SIMILARITY`` kept in
+``near_duplicate_pairs``. Clusters are then the connected components of the
+stored pairs above a threshold. ``index_missing`` backfills older extracts.
+"""
+
+import struct
+import sys
+from array import array
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Integer, all_, and_, delete, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session, aliased
+
+from ..models import Extract, ExtractMinHash, NearDuplicatePair, dataset_paper_association
+from ..schemas import DuplicateCluster, DuplicateIndexResult
+from .extract_cache import any_id
+from .rouge import tokenize
+
+SHINGLE_SIZE = 3
+BANDS = 16
+ROWS = 8
+NUM_PERM = BANDS * ROWS
+DEFAULT_THRESHOLD = 0.8
+MIN_SIMILARITY = 0.5  # Lowest stored pair similarity, i.e. lowest usable threshold
+INDEX_BATCH = 2000
+
+_MAX_HASH = (1 << 32) - 1
+_EMPTY = _MAX_HASH + 1
+_ROTATION = 0x9E3779B1  # Offset per bin borrowed across, so borrowed values differ from real ones
+_HASH_KEY = b"papercheck-minhash-1"  # Changing it invalidates every stored signature
+
+
+def shingles(title: Optional[str], abstract: Optional[str]) -> Set[str]:
+    """Word 3-shingles of title and abstract (the words themselves for shorter texts)."""
+    tokens = tokenize(f"{title or ''} {abstract or ''}")
+    if len(tokens) < SHINGLE_SIZE:
+        return set(tokens)
+    return {" ".join(tokens[i : i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(blake2b(shingle.encode(), digest_size=8, key=_HASH_KEY).digest(), "little")
+
+
+def minhash(features: Iterable[str]) -> Optional[List[int]]:
+    """One-permutation MinHash signature of a set of strings, or None for an empty set."""
+    bins = [_EMPTY] * NUM_PERM
+    for feature in features:
+        h = _shingle_hash(feature)
+        index, value = h % NUM_PERM, h >> 32
+        if value < bins[index]:
+            bins[index] = value
+    filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+    if not filled:
+        return None
+    signature = list(bins)
+    for i in range(NUM_PERM):
+        if bins[i] == _EMPTY:
+            distance = next((j - i for j in filled if j > i), filled[0] + NUM_PERM - i)
+            signature[i] = (bins[(i + distance) % NUM_PERM] + distance * _ROTATION) & _MAX_HASH
+    return signature
+
+
+def pack_signature(signature: Sequence[int]) -> bytes:
+    return struct.pack(f"<{len(signature)}I", *signature)
+
+
+def unpack_signature(data: bytes) -> array:
+    signature = array("I")
+    signature.frombytes(data)
+    if sys.byteorder == "big":
+        signature.byteswap()
+    return signature
+
+
+def band_hashes(signature: Sequence[int]) -> List[int]:
+    """One signed 64-bit hash per band; the band index is mixed in so bands never collide."""
+    return [
+        int.from_bytes(
+            blake2b(
+                pack_signature(signature[band * ROWS : (band + 1) * ROWS]),
+                digest_size=8,
+                person=band.to_bytes(2, "little"),
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def signature_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: the fraction of equal signature positions."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def index_extracts(db: Session, extract_ids: List[int]) -> int:
+    """(Re)compute the signatures and pairs of ``extract_ids``; returns the signatures written.
+
+    Extracts without any title or abstract words get no signature. Does not
+    commit, so callers can store it with the extracts themselves.
+    """
+    if not extract_ids:
+        return 0
+    rows = db.execute(
+        select(
+            Extract.id,
+            Extract.extractor_id,
+            Extract.paper_id,
+            Extract.extracted_title,
+            Extract.extracted_abstract,
+        ).where(Extract.id == any_id(extract_ids))
+    )
+    values = []
+    for row in rows:
+        features = shingles(row.extracted_title, row.extracted_abstract)
+        signature = minhash(features)
+        if signature is None:
+            continue
+        values.append(
+            {
+                "extract_id": row.id,
+                "extractor_id": row.extractor_id,
+                "paper_id": row.paper_id,
+                "signature": pack_signature(signature),
+                "band_hashes": band_hashes(signature),
+                "shingle_count": len(features),
+            }
+        )
+    db.execute(
+        delete(NearDuplicatePair).where(
+            or_(
+                NearDuplicatePair.extract_id == any_id(extract_ids),
+                NearDuplicatePair.duplicate_id == any_id(extract_ids),
+            )
+        )
+    )
+    db.execute(
+        delete(ExtractMinHash).where(
+            ExtractMinHash.extract_id == any_id(extract_ids),
+            ExtractMinHash.extract_id != all_(literal([v["extract_id"] for v in values], ARRAY(Integer))),
+        )
+    )
+    if not values:
+        return 0
+    statement = insert(ExtractMinHash).values(values)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ExtractMinHash.extract_id, ExtractMinHash.extractor_id],
+            set_={
+                "paper_id": statement.excluded.paper_id,
+                "signature": statement.excluded.signature,
+                "band_hashes": statement.excluded.band_hashes,
+                "shingle_count": statement.excluded.shingle_count,
+                "updated_at": func.now(),
+            },
+        )
+    )
+    record_pairs(db, [v["extract_id"] for v in values])
+    return len(values)
+
+
+def record_pairs(db: Session, extract_ids: List[int]) -> int:
+    """Store the verified near-duplicate pairs of indexed ``extract_ids``; returns the pairs.
+
+    One GIN lookup (``band_hashes && ...``) per extract finds the candidates
+    among all signatures; each is kept if its similarity is at least
+    ``MIN_SIMILARITY``.
+    """
+    new = aliased(ExtractMinHash)
+    rows = db.execute(
+        select(
+            new.extract_id,
+            new.extractor_id,
+            new.paper_id,
+            new.signature,
+            ExtractMinHash.extract_id.label("other_id"),
+            ExtractMinHash.extractor_id.label("other_extractor_id"),
+            ExtractMinHash.paper_id.label("other_paper_id"),
+            ExtractMinHash.signature.label("other_signature"),
+        )
+        .join(
+            ExtractMinHash,
+            and_(
+                ExtractMinHash.band_hashes.overlap(new.band_hashes),
+                ExtractMinHash.paper_id != new.paper_id,
+            ),
+        )
+        .where(new.extract_id == any_id(extract_ids))
+    )
+    pairs: Dict[Tuple[int, int], dict] = {}
+    for row in rows:
+        a = (row.extract_id, row.extractor_id, row.paper_id)
+        b = (row.other_id, row.other_extractor_id, row.other_paper_id)
+        (extract_id, extractor_id, paper_id), (duplicate_id, duplicate_extractor_id, duplicate_paper_id) = sorted(
+            (a, b)
+        )
+        if (extract_id, duplicate_id) in pairs:
+            continue
+        similarity = signature_similarity(
+            unpack_signature(row.signature), unpack_signature(row.other_signature)
+        )
+        if similarity >= MIN_SIMILARITY:
+            pairs[(extract_id, duplicate_id)] = {
+                "extract_id": extract_id,
+                "extractor_id": extractor_id,
+                "duplicate_id": duplicate_id,
+                "duplicate_extractor_id": duplicate_extractor_id,
+                "paper_id": paper_id,
+                "duplicate_paper_id": duplicate_paper_id,
+                "similarity": similarity,
+            }
+    if pairs:
+        statement = insert(NearDuplicatePair).values(list(pairs.values()))
+        db.execute(
+            statement.on_conflict_do_update(
+                constraint="_near_duplicate_pair_uc",
+                set_={"similarity": statement.excluded.similarity, "updated_at": func.now()},
+            )
+        )
+    return len(pairs)
+
+
+def index_missing(db: Session, batch_size: int = INDEX_BATCH) -> DuplicateIndexResult:
+    """Backfill signatures and pairs for every extract without a signature, committing per batch."""
+    after, scanned, indexed = 0, 0, 0
+    while True:
+        ids = list(
+            db.scalars(
+                select(Extract.id)
+                .outerjoin(ExtractMinHash, ExtractMinHash.extract_id == Extract.id)
+                .where(ExtractMinHash.id.is_(None), Extract.id > after)
+                .order_by(Extract.id)
+                .limit(batch_size)
+            )
+        )
+        if not ids:
+            break
+        indexed += index_extracts(db, ids)
+        db.commit()
+        scanned += len(ids)
+        after = ids[-1]
+    return DuplicateIndexResult(scanned=scanned, indexed=indexed)
+
+
+def _find(parents: Dict[int, int], node: int) -> int:
+    while parents[node] != node:
+        parents[node] = parents[parents[node]]
+        node = parents[node]
+    return node
+
+
+def duplicate_clusters(
+    db: Session, dataset_id: Optional[int] = None, threshold: float = DEFAULT_THRESHOLD
+) -> List[DuplicateCluster]:
+    """Groups of distinct papers whose extracts are near duplicates.
+
+    Clusters are the connected components, over papers, of the stored pairs
+    with a similarity of at least ``threshold``, largest first. Restricted to
+    pairs within the papers of ``dataset_id`` if given.
+    """
+    query = select(
+        NearDuplicatePair.extract_id,
+        NearDuplicatePair.duplicate_id,
+        NearDuplicatePair.paper_id,
+        NearDuplicatePair.duplicate_paper_id,
+        NearDuplicatePair.similarity,
+    ).where(NearDuplicatePair.similarity >= threshold)
+    if dataset_id is not None:
+        members = select(dataset_paper_association.c.paper_id).where(
+            dataset_paper_association.c.dataset_id == dataset_id
+        )
+        query = query.where(
+            NearDuplicatePair.paper_id.in_(members), NearDuplicatePair.duplicate_paper_id.in_(members)
+        )
+    pairs = db.execute(query).all()
+
+    parents: Dict[int, int] = {}
+    for pair in pairs:
+        parents.setdefault(pair.paper_id, pair.paper_id)
+        parents.setdefault(pair.duplicate_paper_id, pair.duplicate_paper_id)
+        root_a, root_b = _find(parents, pair.paper_id), _find(parents, pair.duplicate_paper_id)
+        if root_a != root_b:
+            parents[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters: Dict[int, dict] = {}
+    for pair in pairs:
+        cluster = clusters.setdefault(
+            _find(parents, pair.paper_id), {"paper_ids": set(), "extract_ids": set(), "similarities": []}
+        )
+        cluster["paper_ids"].update((pair.paper_id, pair.duplicate_paper_id))
+        cluster["extract_ids"].update((pair.extract_id, pair.duplicate_id))
+        cluster["similarities"].append(pair.similarity)
+    result = [
+        DuplicateCluster(
+            paper_ids=sorted(cluster["paper_ids"]),
+            extract_ids=sorted(cluster["extract_ids"]),
+            min_similarity=min(cluster["similarities"]),
+            max_similarity=max(cluster["similarities"]),
+        )
+        for cluster in clusters.values()
+    ]
+    result.sort(key=lambda cluster: (-len(cluster.paper_ids), cluster.paper_ids[0]))
+    return result
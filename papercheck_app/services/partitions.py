@@ -0,0 +1,99 @@
+"""Per-extractor partitions of extracts and the tables hanging off them.
+
+extracts, extractevals, extract_minhashes and extract_references are
+partitioned by ``LIST (extractor_id)``, one partition per extractor named
+``<table>_extractor_<id>``. The database creates them when an extractor is
+inserted (trigger on ``extractors`` calling ``create_extractor_partitions``),
+so every writer gets them, whatever the client.
+
+A query restricted to one extractor only reads that extractor's partitions
+and their (smaller) indexes. Dropping an extractor's data detaches its
+partitions and drops them as whole tables, instead of deleting rows one by
+one with the index maintenance, WAL and vacuum work that implies; with
+``archive`` the detached tables are kept, renamed, outside the live tables.
+"""
+
+import re
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from ..models import Extractor, LeaderboardMetric, NearDuplicatePair
+from ..schemas import ExtractorDataDropResult
+
+# Referenced tables first: partitions are created in this order, detached in reverse
+PARTITIONED_TABLES = ("extracts", "extractevals", "extract_minhashes", "extract_references")
+# Partitions and archived partitions, which are managed here rather than by Alembic
+PARTITION_NAME = re.compile(
+    r"^(%s)_extractor_\d+(_archived_\d+)?$" % "|".join(PARTITIONED_TABLES)
+)
+
+
+def partition_name(table: str, extractor_id: int) -> str:
+    return f"{table}_extractor_{int(extractor_id)}"
+
+
+def create_partitions(db: Session, extractor_id: int) -> None:
+    """Create the partitions of an extractor if missing (the insert trigger normally has)."""
+    db.execute(select(func.create_extractor_partitions(extractor_id)))
+
+
+def _foreign_keys(db: Session, table: str) -> List[str]:
+    return list(
+        db.scalars(
+            text("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype = 'f'"),
+            {"table": table},
+        )
+    )
+
+
+def drop_extractor_data(db: Session, extractor_id: int, archive: bool = False) -> ExtractorDataDropResult:
+    """Remove every extract, eval, signature and reference of an extractor by detaching its partitions, and commit.
+
+    The extractor itself is kept, with new empty partitions. Near-duplicate
+    pairs and leaderboard rows involving it are deleted. With ``archive``
+    the detached partitions are renamed to ``<partition>_archived_<UTC
+    timestamp>`` and lose their foreign keys; otherwise they are dropped.
+    Detaching locks the parent tables briefly. Raises ValueError for an
+    unknown extractor.
+    """
+    if db.get(Extractor, extractor_id) is None:
+        raise ValueError(f"Extractor {extractor_id} not found")
+    start = time.perf_counter()
+    result = ExtractorDataDropResult(extractor_id=extractor_id, archived=archive)
+
+    # Pairs span two extractors, so they live in one small unpartitioned table
+    result.pairs_deleted = db.execute(
+        delete(NearDuplicatePair).where(
+            or_(
+                NearDuplicatePair.extractor_id == extractor_id,
+                NearDuplicatePair.duplicate_extractor_id == extractor_id,
+            )
+        )
+    ).rowcount
+    db.execute(delete(LeaderboardMetric).where(LeaderboardMetric.extractor_id == extractor_id))
+
+    suffix = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    for table in reversed(PARTITIONED_TABLES):
+        partition = partition_name(table, extractor_id)
+        if db.scalar(select(func.to_regclass(partition))) is None:
+            continue
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+        if not archive:
+            db.execute(text(f"DROP TABLE {partition}"))
+            result.tables.append(partition)
+            continue
+        # Detached tables keep their foreign keys; an archive must not block the live tables
+        for constraint in _foreign_keys(db, partition):
+            db.execute(text(f'ALTER TABLE {partition} DROP CONSTRAINT "{constraint}"'))
+        archived = f"{partition}_archived_{suffix}"
+        db.execute(text(f"ALTER TABLE {partition} RENAME TO {archived}"))
+        result.tables.append(archived)
+
+    create_partitions(db, extractor_id)
+    db.commit()
+    result.elapsed_seconds = time.perf_counter() - start
+    return result
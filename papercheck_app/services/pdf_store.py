@@ -0,0 +1,221 @@
+"""Content-addressed PDF store.
+
+Each distinct PDF is kept once under ``PDF_STORE_ROOT``, named by its SHA-256
+(the same digest as ``Paper.pdf_hash``) and sharded by hash prefix:
+``<root>/ab/cd/abcd...ef.pdf``, so no directory grows past 65536 entries.
+A PDF referenced by several papers or dataset folders takes space once.
+
+Writes are atomic: content is streamed into a temporary file under
+``<root>/.tmp`` (same filesystem) while it is hashed, fsynced and then
+renamed into place. Readers therefore only ever see complete blobs, and two
+writers of the same content simply replace one identical file with another.
+Blobs are immutable and stored read-only.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional
+
+from sqlalchemy import exists, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from ..core.config import settings
+from ..models import Paper, dataset_paper_association
+from ..schemas import PdfBlob, PdfStoreImportResult
+from .scanner import CHUNK_SIZE
+
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+TMP_DIR = ".tmp"
+BLOB_MODE = 0o444
+
+
+def require_store() -> str:
+    """The store root; raises RuntimeError when the store is not configured."""
+    if not settings.pdf_store_root:
+        raise RuntimeError("The PDF store is not configured: set PDF_STORE_ROOT")
+    return settings.pdf_store_root
+
+
+def blob_path(pdf_hash: str, root: Optional[str] = None) -> str:
+    """Location of the blob for ``pdf_hash``; raises ValueError for a malformed hash."""
+    if not HASH_PATTERN.match(pdf_hash or ""):
+        raise ValueError(f"Not a SHA-256 hex digest: '{pdf_hash}'")
+    shards = [pdf_hash[i * SHARD_WIDTH : (i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS)]
+    return os.path.join(root or require_store(), *shards, f"{pdf_hash}.pdf")
+
+
+def stored_path(pdf_hash: Optional[str]) -> Optional[str]:
+    """Path of the stored blob, or None if the store is off, the hash unknown or not stored."""
+    if not settings.pdf_store_root or not pdf_hash or not HASH_PATTERN.match(pdf_hash):
+        return None
+    path = blob_path(pdf_hash)
+    return path if os.path.isfile(path) else None
+
+
+class BlobWriter:
+    """Stream one PDF into the store: ``write`` chunks, then ``commit`` or ``abort``.
+
+    Usable as a context manager, which aborts unless committed.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or require_store()
+        tmp_dir = os.path.join(self.root, TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix=".part")
+        self.file = os.fdopen(fd, "wb")
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.file.write(chunk)
+        self.digest.update(chunk)
+        self.size += len(chunk)
+
+    @property
+    def pdf_hash(self) -> str:
+        """SHA-256 of the content written so far, the hash ``commit`` publishes under."""
+        return self.digest.hexdigest()
+
+    def commit(self, expected_hash: Optional[str] = None) -> PdfBlob:
+        """Publish the blob under its hash; raises ValueError if it is not ``expected_hash``."""
+        pdf_hash = self.pdf_hash
+        if expected_hash is not None and pdf_hash != expected_hash:
+            self.abort()
+            raise ValueError(f"Content hash {pdf_hash} does not match {expected_hash}")
+        path = blob_path(pdf_hash, self.root)
+        if os.path.isfile(path):
+            self.abort()
+            return PdfBlob(pdf_hash=pdf_hash, size=self.size, created=False)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.chmod(self.tmp_path, BLOB_MODE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self.tmp_path, path)
+        _fsync_dir(os.path.dirname(path))
+        return PdfBlob(pdf_hash=pdf_hash, size=self.size, created=True)
+
+    def abort(self) -> None:
+        if not self.file.closed:
+            self.file.close()
+        try:
+            os.unlink(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.abort()
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist a rename in ``path`` (no-op where directories cannot be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def store_stream(
+    source: BinaryIO, expected_hash: Optional[str] = None, chunk_size: int = CHUNK_SIZE
+) -> PdfBlob:
+    """Copy a readable binary stream into the store."""
+    with BlobWriter() as writer:
+        while chunk := source.read(chunk_size):
+            writer.write(chunk)
+        return writer.commit(expected_hash)
+
+
+def store_file(path: str, expected_hash: Optional[str] = None) -> PdfBlob:
+    """Copy the file at ``path`` into the store, skipping the copy if its hash is already stored."""
+    if expected_hash and stored_path(expected_hash):
+        return PdfBlob(pdf_hash=expected_hash, size=os.path.getsize(path), created=False)
+    with open(path, "rb") as source:
+        return store_stream(source, expected_hash)
+
+
+def _import_one(row) -> tuple:
+    """Store one paper's file; returns ``(row, blob or None, outcome)``."""
+    if row.pdf_hash and stored_path(row.pdf_hash):
+        return row, None, "already_stored"
+    try:
+        return row, store_file(row.pdf_path, row.pdf_hash), "stored"
+    except OSError:
+        return row, None, "missing"
+    except ValueError:
+        return row, None, "mismatched"
+
+
+def import_papers(
+    db: Session, dataset_id: Optional[int] = None, max_workers: Optional[int] = None
+) -> PdfStoreImportResult:
+    """Copy the ``pdf_path`` files of papers (of ``dataset_id``) into the store and commit.
+
+    Files whose content no longer matches the paper's pdf_hash are left out.
+    Papers without a pdf_hash get the hash of their file, unless another
+    paper already has it.
+    """
+    require_store()
+    query = select(Paper.id, Paper.pdf_path, Paper.pdf_hash).where(Paper.pdf_path.isnot(None))
+    if dataset_id is not None:
+        query = query.join(
+            dataset_paper_association, dataset_paper_association.c.paper_id == Paper.id
+        ).where(dataset_paper_association.c.dataset_id == dataset_id)
+    rows = db.execute(query.order_by(Paper.id)).all()
+
+    result = PdfStoreImportResult(dataset_id=dataset_id, papers=len(rows))
+    other = aliased(Paper)
+    workers = max_workers or settings.scan_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for row, blob, outcome in executor.map(_import_one, rows):
+            setattr(result, outcome, getattr(result, outcome) + 1)
+            if blob is None:
+                continue
+            if blob.created:
+                result.bytes_stored += blob.size
+            if row.pdf_hash is None:
+                db.execute(
+                    update(Paper)
+                    .where(Paper.id == row.id, ~exists().where(other.pdf_hash == blob.pdf_hash))
+                    .values(pdf_hash=blob.pdf_hash)
+                    .execution_options(synchronize_session=False)
+                )
+    db.commit()
+    return result
+
+
+def attach_to_paper(db: Session, paper_id: int, pdf_hash: str) -> None:
+    """Record a stored blob as the PDF of a paper that has no pdf_hash yet, and commit.
+
+    Raises ValueError if the paper has a different hash or another paper has this one.
+    """
+    paper = db.get(Paper, paper_id)
+    if paper is None:
+        raise ValueError(f"Paper {paper_id} not found")
+    if paper.pdf_hash == pdf_hash:
+        return
+    if paper.pdf_hash is not None:
+        raise ValueError(f"Paper {paper_id} has pdf_hash {paper.pdf_hash}")
+    owner = db.scalar(select(Paper.id).where(Paper.pdf_hash == pdf_hash))
+    if owner is not None:
+        raise ValueError(f"pdf_hash {pdf_hash} belongs to paper {owner}")
+    paper.pdf_hash = pdf_hash
+    try:
+        db.commit()
+    except IntegrityError:
+        # Attached to another paper since the check
+        db.rollback()
+        raise ValueError(f"pdf_hash {pdf_hash} belongs to another paper")
@@ -0,0 +1,201 @@
+"""Reference-list matching between an extract and its ground truth.
+
+Matching all pairs of 50-300 references is quadratic, so candidates are
+blocked first:
+
+1. identical normalized DOIs are matched directly (no title comparison);
+2. otherwise a pair is only considered if the normalized titles share enough
+   character trigrams (inverted index), and the years, when both are known,
+   differ by at most one.
+
+Blocked candidates are scored with a bounded Levenshtein similarity, the best
+one-to-one assignment is computed per connected component, and the refs_*
+metrics are derived from it.
+"""
+
+import re
+from collections import Counter
+from itertools import chain
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .assignment import max_weight_matching
+from .metrics import normalize_doi
+from .similarity import levenshtein
+
+MATCH_THRESHOLD = 0.8  # minimum title similarity for two references to match
+MIN_SHARED_TRIGRAMS = 0.5  # share of the shorter title's trigrams needed to compare
+MAX_YEAR_GAP = 1
+
+DOI_IN_TEXT = re.compile(r"10\.\d{4,9}/[^\s\"<>]+", re.IGNORECASE)
+YEAR_IN_TEXT = re.compile(r"\b(1[89]\d\d|20\d\d)\b")
+NON_ALNUM = re.compile(r"[^0-9a-z]+")
+LIST_KEYS = ("references", "refs", "biblStruct", "items")
+TITLE_KEYS = ("title", "article_title", "ref_title")
+RAW_KEYS = ("raw", "text", "ref", "reference", "raw_reference")
+YEAR_KEYS = ("year", "date", "published", "pub_year")
+
+
+class Reference(NamedTuple):
+    """A reference normalized once for matching."""
+
+    doi: str
+    title: str
+    year: Optional[int]
+    trigrams: Set[str]
+
+
+def normalize_title(value: Optional[str]) -> str:
+    """Lowercase alphanumeric words separated by single spaces."""
+    return " ".join(NON_ALNUM.split((value or "").lower())).strip()
+
+
+def _trigrams(title: str) -> Set[str]:
+    compact = title.replace(" ", "")
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+def _year(value: Any) -> Optional[int]:
+    if isinstance(value, int):
+        return value
+    match = YEAR_IN_TEXT.search(str(value or ""))
+    return int(match.group(1)) if match else None
+
+
+def _first(item: Dict[str, Any], keys) -> Any:
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return None
+
+
+def reference_items(payload: Any) -> List[Any]:
+    """The list of references inside a refs JSONB value."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in LIST_KEYS:
+            if isinstance(payload.get(key), list):
+                return payload[key]
+    return []
+
+
+def reference_fields(item: Any) -> Tuple[str, str, Optional[str], Optional[int]]:
+    """Raw string, normalized DOI, title and year of one reference given as a dict or a raw string.
+
+    DOI and year fall back to what can be found in the raw string.
+    """
+    if isinstance(item, dict):
+        raw = str(_first(item, RAW_KEYS) or "")
+        doi = normalize_doi(item.get("doi"))
+        title = _first(item, TITLE_KEYS)
+        year = _year(_first(item, YEAR_KEYS))
+    else:
+        raw = str(item or "")
+        doi, title, year = "", None, None
+    if not doi:
+        match = DOI_IN_TEXT.search(raw)
+        doi = normalize_doi(match.group(0).rstrip(".,;")) if match else ""
+    if year is None:
+        year = _year(raw)
+    return raw, doi, str(title) if title else None, year
+
+
+def parse_reference(item: Any) -> Reference:
+    """Normalize one reference given as a dict or a raw string."""
+    raw, doi, title, year = reference_fields(item)
+    title_norm = normalize_title(title or raw)
+    return Reference(doi=doi, title=title_norm, year=year, trigrams=_trigrams(title_norm))
+
+
+def parse_references(payload: Any) -> List[Reference]:
+    """Normalize a refs JSONB value into a list of references."""
+    return [parse_reference(item) for item in reference_items(payload)]
+
+
+def title_similarity(a: str, b: str, threshold: float = MATCH_THRESHOLD) -> float:
+    """1 - normalized edit distance; 0.0 once it is certain to be below ``threshold``."""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 0.0
+    max_distance = int(longest * (1 - threshold))
+    distance = levenshtein(a, b, max_distance)
+    if distance > max_distance:
+        return 0.0
+    return 1 - distance / longest
+
+
+def candidate_pairs(
+    extracted: List[Reference], truth: List[Reference], threshold: float = MATCH_THRESHOLD
+) -> Dict[tuple, float]:
+    """Scored ``(extracted_index, truth_index)`` pairs that survive blocking."""
+    edges: Dict[tuple, float] = {}
+    doi_index: Dict[str, List[int]] = {}
+    trigram_index: Dict[str, List[int]] = {}
+    for j, ref in enumerate(truth):
+        if ref.doi:
+            doi_index.setdefault(ref.doi, []).append(j)
+        for gram in ref.trigrams:
+            trigram_index.setdefault(gram, []).append(j)
+
+    for i, ref in enumerate(extracted):
+        doi_matches = doi_index.get(ref.doi, ()) if ref.doi else ()
+        for j in doi_matches:
+            edges[(i, j)] = 1.0
+        if doi_matches:
+            continue
+
+        shared = Counter(
+            chain.from_iterable(trigram_index.get(gram, ()) for gram in ref.trigrams)
+        )
+        for j, count in shared.items():
+            other = truth[j]
+            if count < MIN_SHARED_TRIGRAMS * min(len(ref.trigrams), len(other.trigrams)):
+                continue
+            if ref.year and other.year and abs(ref.year - other.year) > MAX_YEAR_GAP:
+                continue
+            # Conflicting DOIs mean different works even if the titles are close
+            if ref.doi and other.doi and ref.doi != other.doi:
+                continue
+            score = title_similarity(ref.title, other.title, threshold)
+            if score >= threshold:
+                edges[(i, j)] = score
+    return edges
+
+
+def match_references(
+    extracted: List[Reference], truth: List[Reference], threshold: float = MATCH_THRESHOLD
+) -> List[tuple]:
+    """Optimal one-to-one ``(extracted_index, truth_index, score)`` matches."""
+    return max_weight_matching(candidate_pairs(extracted, truth, threshold))
+
+
+def reference_metrics(extracted_payload: Any, truth_payload: Any) -> Dict[str, Optional[float]]:
+    """refs_f1, refs_precision, refs_recall, refs_jaccard_index and refs_avg_title_levenshtein."""
+    truth = parse_references(truth_payload)
+    if not truth:
+        return {
+            "refs_f1": None,
+            "refs_precision": None,
+            "refs_recall": None,
+            "refs_jaccard_index": None,
+            "refs_avg_title_levenshtein": None,
+        }
+    extracted = parse_references(extracted_payload)
+    matches = match_references(extracted, truth)
+    matched = len(matches)
+    precision = matched / len(extracted) if extracted else 0.0
+    recall = matched / len(truth)
+    f1 = 2 * precision * recall / (precision + recall) if matched else 0.0
+    distances = [
+        levenshtein(extracted[i].title, truth[j].title)
+        for i, j, _ in matches
+        if extracted[i].title and truth[j].title
+    ]
+    return {
+        "refs_f1": f1,
+        "refs_precision": precision,
+        "refs_recall": recall,
+        "refs_jaccard_index": matched / (len(extracted) + len(truth) - matched),
+        "refs_avg_title_levenshtein": sum(distances) / len(distances) if distances else None,
+    }
@@ -0,0 +1,82 @@
+"""ROUGE-L scoring for abstracts.
+
+A ``RougeLScorer`` is built once per reference (ground truth) abstract: the
+reference is tokenized, its tokens interned as integer IDs and turned into one
+position bitmask per distinct token. Each candidate is then scored with the
+bit-parallel LCS of Allison-Dix/Hyyrö, one big-int update per candidate token,
+and candidate tokens absent from the reference are dropped before the LCS since
+they can never match. Callers scoring many candidates against one reference
+keep its scorer, as the evaluation engine does for all extracts of a paper.
+"""
+
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Lowercase word tokens of a text."""
+    return TOKEN_PATTERN.findall((value or "").lower())
+
+
+def f_measure(lcs: int, len_candidate: int, len_reference: int) -> float:
+    """F1 of an LCS length against candidate and reference lengths."""
+    if not lcs:
+        return 0.0
+    precision = lcs / len_candidate
+    recall = lcs / len_reference
+    return 2 * precision * recall / (precision + recall)
+
+
+class RougeLScorer:
+    """ROUGE-L F1 against a fixed reference text, reusable across candidates."""
+
+    __slots__ = ("reference", "token_ids", "reference_ids", "masks", "mask")
+
+    def __init__(self, reference: Optional[str]):
+        self.reference = reference
+        self.token_ids: Dict[str, int] = {}
+        self.reference_ids = array("I")
+        for token in tokenize(reference):
+            self.reference_ids.append(self.token_ids.setdefault(token, len(self.token_ids)))
+
+        self.masks: List[int] = [0] * len(self.token_ids)
+        for position, token_id in enumerate(self.reference_ids):
+            self.masks[token_id] |= 1 << position
+        self.mask = (1 << len(self.reference_ids)) - 1
+
+    def lcs(self, candidate_tokens: Iterable[str]) -> int:
+        """Length of the LCS between the reference and the candidate tokens."""
+        token_ids, masks, mask = self.token_ids, self.masks, self.mask
+        v = mask
+        for token in candidate_tokens:
+            token_id = token_ids.get(token)
+            if token_id is None:
+                continue
+            u = v & masks[token_id]
+            v = ((v + u) | (v - u)) & mask
+        return len(self.reference_ids) - v.bit_count()
+
+    def score(self, candidate: Optional[str]) -> Optional[float]:
+        """ROUGE-L F1 of ``candidate``; ``None`` if the reference is empty."""
+        if not self.reference_ids:
+            return None
+        if candidate == self.reference:
+            return 1.0
+        candidate_tokens = tokenize(candidate)
+        if not candidate_tokens:
+            return 0.0
+        return f_measure(
+            self.lcs(candidate_tokens), len(candidate_tokens), len(self.reference_ids)
+        )
+
+    def score_many(self, candidates: Iterable[Optional[str]]) -> List[Optional[float]]:
+        """Score several candidates, e.g. all extracts of one paper."""
+        return [self.score(candidate) for candidate in candidates]
+
+
+def rouge_l(candidate: Optional[str], reference: Optional[str]) -> Optional[float]:
+    """ROUGE-L F1 between two texts; keep a RougeLScorer to score a reference repeatedly."""
+    return RougeLScorer(reference).score(candidate)
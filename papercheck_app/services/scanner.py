@@ -0,0 +1,243 @@
+"""Dataset folder scanner.
+
+Walks ``Dataset.folder_path`` for PDFs, SHA-256 hashes them across a process
+pool and registers them as papers of the dataset. A manifest of
+``(size, mtime_ns, sha256)`` per file is persisted after every successful scan,
+so files that did not change are neither read nor registered again.
+
+Papers created before their PDF was hashed (a pdf_path without pdf_hash) get
+the hash of the scanned file at that path instead of a second paper row.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import String, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, aliased
+
+from ..core.config import settings
+from ..models import Dataset, Paper
+from ..schemas import DatasetScanResult, PaperCreate
+from . import ingest
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB reads keep memory flat for large PDFs
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = ".papercheck_manifest.json"
+
+
+@dataclass
+class FolderHashes:
+    """Result of hashing a folder, before anything is written to the database."""
+
+    folder: str
+    manifest: Dict[str, List] = field(default_factory=dict)
+    changed: List[str] = field(default_factory=list)  # manifest keys hashed in this run
+    files_seen: int = 0
+    files_hashed: int = 0
+    files_unchanged: int = 0
+    files_failed: int = 0
+    bytes_hashed: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def hash_file(path: str, chunk_size: int = CHUNK_SIZE) -> Tuple[str, Optional[str]]:
+    """Return ``(path, sha256 hex digest)``, or ``(path, None)`` if it cannot be read."""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                digest.update(view[:n])
+    except OSError:
+        return path, None
+    return path, digest.hexdigest()
+
+
+def iter_pdf_files(folder: str) -> Iterator[Tuple[str, int, int]]:
+    """Yield ``(path, size, mtime_ns)`` for every PDF below ``folder``."""
+    stack = [folder]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                        stat = entry.stat()
+                        yield entry.path, stat.st_size, stat.st_mtime_ns
+        except OSError:
+            continue
+
+
+def manifest_path_for(dataset: Dataset) -> str:
+    """Location of the scan manifest for a dataset."""
+    if settings.scan_manifest_dir:
+        return os.path.join(settings.scan_manifest_dir, f"dataset_{dataset.id}.json")
+    return os.path.join(dataset.folder_path, MANIFEST_FILENAME)
+
+
+def load_manifest(path: str) -> Dict[str, List]:
+    """Load a manifest, returning an empty one if missing or from another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(path: str, files: Dict[str, List]) -> None:
+    """Atomically write a manifest."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f)
+    os.replace(tmp_path, path)
+
+
+def hash_folder(
+    folder: str,
+    previous: Optional[Dict[str, List]] = None,
+    max_workers: Optional[int] = None,
+) -> FolderHashes:
+    """Hash all PDFs below ``folder`` that changed since ``previous``.
+
+    Manifest keys are paths relative to ``folder``; entries are
+    ``[size, mtime_ns, sha256]``.
+    """
+    previous = previous or {}
+    result = FolderHashes(folder=folder)
+    start = time.perf_counter()
+
+    to_hash: Dict[str, Tuple[str, int, int]] = {}
+    for path, size, mtime_ns in iter_pdf_files(folder):
+        result.files_seen += 1
+        rel_path = os.path.relpath(path, folder)
+        entry = previous.get(rel_path)
+        if entry and entry[0] == size and entry[1] == mtime_ns and entry[2]:
+            result.manifest[rel_path] = entry
+            result.files_unchanged += 1
+        else:
+            to_hash[path] = (rel_path, size, mtime_ns)
+
+    if to_hash:
+        workers = max_workers or settings.scan_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, min(64, len(to_hash) // (workers * 4)))
+            for path, digest in executor.map(hash_file, to_hash, chunksize=chunksize):
+                rel_path, size, mtime_ns = to_hash[path]
+                if digest is None:
+                    result.files_failed += 1
+                    continue
+                result.manifest[rel_path] = [size, mtime_ns, digest]
+                result.changed.append(rel_path)
+                result.files_hashed += 1
+                result.bytes_hashed += size
+
+    result.elapsed_seconds = time.perf_counter() - start
+    return result
+
+
+def fill_missing_hashes(db: Session, files: Dict[str, str]) -> int:
+    """Set the pdf_hash of papers whose pdf_path is a hashed file and that have none.
+
+    ``files`` maps paths to SHA-256 digests. A digest already used by a
+    paper is left alone, and of several papers (or paths) sharing a digest
+    only the lowest paper ID gets it. Returns the papers updated; does not
+    commit.
+    """
+    if not files:
+        return 0
+    scanned = func.unnest(
+        literal(list(files), ARRAY(String)), literal(list(files.values()), ARRAY(String))
+    ).table_valued("pdf_path", "pdf_hash").render_derived(name="scanned")
+    other = aliased(Paper)
+    targets = (
+        select(func.min(Paper.id).label("id"), scanned.c.pdf_hash)
+        .join(scanned, Paper.pdf_path == scanned.c.pdf_path)
+        .where(
+            Paper.pdf_hash.is_(None),
+            ~exists().where(other.pdf_hash == scanned.c.pdf_hash),
+        )
+        .group_by(scanned.c.pdf_hash)
+        .subquery()
+    )
+    return db.execute(
+        update(Paper)
+        .where(Paper.id == targets.c.id)
+        .values(pdf_hash=targets.c.pdf_hash, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def register_folder_hashes(
+    db: Session, dataset_id: int, hashes: FolderHashes
+) -> DatasetScanResult:
+    """Register the files hashed in this run as papers of the dataset and commit.
+
+    Unchanged files were registered by the scan that put them in the
+    manifest and are not sent again.
+    """
+    files = {
+        os.path.join(hashes.folder, rel_path): hashes.manifest[rel_path][2]
+        for rel_path in hashes.changed
+    }
+    filled = fill_missing_hashes(db, files)
+    papers = (PaperCreate(pdf_path=path, pdf_hash=digest) for path, digest in files.items())
+    ingested = ingest.bulk_ingest_papers(db, papers, dataset_id=dataset_id)
+
+    elapsed = hashes.elapsed_seconds
+    return DatasetScanResult(
+        dataset_id=dataset_id,
+        files_seen=hashes.files_seen,
+        files_hashed=hashes.files_hashed,
+        files_unchanged=hashes.files_unchanged,
+        files_failed=hashes.files_failed,
+        bytes_hashed=hashes.bytes_hashed,
+        elapsed_seconds=hashes.elapsed_seconds,
+        files_per_second=hashes.files_hashed / elapsed if elapsed else 0.0,
+        bytes_per_second=hashes.bytes_hashed / elapsed if elapsed else 0.0,
+        filled=filled,
+        inserted=ingested.inserted,
+        skipped=ingested.skipped,
+        duplicates=ingested.duplicates,
+        attached=ingested.attached,
+    )
+
+
+def scan_dataset(
+    db: Session, dataset_id: int, max_workers: Optional[int] = None
+) -> DatasetScanResult:
+    """Scan a dataset's folder, register its PDFs and persist the manifest.
+
+    Raises ValueError if the dataset does not exist or has no readable folder.
+    """
+    dataset = db.get(Dataset, dataset_id)
+    if dataset is None:
+        raise ValueError(f"Dataset {dataset_id} does not exist")
+    if not dataset.folder_path:
+        raise ValueError(f"Dataset {dataset.id} has no folder_path")
+    if not os.path.isdir(dataset.folder_path):
+        raise ValueError(f"Dataset folder does not exist: {dataset.folder_path}")
+
+    manifest_path = manifest_path_for(dataset)
+    hashes = hash_folder(
+        dataset.folder_path, load_manifest(manifest_path), max_workers=max_workers
+    )
+    result = register_folder_hashes(db, dataset.id, hashes)
+    # Only persist once the papers are committed, so a failed run is re-hashed
+    save_manifest(manifest_path, hashes.manifest)
+    return result
@@ -0,0 +1,176 @@
+"""String similarity kernels used by the evaluation metrics.
+
+Levenshtein uses the Myers/Hyyrö bit-parallel algorithm: one column of the DP
+matrix is kept as bit vectors (Python ints, so any pattern length works) and
+updated per character in O(1) big-int operations, i.e. O(n * ceil(m / w))
+instead of O(n * m). An optional ``max_distance`` stops as soon as the result
+is known to exceed it.
+
+Jaro-Winkler finds matching characters with per-character position bitmasks
+instead of scanning the match window.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+StringPair = Tuple[str, str]
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    """Bitmask of the positions of each character in ``pattern``."""
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _strip_affixes(a: str, b: str) -> Tuple[str, str]:
+    """Drop the common prefix and suffix, which never change the distance."""
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    return a[start:end_a], b[start:end_b]
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Edit distance between ``a`` and ``b``.
+
+    With ``max_distance`` set, any distance above it is reported as
+    ``max_distance + 1``.
+    """
+    if a == b:
+        return 0
+    a, b = _strip_affixes(a, b)
+    if len(a) > len(b):
+        a, b = b, a
+    m, n = len(a), len(b)
+    cutoff = max_distance + 1 if max_distance is not None else None
+    if cutoff is not None and n - m >= cutoff:
+        return cutoff
+    if not m:
+        return n
+
+    masks = _pattern_masks(a)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for j, char in enumerate(b):
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv & mask
+        # Each remaining column can lower the score by at most one
+        if cutoff is not None and score - (n - j - 1) >= cutoff:
+            return cutoff
+    return score
+
+
+def levenshtein_batch(
+    pairs: Sequence[StringPair], max_distance: Optional[int] = None
+) -> List[int]:
+    """Edit distances for a sequence of ``(a, b)`` pairs."""
+    return [levenshtein(a, b, max_distance) for a, b in pairs]
+
+
+def _jaro_with_masks(a: str, b: str, b_masks: Dict[str, int]) -> float:
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return 0.0
+    window = max(max(len_a, len_b) // 2 - 1, 0)
+    flagged_b = 0
+    matches_a = []
+    for i, char in enumerate(a):
+        positions = b_masks.get(char)
+        if not positions:
+            continue
+        lo, hi = max(0, i - window), min(len_b, i + window + 1)
+        candidates = positions & ((1 << hi) - (1 << lo)) & ~flagged_b
+        if candidates:
+            flagged_b |= candidates & -candidates
+            matches_a.append(char)
+    m = len(matches_a)
+    if not m:
+        return 0.0
+
+    half_transpositions = 0
+    k = 0
+    while flagged_b:
+        lowest = flagged_b & -flagged_b
+        if b[lowest.bit_length() - 1] != matches_a[k]:
+            half_transpositions += 1
+        k += 1
+        flagged_b ^= lowest
+    return (m / len_a + m / len_b + (m - half_transpositions / 2) / m) / 3
+
+
+def _winkler(
+    a: str, b: str, jaro: float, prefix_scale: float, boost_threshold: float
+) -> float:
+    if jaro < boost_threshold:
+        return jaro
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def jaro(a: str, b: str) -> float:
+    """Jaro similarity between two strings (0..1)."""
+    if a == b:
+        return 1.0
+    return _jaro_with_masks(a, b, _pattern_masks(b))
+
+
+def jaro_winkler(
+    a: str, b: str, prefix_scale: float = 0.1, boost_threshold: float = 0.7
+) -> float:
+    """Jaro-Winkler similarity between two strings (0..1)."""
+    if a == b:
+        return 1.0
+    return _winkler(a, b, jaro(a, b), prefix_scale, boost_threshold)
+
+
+def jaro_winkler_batch(
+    pairs: Sequence[StringPair], prefix_scale: float = 0.1, boost_threshold: float = 0.7
+) -> List[float]:
+    """Jaro-Winkler similarities for a sequence of ``(a, b)`` pairs."""
+    return [jaro_winkler(a, b, prefix_scale, boost_threshold) for a, b in pairs]
+
+
+def jaro_winkler_matrix(
+    queries: Sequence[str],
+    choices: Sequence[str],
+    prefix_scale: float = 0.1,
+    boost_threshold: float = 0.7,
+) -> List[List[float]]:
+    """Similarity of every query against every choice (``len(queries)`` rows).
+
+    Position masks of each choice are built once and reused for all queries.
+    """
+    choice_masks = [_pattern_masks(choice) for choice in choices]
+    matrix = []
+    for query in queries:
+        row = []
+        for choice, masks in zip(choices, choice_masks):
+            if query == choice:
+                row.append(1.0)
+                continue
+            score = _jaro_with_masks(query, choice, masks)
+            row.append(_winkler(query, choice, score, prefix_scale, boost_threshold))
+        matrix.append(row)
+    return matrix
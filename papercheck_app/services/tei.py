@@ -0,0 +1,86 @@
+"""Minimal GROBID TEI parsing into Extract fields.
+
+Authors and references are emitted in the shape the author and reference
+matchers read (``{"authors": [...]}``, ``{"references": [...]}``).
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional
+
+NS = {"tei": "http://www.tei-c.org/ns/1.0"}
+
+
+def _text(element: Optional[ET.Element]) -> Optional[str]:
+    if element is None:
+        return None
+    text = " ".join("".join(element.itertext()).split())
+    return text or None
+
+
+def _author(element: ET.Element) -> Dict[str, Any]:
+    given = " ".join(
+        t for t in (_text(f) for f in element.findall("tei:persName/tei:forename", NS)) if t
+    )
+    surname = _text(element.find("tei:persName/tei:surname", NS))
+    return {
+        "surname": surname,
+        "given": given or None,
+        "name": " ".join(part for part in (given, surname) if part) or None,
+        "email": _text(element.find("tei:email", NS)),
+        "affiliations": [
+            text
+            for text in (
+                _text(org) for org in element.findall("tei:affiliation/tei:orgName", NS)
+            )
+            if text
+        ],
+    }
+
+
+def _reference(element: ET.Element) -> Dict[str, Any]:
+    title = element.find("tei:analytic/tei:title", NS)
+    if title is None:
+        title = element.find("tei:monogr/tei:title", NS)
+    date = element.find(".//tei:imprint/tei:date", NS)
+    when = date.get("when") if date is not None else None
+    return {
+        "title": _text(title),
+        "doi": _text(element.find(".//tei:idno[@type='DOI']", NS)),
+        "year": when[:4] if when else None,
+        "raw": _text(element.find("tei:note[@type='raw_reference']", NS)),
+    }
+
+
+def parse_tei(xml: bytes) -> Dict[str, Any]:
+    """Extract fields from a GROBID TEI document."""
+    root = ET.fromstring(xml)
+    header = root.find("tei:teiHeader", NS)
+    if header is None:
+        return {}
+    source = header.find("tei:fileDesc/tei:sourceDesc/tei:biblStruct", NS)
+    authors: List[Dict[str, Any]] = []
+    if source is not None:
+        authors = [
+            _author(a)
+            for a in source.findall("tei:analytic/tei:author", NS)
+            if a.find("tei:persName", NS) is not None
+        ]
+    keywords = [
+        text
+        for text in (
+            _text(term) for term in header.findall("tei:profileDesc/tei:textClass/tei:keywords/tei:term", NS)
+        )
+        if text
+    ]
+    return {
+        "extracted_title": _text(header.find("tei:fileDesc/tei:titleStmt/tei:title", NS)),
+        "extracted_doi": _text(header.find(".//tei:sourceDesc//tei:idno[@type='DOI']", NS)),
+        "extracted_abstract": _text(header.find("tei:profileDesc/tei:abstract", NS)),
+        "extracted_keywords": keywords or None,
+        "extracted_authors": {"authors": authors},
+        "extracted_refs": {
+            "references": [
+                _reference(bibl) for bibl in root.findall(".//tei:back//tei:listBibl/tei:biblStruct", NS)
+            ]
+        },
+    }
@@ -0,0 +1,96 @@
+"""Ranked full-text search over extract and ground truth titles and abstracts.
+
+``search_vector`` is a stored generated column (title words weighted A,
+abstract words B) with a GIN index, so matching is an index lookup and the
+vectors never go stale. Queries use ``websearch_to_tsquery`` syntax
+(``"exact phrase"``, ``or``, ``-excluded``).
+
+Results are ordered by ``ts_rank`` and paged by keyset on ``(rank, id)``.
+Ranking needs every match, so a page costs in proportion to the number of
+matching rows; highlighting (``ts_headline``, which re-parses the text) is
+only run for the rows of the page.
+"""
+
+from typing import Optional, Tuple
+
+from sqlalchemy import REAL, and_, cast, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from ..core.pagination import encode_rank_cursor
+from ..models import Extract, GroundTruth
+from ..schemas import Page, TextSearchHit
+
+SEARCH_CONFIG = "english"
+RANK_NORMALIZATION = 1  # divide by 1 + log(document length): long abstracts do not win by size
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, "
+    "MaxFragments=2, FragmentDelimiter=\" ... \""
+)
+TARGETS = {
+    "extracts": (Extract, Extract.extracted_title, Extract.extracted_abstract),
+    "ground_truths": (GroundTruth, GroundTruth.title, GroundTruth.abstract),
+}
+
+
+def _headline(text, query, options: str = HEADLINE_OPTIONS):
+    return func.ts_headline(SEARCH_CONFIG, text, query, options)
+
+
+def search_text(
+    db: Session,
+    target: str,
+    q: str,
+    after: Optional[Tuple[float, int]] = None,
+    limit: int = 50,
+    extractor_id: Optional[int] = None,
+    highlight: bool = True,
+) -> Page[TextSearchHit]:
+    """One page of ``target`` rows matching ``q``, best ranked first.
+
+    ``after`` is the ``(rank, id)`` of the last hit of the previous page.
+    Raises ValueError for an unknown target.
+    """
+    if target not in TARGETS:
+        raise ValueError(f"Unknown search target '{target}'")
+    model, title, abstract = TARGETS[target]
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    matches = select(
+        model.id,
+        model.paper_id,
+        (model.extractor_id if model is Extract else literal(None)).label("extractor_id"),
+        func.ts_rank(model.search_vector, query, RANK_NORMALIZATION).label("rank"),
+    ).where(model.search_vector.bool_op("@@")(query))
+    if extractor_id is not None and model is Extract:
+        matches = matches.where(Extract.extractor_id == extractor_id)
+    matches = matches.subquery("matches")
+
+    page = select(matches)
+    if after is not None:
+        # ts_rank is a real; compare as one so the cursor row itself is excluded
+        rank, id = after
+        rank = cast(literal(rank), REAL)
+        page = page.where(
+            or_(matches.c.rank < rank, and_(matches.c.rank == rank, matches.c.id > id))
+        )
+    page = page.order_by(matches.c.rank.desc(), matches.c.id).limit(limit + 1).subquery("page")
+
+    columns = [page, title.label("title")]
+    if highlight:
+        columns += [
+            _headline(title, query).label("title_highlight"),
+            _headline(abstract, query).label("abstract_highlight"),
+        ]
+    rows = db.execute(
+        select(*columns)
+        .join(model, model.id == page.c.id)
+        .order_by(page.c.rank.desc(), page.c.id)
+    ).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(rows[-1]["rank"], rows[-1]["id"])
+    return Page[TextSearchHit](
+        items=[TextSearchHit.model_validate(dict(row)) for row in rows], next_cursor=next_cursor
+    )
@@ -0,0 +1,89 @@
+"""Shared fixtures.
+
+Tests that need PostgreSQL take the ``db`` (psycopg2) or ``async_db``
+(asyncpg) fixture: a session on the database of ``DATABASE_URL``, migrated
+to head, whose work is rolled back afterwards, commits of the services
+included. They are skipped when no database is configured or reachable.
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from papercheck_app.core.config import settings
+
+DATABASE_CONFIGURED = "://" in settings.database_url
+if not DATABASE_CONFIGURED:
+    # The engines are created on import and need a URL, even one nothing connects to
+    settings.database_url = "postgresql+psycopg2://localhost/papercheck_unconfigured"
+
+
+@pytest.fixture
+def db():
+    """Sync session in a transaction rolled back after the test."""
+    if not DATABASE_CONFIGURED:
+        pytest.skip("DATABASE_URL is not set")
+    from papercheck_app.core.database import engine
+
+    try:
+        connection = engine.connect()
+    except OperationalError as e:
+        pytest.skip(f"Database unreachable: {e.orig}")
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+async def async_db():
+    """Async (asyncpg) session in a transaction rolled back after the test."""
+    if not DATABASE_CONFIGURED:
+        pytest.skip("DATABASE_URL is not set")
+    from papercheck_app.core.database import async_engine
+
+    try:
+        connection = await async_engine.connect()
+    except (OSError, OperationalError) as e:
+        pytest.skip(f"Database unreachable: {e}")
+    transaction = await connection.begin()
+    session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        await session.close()
+        await transaction.rollback()
+        await connection.close()
+        # Pooled asyncpg connections belong to this test's event loop
+        await async_engine.dispose()
+
+
+def leaderboard_rows(db, dataset_id):
+    """``(extractor_id, metric) -> (value_sum, value_count, eval_count)`` of a dataset, empty rows left out."""
+    from papercheck_app.models import LeaderboardMetric
+
+    return {
+        (row.extractor_id, row.metric): (pytest.approx(row.value_sum), row.value_count, row.eval_count)
+        for row in db.scalars(select(LeaderboardMetric).where(LeaderboardMetric.dataset_id == dataset_id))
+        if row.eval_count
+    }
+
+
+@pytest.fixture
+def assert_leaderboard_fresh(db):
+    """Check that the maintained aggregates of a dataset equal a rebuild from extractevals."""
+    from papercheck_app.services import leaderboard
+
+    def check(dataset_id):
+        db.expire_all()
+        maintained = leaderboard_rows(db, dataset_id)
+        leaderboard.rebuild_leaderboard(db, dataset_id=dataset_id)
+        assert maintained == leaderboard_rows(db, dataset_id)
+
+    return check
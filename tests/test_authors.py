@@ -0,0 +1,84 @@
+"""Author-list alignment and the authors_* metrics."""
+
+import pytest
+
+from papercheck_app.services import authors
+
+
+def _align(extracted, truth):
+    return authors.align_authors(authors.parse_authors(extracted), authors.parse_authors(truth))
+
+
+@pytest.mark.parametrize(
+    "surname, code",
+    [
+        ("robert", "r163"),
+        ("rupert", "r163"),
+        ("ashcraft", "a261"),
+        ("tymczak", "t522"),
+        ("pfister", "p236"),
+        ("honeyman", "h555"),
+        ("li", "l000"),
+        ("van der berg", "v536"),
+        ("", ""),
+    ],
+)
+def test_surname_key_is_soundex(surname, code):
+    assert authors.surname_key(surname) == code
+
+
+def test_identical_lists_align_in_order():
+    names = ["Ada Lovelace", "Alan Turing", "Grace Hopper", "Alan Turing"]
+    assert _align(names, names) == [(0, 0, 1.0), (1, 1, 1.0), (2, 2, 1.0), (3, 3, 1.0)]
+
+
+def test_initials_missing_given_names_and_typos_match():
+    truth = ["Jing Wang", "Li Wang", "Hans Müller", "Eva Schmidt"]
+    extracted = ["Wang, L.", "J Wang", "Hans Mulker", "Schmidt"]
+    assert [(i, j) for i, j, _ in _align(extracted, truth)] == [(0, 1), (1, 0), (2, 2), (3, 3)]
+
+
+def test_different_initial_does_not_match():
+    assert _align(["K. Wang"], ["Jing Wang"]) == []
+
+
+def test_large_blocks_are_matched_one_to_one():
+    size = authors.BLOCK_CAP * 3
+    truth = [{"given": f"jing{n}", "surname": "wang"} for n in range(size)]
+    extracted = [{"given": "j", "surname": "wang"}] * size + [{"given": "li", "surname": "wang"}]
+    matches = _align(extracted, truth)
+    assert [i for i, _, _ in matches] == list(range(size))
+    assert sorted(j for _, j, _ in matches) == list(range(size))
+
+
+def test_author_metrics_without_ground_truth_are_null():
+    assert set(authors.author_metrics(["Ada Lovelace"], None).values()) == {None}
+
+
+def test_author_metrics():
+    truth = {
+        "authors": [
+            {"name": "Ada Lovelace", "affiliations": ["University of London"], "email": "ada@example.org"},
+            {"name": "Alan Turing", "affiliations": [{"name": "Cambridge"}]},
+            {"name": "Grace Hopper", "email": "grace@example.org"},
+        ]
+    }
+    extracted = [
+        {"surname": "Turing", "given": "A.", "affiliation": "Cambridge"},
+        {"full_name": "Ada Lovelace", "affiliations": ["University of  London"], "email": "ADA@example.org"},
+        {"name": "Charles Babbage"},
+    ]
+    scores = authors.author_metrics(extracted, truth)
+    assert scores["authors_precision"] == pytest.approx(2 / 3)
+    assert scores["authors_recall"] == pytest.approx(2 / 3)
+    assert scores["authors_f1"] == pytest.approx(2 / 3)
+    assert scores["authors_jaccard_index"] == pytest.approx(2 / 4)
+    assert scores["authors_order_preserved"] is False
+    assert scores["authors_avg_surname_jaro_winkler"] == 1.0
+    assert scores["authors_affiliation_match_rate"] == 1.0
+    assert scores["authors_email_match_rate"] == 1.0
+
+    in_order = authors.author_metrics({"authors": ["Lovelace, Ada", "Turing, Alan", "Hopper, Grace"]}, truth)
+    assert in_order["authors_f1"] == 1.0
+    assert in_order["authors_order_preserved"] is True
+    assert in_order["authors_email_match_rate"] == 0.0
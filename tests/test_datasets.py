@@ -0,0 +1,46 @@
+"""Dataset API routes."""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from papercheck_app.core.database import get_session
+from papercheck_app.models import Dataset, Paper, dataset_paper_association
+
+
+@pytest.fixture
+def client(db):
+    """The app on the test session."""
+    from main import app
+
+    app.dependency_overrides[get_session] = lambda: db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_session)
+
+
+def test_paper_ids_page_with_opaque_cursors(client, db):
+    dataset = Dataset(name=f"test-datasets-{time.time_ns()}")
+    papers = [Paper(pdf_path=f"/datasets/{n}.pdf") for n in range(5)]
+    db.add_all([dataset, *papers])
+    db.flush()
+    db.execute(
+        dataset_paper_association.insert(), [{"dataset_id": dataset.id, "paper_id": paper.id} for paper in papers]
+    )
+    db.flush()
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"/datasets/{dataset.id}/paper_ids", params=params).json()
+        ids += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        assert not cursor.isdigit()
+    assert ids == sorted(paper.id for paper in papers)
+
+    response = client.get(f"/datasets/{dataset.id}/paper_ids", params={"cursor": "not a cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,184 @@
+"""Extraction dispatcher against a local stub GROBID server."""
+
+import asyncio
+import re
+from collections import Counter
+
+from sqlalchemy import select
+
+from papercheck_app.models import Extract, Extractor, Paper
+from papercheck_app.services import dispatcher
+
+TEI = """<TEI xmlns="http://www.tei-c.org/ns/1.0"><teiHeader><fileDesc>
+<titleStmt><title>{title}</title></titleStmt>
+<sourceDesc><biblStruct><analytic><author><persName><forename>Ada</forename><surname>Lovelace</surname></persName></author></analytic></biblStruct></sourceDesc>
+</fileDesc><profileDesc><abstract><p>Stub abstract.</p></abstract></profileDesc></teiHeader>
+<text><back><div><listBibl><biblStruct><analytic><title>A cited work</title></analytic>
+<monogr><imprint><date when="2020"/></imprint></monogr><idno type="DOI">10.1234/cited</idno></biblStruct></listBibl></div></back></text></TEI>"""
+
+
+class StubGrobid:
+    """Keep-alive HTTP/1.1 server answering like GROBID, scripted per PDF file name.
+
+    ``script`` maps a file name to the answers of its successive attempts:
+    ``"ok"`` (TEI), an HTTP status, or ``"slow"`` (TEI after ``slow_seconds``).
+    Unscripted files, and attempts past the script, get TEI.
+    """
+
+    def __init__(self, script=None, delay=0.01, slow_seconds=2.0):
+        self.script = {name: list(answers) for name, answers in (script or {}).items()}
+        self.delay = delay
+        self.slow_seconds = slow_seconds
+        self.attempts = Counter()
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await dispatcher.close_http_client()
+        self.server.close()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(re.search(rb"content-length: *(\d+)", head, re.IGNORECASE).group(1))
+                body = await reader.readexactly(length)
+                name = re.search(rb'filename="([^"]+)"', body).group(1).decode()
+                self.attempts[name] += 1
+                answers = self.script.get(name)
+                answer = answers.pop(0) if answers else "ok"
+
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    await asyncio.sleep(self.slow_seconds if answer == "slow" else self.delay)
+                finally:
+                    self.in_flight -= 1
+                status, payload = (answer, b"error") if isinstance(answer, int) else (200, TEI.format(title=name).encode())
+                writer.write(
+                    b"HTTP/1.1 %d Stub\r\nContent-Type: application/xml\r\nContent-Length: %d\r\n\r\n"
+                    % (status, len(payload)) + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _jobs(tmp_path, count, first_paper_id=1):
+    jobs = []
+    for n in range(count):
+        path = tmp_path / f"paper{n}.pdf"
+        path.write_bytes(b"%PDF-1.7 stub " + bytes(str(n), "ascii"))
+        jobs.append(dispatcher.PdfJob(paper_id=first_paper_id + n, pdf_path=str(path)))
+    return jobs
+
+
+class Batches:
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, rows):
+        self.batches.append(list(rows))
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+
+async def test_concurrency_cap_keep_alive_and_batches(tmp_path):
+    async with StubGrobid(delay=0.02) as stub:
+        run = dispatcher.ExtractionDispatcher(stub.url, 1, concurrency=3, batch_size=4, max_retries=0)
+        writes = Batches()
+        result = await run.run(_jobs(tmp_path, 10), writes)
+
+    assert stub.max_in_flight == 3
+    assert stub.connections <= 3  # requests reuse the pooled connections
+    assert sum(stub.attempts.values()) == 10
+    assert [len(batch) for batch in writes.batches] == [4, 4, 2]
+    assert (result.papers_total, result.succeeded, result.failed) == (10, 10, 0)
+
+    rows = sorted(writes.rows, key=lambda row: row["paper_id"])
+    assert [row["paper_id"] for row in rows] == list(range(1, 11))
+    assert rows[0]["extracted_title"] == "paper0.pdf"
+    assert rows[0]["extracted_refs"]["references"][0]["doi"] == "10.1234/cited"
+    assert all(row["status"] == "completed" and row["extractor_id"] == 1 for row in rows)
+    assert all(row["processing_time_seconds"] >= 0.02 for row in rows)
+
+
+async def test_retries_5xx_with_full_jitter(tmp_path, monkeypatch):
+    bounds = []
+
+    def uniform(low, high):
+        bounds.append((low, high))
+        return 0.0
+
+    monkeypatch.setattr(dispatcher.random, "uniform", uniform)
+    script = {"paper0.pdf": [503, 502], "paper1.pdf": [500, 500, 500], "paper2.pdf": [404]}
+    async with StubGrobid(script) as stub:
+        run = dispatcher.ExtractionDispatcher(stub.url, 1, concurrency=1, max_retries=2)
+        writes = Batches()
+        result = await run.run(_jobs(tmp_path, 3), writes)
+
+    rows = {row["paper_id"]: row for row in writes.rows}
+    assert rows[1]["status"] == "completed"
+    assert rows[2]["status"] == "failed" and "500" in rows[2]["error_message"]
+    # 404 is not transient: no retry
+    assert rows[3]["status"] == "failed" and "404" in rows[3]["error_message"]
+    assert stub.attempts == {"paper0.pdf": 3, "paper1.pdf": 3, "paper2.pdf": 1}
+    assert result.retries == 4
+    # Full jitter: uniform over [0, base * 2**attempt]
+    base = dispatcher.BACKOFF_BASE_SECONDS
+    assert bounds == [(0, base), (0, base * 2)] * 2
+
+
+async def test_timeouts_are_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(dispatcher.random, "uniform", lambda low, high: 0.0)
+    script = {"paper0.pdf": ["slow", "ok"], "paper1.pdf": ["slow", "slow"]}
+    async with StubGrobid(script, slow_seconds=2.0) as stub:
+        run = dispatcher.ExtractionDispatcher(stub.url, 1, concurrency=2, timeout=0.2, max_retries=1)
+        writes = Batches()
+        result = await run.run(_jobs(tmp_path, 2), writes)
+
+    rows = {row["paper_id"]: row for row in writes.rows}
+    assert rows[1]["status"] == "completed"
+    assert rows[1]["processing_time_seconds"] >= 0.2
+    assert rows[2]["status"] == "failed" and "ReadTimeout" in rows[2]["error_message"]
+    assert result.retries == 2
+    assert rows[2]["processing_time_seconds"] < 2.0
+
+
+async def test_batches_are_written_as_extract_rows(db, tmp_path):
+    extractor = Extractor(extractor_type="stub", version="test-dispatcher")
+    papers = [Paper(pdf_path=f"/stub/{n}.pdf") for n in range(5)]
+    db.add_all([extractor, *papers])
+    db.flush()
+
+    async def write(rows):
+        dispatcher.insert_extracts(db, rows)
+
+    jobs = _jobs(tmp_path, 5)
+    for job, paper in zip(jobs, papers):
+        job.paper_id = paper.id
+    async with StubGrobid({"paper4.pdf": [400]}) as stub:
+        run = dispatcher.ExtractionDispatcher(stub.url, extractor.id, concurrency=2, batch_size=2, max_retries=0)
+        await run.run(jobs, write)
+
+    extracts = db.execute(
+        select(Extract.paper_id, Extract.status, Extract.processing_time_seconds, Extract.extracted_title)
+        .where(Extract.extractor_id == extractor.id)
+        .order_by(Extract.paper_id)
+    ).all()
+    assert [row.paper_id for row in extracts] == [paper.id for paper in papers]
+    assert [row.status for row in extracts] == ["completed"] * 4 + ["failed"]
+    assert all(row.processing_time_seconds > 0 for row in extracts)
+    assert extracts[0].extracted_title == "paper0.pdf"
@@ -0,0 +1,66 @@
+"""Pairing, scoring and re-scoring of extracts against ground truths."""
+
+import time
+
+from papercheck_app.models import Extract, Extractor, GroundTruth, Paper
+from papercheck_app.services import evaluation
+
+
+def test_pairs_use_the_latest_ground_truth(db):
+    extractor = Extractor(extractor_type="stub-evaluation", version=str(time.time_ns()))
+    papers = [Paper(pdf_path=f"/evaluation/{n}.pdf") for n in range(2)]
+    db.add_all([extractor, *papers])
+    db.flush()
+    old, new, only = (GroundTruth(paper_id=paper.id) for paper in (papers[0], papers[0], papers[1]))
+    db.add_all([old, new, only])
+    db.flush()
+    extracts = [Extract(paper_id=paper.id, extractor_id=extractor.id) for paper in papers]
+    db.add_all(extracts)
+    db.flush()
+
+    batches = evaluation.iter_pair_batches(db, evaluation.pair_query(None, extractor.id))
+    pairs = [pair for batch in batches for pair in batch]
+    assert [(pair.extract_id, pair.ground_truth_id) for pair in pairs] == [
+        (extracts[0].id, new.id),
+        (extracts[1].id, only.id),
+    ]
+
+
+def _stale_setup(db):
+    extractor = Extractor(extractor_type="stub-evaluation", version=str(time.time_ns()))
+    papers = [Paper(pdf_path=f"/evaluation/stale/{n}.pdf") for n in range(3)]
+    db.add_all([extractor, *papers])
+    db.flush()
+    truths = [GroundTruth(paper_id=paper.id, title=f"Title {paper.id}") for paper in papers]
+    extracts = [Extract(paper_id=paper.id, extractor_id=extractor.id, extracted_title="Title") for paper in papers]
+    db.add_all([*truths, *extracts])
+    db.flush()
+    return extractor, papers, truths, extracts
+
+
+def _stale_extract_ids(db, extractor):
+    batches = evaluation.iter_pair_batches(db, evaluation.pair_query(None, extractor.id, stale_only=True))
+    return [pair.extract_id for batch in batches for pair in batch]
+
+
+def test_evaluate_stale_rescores_only_changed_pairs(db):
+    extractor, papers, truths, extracts = _stale_setup(db)
+    assert evaluation.evaluate_stale(db, extractor_id=extractor.id, max_workers=1).pairs_evaluated == 3
+    assert evaluation.evaluate_stale(db, extractor_id=extractor.id, max_workers=1).pairs_evaluated == 0
+
+    # Same transaction, so updated_at does not move past evaluated_at
+    truths[1].title = "Edited title"
+    db.flush()
+    assert _stale_extract_ids(db, extractor) == [extracts[1].id]
+    assert evaluation.evaluate_stale(db, extractor_id=extractor.id, max_workers=1).pairs_evaluated == 1
+    assert evaluation.evaluate_stale(db, extractor_id=extractor.id, max_workers=1).pairs_evaluated == 0
+
+    extracts[0].extracted_title = "Edited title"
+    newer = GroundTruth(paper_id=papers[2].id, title="Newer title")
+    db.add(newer)
+    db.flush()
+    assert _stale_extract_ids(db, extractor) == [extracts[0].id, extracts[2].id]
+    assert evaluation.evaluate_stale(db, extractor_id=extractor.id, max_workers=1).pairs_evaluated == 2
+    assert evaluation.evaluate_stale(db, extractor_id=extractor.id, max_workers=1).pairs_evaluated == 0
+    db.refresh(extracts[2].extract_eval)
+    assert extracts[2].extract_eval.ground_truth_id == newer.id
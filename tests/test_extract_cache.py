@@ -0,0 +1,36 @@
+"""Reuse of completed extracts across identical extractor configurations."""
+
+from sqlalchemy import select
+
+from papercheck_app.models import Extract, Extractor, Paper
+from papercheck_app.services import extract_cache
+
+
+def test_hits_come_from_identical_extractors(db):
+    # NULL version and variant: the unique constraint lets the identity repeat
+    first = Extractor(extractor_type="stub-cache", config_hash="c" * 64)
+    second = Extractor(extractor_type="stub-cache", config_hash="c" * 64)
+    other = Extractor(extractor_type="stub-cache", config_hash="d" * 64)
+    done, failed, fresh = (Paper(pdf_path=f"/cache/{n}.pdf") for n in range(3))
+    db.add_all([first, second, other, done, failed, fresh])
+    db.flush()
+    db.add_all([
+        Extract(paper_id=done.id, extractor_id=first.id, extracted_title="Done", status="completed"),
+        Extract(paper_id=failed.id, extractor_id=first.id, status="failed"),
+        Extract(paper_id=fresh.id, extractor_id=other.id, status="completed"),
+    ])
+    db.flush()
+    paper_ids = [done.id, failed.id, fresh.id]
+
+    assert sorted(extract_cache.equivalent_extractor_ids(db, second.id)) == sorted([first.id, second.id])
+    pending, cached = extract_cache.papers_needing_extraction(db, second.id, paper_ids)
+    assert pending == [failed.id, fresh.id]
+    assert list(cached) == [done.id] and cached[done.id][1] is False
+
+    copied = extract_cache.copy_cached_extracts(db, second.id, cached)
+    copy = db.execute(select(Extract).where(Extract.id == copied[0])).scalar_one()
+    assert (copy.paper_id, copy.extractor_id, copy.extracted_title) == (done.id, second.id, "Done")
+
+    # The copy is now the extractor's own extract
+    _, cached = extract_cache.papers_needing_extraction(db, second.id, paper_ids)
+    assert cached == {done.id: (copy.id, True)}
@@ -0,0 +1,44 @@
+"""Bulk paper ingestion."""
+
+import hashlib
+
+from sqlalchemy import func, select
+
+from papercheck_app.models import Dataset, dataset_paper_association
+from papercheck_app.schemas import PaperCreate
+from papercheck_app.services import ingest
+
+
+def _papers(count, tag):
+    return [
+        PaperCreate(pdf_path=f"{tag}/{i}.pdf", pdf_hash=hashlib.sha256(f"{tag}-{i}".encode()).hexdigest())
+        for i in range(count)
+    ]
+
+
+def test_statement_chunks_stay_within_bind_limit():
+    rows = [{"a": i, "b": i, "c": i} for i in range(25000)]
+    chunks = list(ingest.statement_chunks(rows))
+    assert [len(chunk) for chunk in chunks] == [10922, 10922, 3156]
+    assert all(len(chunk) * 3 <= ingest.MAX_BIND_PARAMETERS for chunk in chunks)
+    assert list(ingest.statement_chunks([])) == []
+
+
+async def test_batch_over_asyncpg_bind_limit(async_db):
+    """A batch needing more than 32767 parameters goes through asyncpg in several statements."""
+    first, second = Dataset(name="test-ingest-first"), Dataset(name="test-ingest-second")
+    async_db.add_all([first, second])
+    await async_db.flush()
+    papers = _papers(6000, "test-ingest")  # 6 columns per row: 36000 parameters
+
+    result = await async_db.run_sync(ingest.ingest_paper_batch, papers, first.id)
+    assert (result.inserted, result.skipped, result.attached) == (6000, 0, 6000)
+
+    # Known hashes: looked up with one array parameter and attached to the second dataset
+    result = await async_db.run_sync(ingest.ingest_paper_batch, papers, second.id)
+    assert (result.inserted, result.skipped, result.attached) == (0, 6000, 6000)
+
+    members = await async_db.scalar(
+        select(func.count()).where(dataset_paper_association.c.dataset_id == second.id)
+    )
+    assert members == 6000
@@ -0,0 +1,154 @@
+"""Plans of the JSONB search conditions: answered from the GIN indexes."""
+
+import time
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from papercheck_app.models import Extract, Extractor, GroundTruth, Paper
+from papercheck_app.services import extract_references, jsonb_search
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, binds and all."""
+
+    inherit_cache = False
+
+    def __init__(self, statement, analyze=False):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    options = "ANALYZE, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) {compiler.process(element.statement, **kw)}"
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+# Lookups of the matched extracts by key, after the DOI index of extract_references
+KEY_INDEXES = {"extracts_pkey", "ix_extracts_id"}
+
+
+def _plan(db, query, analyze=False):
+    return list(_nodes(db.execute(Explain(query, analyze)).scalar()[0]["Plan"]))
+
+
+def _fill(value, names):
+    """``value`` with ``{doi}`` and ``{surname}`` filled in, in every string it nests."""
+    if isinstance(value, str):
+        return value.format(**names)
+    if isinstance(value, dict):
+        return {key: _fill(item, names) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, names) for item in value]
+    return value
+
+
+def _parent_index(db, name):
+    """The partitioned index a partition's index belongs to, or ``name`` itself."""
+    return db.scalar(
+        text("SELECT inhparent::regclass::text FROM pg_inherits WHERE inhrelid = CAST(:name AS regclass)"),
+        {"name": name},
+    ) or name
+
+
+@pytest.fixture
+def documents(db):
+    """A ground truth and an extract citing a DOI and by an author of their own, among 19 others.
+
+    The DOI and surname are new on every run: rolled back rows of earlier
+    runs leave entries in the indexes until vacuumed.
+    """
+    names = {"doi": f"10.1234/jsonb-{time.time_ns()}", "surname": f"Lovelace{time.time_ns()}"}
+    extractor = Extractor(extractor_type="stub-jsonb", version=str(time.time_ns()))
+    papers = [Paper(pdf_path=f"/jsonb/{n}.pdf") for n in range(20)]
+    db.add_all([extractor, *papers])
+    db.flush()
+    for n, paper in enumerate(papers):
+        surname = names["surname"] if n == 0 else str(n)
+        doi = names["doi"] if n == 0 else f"10.1234/other-{n}"
+        refs = {"references": [{"doi": doi, "title": f"Deep {n}", "year": 2000 + n}]}
+        authors = [{"name": f"Ada {surname}", "surname": surname}]
+        db.add(GroundTruth(paper_id=paper.id, refs=refs, authors=authors))
+        db.add(Extract(paper_id=paper.id, extractor_id=extractor.id, extracted_refs=refs, extracted_authors=authors))
+    db.flush()
+    extract_references.copy_references(
+        db,
+        db.execute(
+            select(Extract.id, Extract.extractor_id, Extract.extracted_refs).where(Extract.extractor_id == extractor.id)
+        ),
+    )
+    # Tiny tables would be read sequentially; the point is whether the index can answer
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    return names
+
+
+REFS_CRITERIA = [
+    {"contains": {"references": [{"doi": "{doi}"}]}},
+    {"path": '$.references[*] ? (@.doi == "{doi}")'},
+    {"match": '$.references[*].doi == "{doi}"'},
+]
+AUTHORS_CRITERIA = [
+    {"contains": [{"surname": "{surname}"}]},
+    {"path": '$[*] ? (@.surname == "{surname}")'},
+    {"match": '$[*].name == "Ada {surname}"'},
+    {"author": "{surname}"},
+]
+CASES = (
+    [("ground_truths", "refs", criteria, "ix_ground_truths_refs_gin") for criteria in REFS_CRITERIA]
+    + [("ground_truths", "refs", {"doi": "{doi}"}, "ix_ground_truths_refs_gin")]
+    + [("ground_truths", "authors", criteria, "ix_ground_truths_authors_gin") for criteria in AUTHORS_CRITERIA]
+    + [("extracts", "refs", criteria, "ix_extracts_extracted_refs_gin") for criteria in REFS_CRITERIA]
+    # Served by extract_references, which also has the references of extracts without a stored payload
+    + [("extracts", "refs", {"doi": "{doi}"}, "ix_extract_references_doi")]
+    + [("extracts", "authors", criteria, "ix_extracts_extracted_authors_gin") for criteria in AUTHORS_CRITERIA]
+)
+
+
+@pytest.mark.parametrize("target,field,criteria,index", CASES)
+def test_conditions_are_index_scans(db, documents, target, field, criteria, index):
+    query = jsonb_search.search_query(target, field, **_fill(criteria, documents))
+    plan = _plan(db, query)
+    # The GIN indexes are read through bitmaps; the btree DOI index may also be scanned directly
+    scans = [node for node in plan if node["Node Type"] in INDEX_SCANS]
+    scanned = {_parent_index(db, node["Index Name"]) for node in scans}
+    assert index in scanned, plan
+    assert scanned - {index} <= KEY_INDEXES, plan
+    assert not [node for node in plan if node["Node Type"] == "Seq Scan"]
+    assert len(db.execute(query).all()) == 1
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "$.references[*] ? (@.year > 2000)",
+        '$.references[*] ? (@.title like_regex "^Deep 1")',
+        '$.references[*] ? (@.title starts with "Deep 1")',
+        "$.references[*].doi",
+        '$.** ? (@ == "{doi}")',
+    ],
+)
+def test_paths_without_equality_read_the_whole_index(db, documents, path):
+    """jsonb_path_ops only indexes path/value hashes: nothing to look up for these paths.
+
+    The plan still shows the GIN index, but the scan returns every indexed
+    document and the heap recheck does the filtering.
+    """
+    query = jsonb_search.search_query("ground_truths", "refs", path=_fill(path, documents))
+    indexed = db.scalar(select(func.count()).where(GroundTruth.refs.isnot(None)))
+    scan = next(node for node in _plan(db, query, analyze=True) if node["Node Type"] == "Bitmap Index Scan")
+    assert scan["Index Name"] == "ix_ground_truths_refs_gin"
+    assert scan["Actual Rows"] >= indexed
+
+    served = jsonb_search.search_query("ground_truths", "refs", **_fill(REFS_CRITERIA[1], documents))
+    scan = next(node for node in _plan(db, served, analyze=True) if node["Node Type"] == "Bitmap Index Scan")
+    assert scan["Actual Rows"] == 1
@@ -0,0 +1,197 @@
+"""Incrementally maintained leaderboard aggregates."""
+
+import hashlib
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from papercheck_app.models import (
+    Dataset,
+    Extract,
+    ExtractEval,
+    Extractor,
+    GroundTruth,
+    LeaderboardMetric,
+    Paper,
+    dataset_paper_association,
+)
+from papercheck_app.schemas import PaperCreate
+from papercheck_app.services import evaluation, ingest, leaderboard, membership, partitions, scanner
+from papercheck_app.services.metrics import METRIC_COLUMNS
+
+from conftest import leaderboard_rows
+
+
+def _eval(extract, truth, rouge, exact=True):
+    return {
+        "extract_id": extract.id,
+        "extractor_id": extract.extractor_id,
+        "ground_truth_id": truth.id,
+        "abstract_rouge_l": rouge,
+        "title_exact_match": exact,
+        "evaluation_details": {},
+    }
+
+
+def _setup(db, papers=3):
+    """A dataset, an extractor and ``papers`` papers with a ground truth and an extract each."""
+    dataset = Dataset(name=f"test-leaderboard-{time.time_ns()}")
+    extractor = Extractor(extractor_type="stub-leaderboard", version=str(time.time_ns()))
+    rows = [Paper(pdf_path=f"/leaderboard/{n}.pdf") for n in range(papers)]
+    db.add_all([dataset, extractor, *rows])
+    db.flush()
+    truths = [GroundTruth(paper_id=paper.id) for paper in rows]
+    extracts = [Extract(paper_id=paper.id, extractor_id=extractor.id) for paper in rows]
+    db.add_all(truths + extracts)
+    db.execute(
+        dataset_paper_association.insert(), [{"dataset_id": dataset.id, "paper_id": paper.id} for paper in rows]
+    )
+    db.flush()
+    return dataset, extractor, rows, truths, extracts
+
+
+def test_eval_deltas():
+    old = [{"extract_id": 1, "extractor_id": 7, "abstract_rouge_l": 0.5}]
+    new = [
+        {"extract_id": 1, "extractor_id": 7, "abstract_rouge_l": None},
+        {"extract_id": 2, "extractor_id": 7, "abstract_rouge_l": 0.25},
+    ]
+    deltas = leaderboard.eval_deltas(old, new, {1: [10, 11], 2: [10]})
+    # Extract 1 keeps its eval (no count change) but loses its value
+    assert deltas[(7, 11, "abstract_rouge_l")] == [-0.5, -1, 0]
+    assert deltas[(7, 10, "abstract_rouge_l")] == [-0.25, 0, 1]
+    assert deltas[(7, 10, "title_exact_match")] == [0.0, 0, 1]
+    assert (7, 11, "title_exact_match") not in deltas
+    assert len(deltas) == len(METRIC_COLUMNS) + 1
+
+
+def test_upserts_keep_aggregates_fresh(db, assert_leaderboard_fresh):
+    dataset, extractor, _, truths, extracts = _setup(db)
+    evaluation.upsert_extractevals(db, [_eval(e, t, 0.5) for e, t in zip(extracts[:2], truths)])
+    assert_leaderboard_fresh(dataset.id)
+
+    rows = [_eval(extracts[0], truths[0], None, False), _eval(extracts[2], truths[2], 0.9)]
+    evaluation.upsert_extractevals(db, rows)
+    assert_leaderboard_fresh(dataset.id)
+    aggregates = leaderboard_rows(db, dataset.id)
+    assert aggregates[(extractor.id, "abstract_rouge_l")] == (pytest.approx(1.4), 2, 3)
+    assert aggregates[(extractor.id, "title_exact_match")] == (pytest.approx(2.0), 3, 3)
+
+
+def test_membership_changes_keep_aggregates_fresh(db, assert_leaderboard_fresh):
+    dataset, extractor, papers, truths, extracts = _setup(db, papers=4)
+    evaluation.upsert_extractevals(
+        db, [_eval(e, t, 0.1 * n, n % 2 == 0) for n, (e, t) in enumerate(zip(extracts, truths))]
+    )
+    other = Dataset(name=f"test-leaderboard-other-{time.time_ns()}")
+    db.add(other)
+    db.flush()
+    ids = [paper.id for paper in papers]
+
+    membership.add_papers(db, other.id, ids[:3])
+    assert_leaderboard_fresh(other.id)
+    assert leaderboard_rows(db, other.id)[(extractor.id, "abstract_rouge_l")] == (pytest.approx(0.3), 3, 3)
+    # Members already: nothing counted twice
+    membership.add_papers(db, other.id, ids[:2])
+    membership.remove_papers(db, other.id, [ids[1], ids[3]])
+    assert_leaderboard_fresh(other.id)
+    assert_leaderboard_fresh(dataset.id)
+    assert leaderboard_rows(db, other.id)[(extractor.id, "abstract_rouge_l")] == (pytest.approx(0.2), 2, 2)
+
+    for operation in membership.SET_OPERATIONS:
+        combined = membership.combine_datasets(db, operation, [dataset.id, other.id], f"{other.name}-{operation}")
+        assert combined.paper_count == {"union": 4, "intersection": 2, "difference": 2}[operation]
+        assert leaderboard_rows(db, combined.dataset_id)[(extractor.id, "title_exact_match")][2] == combined.paper_count
+        assert_leaderboard_fresh(combined.dataset_id)
+
+
+def test_attaching_evaluated_papers_keeps_aggregates_fresh(db, assert_leaderboard_fresh, tmp_path):
+    """Ingest and scans attach papers that already exist, with their evals."""
+    _, extractor, papers, truths, extracts = _setup(db, papers=2)
+    content = b"%PDF leaderboard scan"
+    papers[0].pdf_hash = hashlib.sha256(content).hexdigest()
+    papers[1].pdf_hash = f"{time.time_ns():064d}"
+    evaluation.upsert_extractevals(db, [_eval(e, t, 0.5) for e, t in zip(extracts, truths)])
+    ingested = Dataset(name=f"test-leaderboard-ingest-{time.time_ns()}")
+    scanned = Dataset(name=f"test-leaderboard-scan-{time.time_ns()}", folder_path=str(tmp_path))
+    db.add_all([ingested, scanned])
+    db.flush()
+
+    records = [PaperCreate(pdf_hash=papers[1].pdf_hash), PaperCreate(pdf_path="/leaderboard/new.pdf")]
+    result = ingest.bulk_ingest_papers(db, records, dataset_id=ingested.id)
+    assert (result.inserted, result.skipped, result.attached) == (1, 1, 2)
+    assert leaderboard_rows(db, ingested.id)[(extractor.id, "abstract_rouge_l")] == (pytest.approx(0.5), 1, 1)
+    assert_leaderboard_fresh(ingested.id)
+
+    (tmp_path / "known.pdf").write_bytes(content)
+    result = scanner.scan_dataset(db, scanned.id, max_workers=1)
+    assert (result.inserted, result.skipped, result.attached) == (0, 1, 1)
+    assert leaderboard_rows(db, scanned.id)[(extractor.id, "abstract_rouge_l")] == (pytest.approx(0.5), 1, 1)
+    assert_leaderboard_fresh(scanned.id)
+
+
+@pytest.fixture
+def committed(db):
+    """Committed rows for tests running several transactions, removed afterwards."""
+    from papercheck_app.core.database import SessionLocal
+
+    with SessionLocal() as session:
+        dataset, extractor, papers, truths, extracts = _setup(session, papers=1)
+        session.commit()
+        truth = SimpleNamespace(id=truths[0].id)
+        extract = SimpleNamespace(id=extracts[0].id, extractor_id=extractor.id)
+        ids = (dataset.id, extractor.id, papers[0].id, truth, extract)
+    yield ids
+    dataset_id, extractor_id, paper_id, _, _ = ids
+    with SessionLocal() as session:
+        partitions.drop_extractor_data(session, extractor_id)
+        for table in reversed(partitions.PARTITIONED_TABLES):
+            partition = partitions.partition_name(table, extractor_id)
+            session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+            session.execute(text(f"DROP TABLE {partition}"))
+        session.execute(delete(dataset_paper_association).where(dataset_paper_association.c.dataset_id == dataset_id))
+        session.execute(delete(GroundTruth).where(GroundTruth.paper_id == paper_id))
+        for model, key in ((Dataset, dataset_id), (Paper, paper_id), (Extractor, extractor_id)):
+            session.execute(delete(model).where(model.id == key))
+        session.commit()
+
+
+def test_concurrent_first_upserts_count_once(committed):
+    """Two runs writing the same new eval: the second waits, then replaces the first's values."""
+    from papercheck_app.core.database import engine
+
+    dataset_id, extractor_id, _, truth, extract = committed
+    first, second = Session(engine), Session(engine)
+    try:
+        evaluation.upsert_extractevals(first, [_eval(extract, truth, 0.25)])
+
+        def run_second():
+            evaluation.upsert_extractevals(second, [_eval(extract, truth, 0.75)])
+            second.commit()
+
+        thread = threading.Thread(target=run_second)
+        thread.start()
+        thread.join(0.5)
+        assert thread.is_alive()  # blocked on the first run's uncommitted insert
+        first.commit()
+        thread.join(10)
+        assert not thread.is_alive()
+    finally:
+        first.close()
+        second.close()
+
+    with Session(engine) as check:
+        stored = check.scalar(select(ExtractEval.abstract_rouge_l).where(ExtractEval.extract_id == extract.id))
+        aggregate = check.scalars(
+            select(LeaderboardMetric).where(
+                LeaderboardMetric.dataset_id == dataset_id,
+                LeaderboardMetric.extractor_id == extractor_id,
+                LeaderboardMetric.metric == "abstract_rouge_l",
+            )
+        ).one()
+        assert stored == 0.75
+        assert (aggregate.value_sum, aggregate.value_count, aggregate.eval_count) == (0.75, 1, 1)
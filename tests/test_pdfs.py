@@ -0,0 +1,68 @@
+"""PDF uploads into the content-addressed store."""
+
+import hashlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from papercheck_app.core.config import settings
+from papercheck_app.core.database import get_session
+from papercheck_app.models import Paper
+
+
+@pytest.fixture
+def client(db, tmp_path, monkeypatch):
+    """The app on the test session, with a store under ``tmp_path``."""
+    from main import app
+
+    monkeypatch.setattr(settings, "pdf_store_root", str(tmp_path))
+    app.dependency_overrides[get_session] = lambda: db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_session)
+
+
+def _stored(root):
+    """Files in the store, temporary ones included."""
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*") if path.is_file())
+
+
+def test_upload_attaches_then_publishes(client, db, tmp_path):
+    content = b"%PDF upload test"
+    digest = hashlib.sha256(content).hexdigest()
+    paper = Paper(pdf_path="/upload/new.pdf")
+    db.add(paper)
+    db.flush()
+
+    response = client.post("/pdfs", params={"paper_id": paper.id}, content=content)
+    assert response.status_code == 200
+    assert response.json()["pdf_hash"] == digest and response.json()["created"]
+    db.refresh(paper)
+    assert paper.pdf_hash == digest
+    assert _stored(tmp_path) == [f"{digest[:2]}/{digest[2:4]}/{digest}.pdf"]
+
+
+def test_conflicting_upload_leaves_no_blob(client, db, tmp_path):
+    content = b"%PDF upload conflict test"
+    owner = Paper(pdf_path="/upload/owner.pdf", pdf_hash=hashlib.sha256(content).hexdigest())
+    other = Paper(pdf_path="/upload/other.pdf")
+    db.add_all([owner, other])
+    db.flush()
+
+    response = client.post("/pdfs", params={"paper_id": other.id}, content=content)
+    assert response.status_code == 409
+    assert f"belongs to paper {owner.id}" in response.json()["detail"]
+    db.refresh(other)
+    assert other.pdf_hash is None
+    assert _stored(tmp_path) == []
+
+
+def test_mismatching_upload_leaves_no_blob(client, db, tmp_path):
+    paper = Paper(pdf_path="/upload/hashed.pdf", pdf_hash="0" * 64)
+    db.add(paper)
+    db.flush()
+
+    response = client.post("/pdfs", params={"paper_id": paper.id}, content=b"%PDF other content")
+    assert response.status_code == 422
+    assert _stored(tmp_path) == []
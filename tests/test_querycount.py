@@ -0,0 +1,99 @@
+"""Statement budgets of the read endpoints, so N+1 regressions fail."""
+
+import time
+
+import httpx
+import pytest
+
+from papercheck_app.core.database import get_session
+from papercheck_app.core.querycount import QueryBudgetExceeded, QueryCountMiddleware, count_queries
+from papercheck_app.models import Dataset, Extract, Extractor, GroundTruth, Paper, dataset_paper_association
+
+PAPERS = 5
+# Page, extracts (IN), datasets (IN) with their paper_ids; the ground truth is joined
+LIST_BUDGET = 3
+# Version check, then the paper as on the page
+DETAIL_BUDGET = 4
+
+
+@pytest.fixture
+def papers(db):
+    """Papers with two extracts, a ground truth and two datasets each; returns the papers and a dataset."""
+    extractors = [Extractor(extractor_type="stub-querycount", version=f"{time.time_ns()}-{n}") for n in range(2)]
+    datasets = [Dataset(name=f"test-querycount-{time.time_ns()}-{n}") for n in range(2)]
+    rows = [Paper(pdf_path=f"/querycount/{n}.pdf") for n in range(PAPERS)]
+    db.add_all([*extractors, *datasets, *rows])
+    db.flush()
+    db.add_all([GroundTruth(paper_id=paper.id, title=f"Title {paper.id}") for paper in rows])
+    db.add_all([Extract(paper_id=paper.id, extractor_id=extractor.id) for paper in rows for extractor in extractors])
+    db.execute(
+        dataset_paper_association.insert(),
+        [{"dataset_id": dataset.id, "paper_id": paper.id} for dataset in datasets for paper in rows],
+    )
+    db.flush()
+    # Requests start from an empty session: db.get would return these without the loader options
+    db.expunge_all()
+    return rows, datasets[0].id
+
+
+@pytest.fixture
+def app(db):
+    """The app on the test session."""
+    from main import app
+
+    app.dependency_overrides[get_session] = lambda: db
+    try:
+        yield app
+    finally:
+        app.dependency_overrides.pop(get_session)
+
+
+def _client(app):
+    # In the test's task, so the statement counter set here is seen by the app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_paper_list_is_within_budget(app, papers):
+    papers, dataset_id = papers
+    async with _client(app) as client:
+        with count_queries(LIST_BUDGET) as statements:
+            response = await client.get("/papers", params={"dataset_id": dataset_id, "expand": "true"})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [paper.id for paper in papers]
+    assert all(len(item["extracts"]) == 2 and len(item["datasets"]) == 2 for item in items)
+    assert items[0]["ground_truth"]["title"] == f"Title {papers[0].id}"
+    assert len(statements) == LIST_BUDGET
+
+
+async def test_paper_detail_is_within_budget(app, papers):
+    papers, _ = papers
+    async with _client(app) as client:
+        with count_queries(DETAIL_BUDGET) as statements:
+            response = await client.get(f"/papers/{papers[0].id}")
+    assert response.status_code == 200
+    assert len(response.json()["extracts"]) == 2 and len(response.json()["datasets"]) == 2
+    assert len(statements) == DETAIL_BUDGET
+
+
+async def test_middleware_fails_requests_over_budget(app, papers):
+    _, dataset_id = papers
+    params = {"dataset_id": dataset_id, "expand": "true"}
+    async with _client(QueryCountMiddleware(app, budget=LIST_BUDGET)) as client:
+        response = await client.get("/papers", params=params)
+    assert response.status_code == 200
+    assert response.headers["X-Query-Count"] == str(LIST_BUDGET)
+
+    async with _client(QueryCountMiddleware(app, budget=LIST_BUDGET - 1)) as client:
+        response = await client.get("/papers", params=params)
+    assert response.status_code == 500
+    assert response.json()["detail"] == f"{LIST_BUDGET} SQL statements, budget {LIST_BUDGET - 1}:"
+    assert len(response.json()["statements"]) == LIST_BUDGET
+
+
+def test_count_queries_raises_over_budget(db):
+    db.execute(Paper.__table__.select().limit(1))
+    with pytest.raises(QueryBudgetExceeded, match="2 SQL statements, budget 1"):
+        with count_queries(1):
+            db.execute(Paper.__table__.select().limit(1))
+            db.execute(Paper.__table__.select().limit(1))
@@ -0,0 +1,68 @@
+"""ROUGE-L scoring and its reuse across the extracts of a paper."""
+
+import random
+
+import pytest
+
+from papercheck_app.services import evaluation, rouge
+
+
+def dp_lcs(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b, 1):
+            current.append(previous[j - 1] + 1 if x == y else max(previous[j], current[j - 1]))
+        previous = current
+    return previous[-1]
+
+
+def test_lcs_matches_dp():
+    rng = random.Random(6)
+    words = "the of a model data effect study bias replication power".split()
+    for _ in range(300):
+        reference = [rng.choice(words) for _ in range(rng.randint(0, 120))]
+        candidate = [rng.choice(words + ["unseen"]) for _ in range(rng.randint(0, 120))]
+        scorer = rouge.RougeLScorer(" ".join(reference))
+        assert scorer.lcs(candidate) == dp_lcs(reference, candidate)
+
+
+def test_scores():
+    assert rouge.rouge_l("A study of bias.", "A study of bias.") == 1.0
+    assert rouge.rouge_l("", "a study") == 0.0
+    assert rouge.rouge_l("a study", None) is None
+    # LCS "a of bias" = 3 of 4 candidate and 5 reference tokens
+    assert rouge.rouge_l("a study of bias", "a review of publication bias") == pytest.approx(
+        2 * (3 / 4) * (3 / 5) / (3 / 4 + 3 / 5)
+    )
+
+
+def _pair(extract_id, extractor_id, paper_id, ground_truth_id, extracted_abstract, abstract):
+    return evaluation.EvalPair(
+        extract_id, extractor_id, paper_id, ground_truth_id,
+        None, None, None, None, extracted_abstract, abstract, None, None, None, None, None, None, None, None,
+    )
+
+
+def test_score_batch_prepares_each_ground_truth_once(monkeypatch):
+    built = []
+
+    class CountingScorer(rouge.RougeLScorer):
+        __slots__ = ()
+
+        def __init__(self, reference):
+            built.append(reference)
+            super().__init__(reference)
+
+    monkeypatch.setattr(evaluation, "RougeLScorer", CountingScorer)
+    pairs = [
+        _pair(1, 1, 10, 100, "deep learning of bias", "deep learning and bias"),
+        _pair(2, 2, 10, 100, "deep learning bias", "deep learning and bias"),
+        _pair(3, 3, 10, 100, None, "deep learning and bias"),
+        _pair(4, 1, 11, 101, "power analysis", "a power analysis"),
+    ]
+    rows = evaluation.score_batch(pairs)
+    assert built == ["deep learning and bias", "a power analysis"]
+    assert [row["abstract_rouge_l"] for row in rows] == [
+        rouge.rouge_l(pair.extracted_abstract, pair.abstract) for pair in pairs
+    ]
@@ -0,0 +1,59 @@
+"""Dataset folder scans."""
+
+import hashlib
+import os
+
+from papercheck_app.models import Dataset, Paper
+from papercheck_app.services import membership, scanner
+
+
+def _write(path, content):
+    path.write_bytes(content)
+    return hashlib.sha256(content).hexdigest()
+
+
+def test_scan_registers_only_new_or_changed_files(db, tmp_path):
+    digests = [_write(tmp_path / f"{i}.pdf", f"%PDF scanner test {i}".encode()) for i in range(3)]
+    (tmp_path / "notes.txt").write_text("not a pdf")
+    dataset = Dataset(name="test-scanner", folder_path=str(tmp_path))
+    # Registered by path before anyone hashed it
+    known = Paper(pdf_path=str(tmp_path / "0.pdf"))
+    db.add_all([dataset, known])
+    db.flush()
+
+    result = scanner.scan_dataset(db, dataset.id, max_workers=1)
+    assert (result.files_seen, result.files_hashed, result.files_unchanged) == (3, 3, 0)
+    assert (result.filled, result.inserted, result.skipped, result.attached) == (1, 2, 1, 3)
+    db.refresh(known)
+    assert known.pdf_hash == digests[0]
+    assert membership.count_papers(db, dataset.id) == 3
+
+    result = scanner.scan_dataset(db, dataset.id, max_workers=1)
+    assert (result.files_hashed, result.files_unchanged) == (0, 3)
+    assert (result.filled, result.inserted, result.skipped, result.attached) == (0, 0, 0, 0)
+
+    changed = tmp_path / "1.pdf"
+    _write(changed, b"%PDF scanner test 1, second version")
+    os.utime(changed, ns=(0, 10**9))
+    result = scanner.scan_dataset(db, dataset.id, max_workers=1)
+    assert (result.files_hashed, result.files_unchanged, result.inserted) == (1, 2, 1)
+
+
+def test_fill_missing_hashes_keeps_pdf_hash_unique(db):
+    taken = Paper(pdf_path="/scan/taken.pdf", pdf_hash="a" * 64)
+    first, second = Paper(pdf_path="/scan/copy-1.pdf"), Paper(pdf_path="/scan/copy-2.pdf")
+    unhashed = Paper(pdf_path="/scan/taken-copy.pdf")
+    db.add_all([taken, first, second, unhashed])
+    db.flush()
+
+    filled = scanner.fill_missing_hashes(
+        db,
+        {
+            "/scan/copy-1.pdf": "b" * 64,
+            "/scan/copy-2.pdf": "b" * 64,  # same content under two paths
+            "/scan/taken-copy.pdf": "a" * 64,  # content already has a paper
+        },
+    )
+    assert filled == 1
+    db.expire_all()
+    assert (first.pdf_hash, second.pdf_hash, unhashed.pdf_hash) == ("b" * 64, None, None)
@@ -0,0 +1,166 @@
+"""String similarity kernels against plain reference implementations."""
+
+import random
+
+import pytest
+
+from papercheck_app.services import similarity
+
+
+def dp_levenshtein(a, b):
+    """Textbook O(n·m) edit distance."""
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def direct_jaro(a, b):
+    """Jaro similarity scanning the match window character by character."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(max(len(a), len(b)) // 2 - 1, 0)
+    flagged = [False] * len(b)
+    matched_a = []
+    for i, x in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not flagged[j] and b[j] == x:
+                flagged[j] = True
+                matched_a.append(x)
+                break
+    m = len(matched_a)
+    if not m:
+        return 0.0
+    matched_b = [y for y, flag in zip(b, flagged) if flag]
+    transpositions = sum(x != y for x, y in zip(matched_a, matched_b)) / 2
+    return (m / len(a) + m / len(b) + (m - transpositions) / m) / 3
+
+
+def direct_jaro_winkler(a, b, prefix_scale=0.1, boost_threshold=0.7):
+    score = direct_jaro(a, b)
+    if score < boost_threshold:
+        return score
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return score + prefix * prefix_scale * (1 - score)
+
+
+EDGE_PAIRS = [
+    ("", ""),
+    ("", "abc"),
+    ("abc", ""),
+    ("a", "a"),
+    ("a", "b"),
+    ("abc", "abc"),
+    ("kitten", "sitting"),
+    ("martha", "marhta"),
+    ("dixon", "dicksonx"),
+    ("crate", "trace"),
+    ("ab", "ba"),
+    ("a" * 64, "a" * 63 + "b"),  # exactly one machine word
+    ("a" * 65, "b" + "a" * 64),  # one past it
+    ("x" * 200, "y" * 150),
+    ("Deep learning for " * 8, "Deep Learning for " * 8 + "science"),
+    ("Müller", "Mueller"),
+    ("naïve café", "naive cafe"),
+    ("日本語の論文", "日本の論文"),
+    ("Ωmega 🙂", "omega 🙂"),
+]
+
+
+def _random_pairs(count, seed):
+    rng = random.Random(seed)
+    alphabet = "abcde éü語🙂"
+    pairs = []
+    for _ in range(count):
+        a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 140)))
+        if rng.random() < 0.5:
+            # A mutated copy, so distances near the cutoffs are common
+            b = list(a)
+            for _ in range(rng.randint(0, 10)):
+                position = rng.randint(0, len(b))
+                operation = rng.choice("ids")
+                if operation == "i":
+                    b.insert(position, rng.choice(alphabet))
+                elif b and position < len(b):
+                    if operation == "d":
+                        del b[position]
+                    else:
+                        b[position] = rng.choice(alphabet)
+            b = "".join(b)
+        else:
+            b = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 140)))
+        pairs.append((a, b))
+    return pairs
+
+
+PAIRS = EDGE_PAIRS + _random_pairs(400, seed=5)
+
+
+@pytest.mark.parametrize("a, b", EDGE_PAIRS)
+def test_levenshtein_edge_cases(a, b):
+    assert similarity.levenshtein(a, b) == dp_levenshtein(a, b)
+    assert similarity.levenshtein(b, a) == dp_levenshtein(a, b)
+
+
+def test_levenshtein_matches_dp():
+    expected = [dp_levenshtein(a, b) for a, b in PAIRS]
+    assert [similarity.levenshtein(a, b) for a, b in PAIRS] == expected
+    assert similarity.levenshtein_batch(PAIRS) == expected
+
+
+def test_bounded_levenshtein_at_and_past_cutoff():
+    for a, b in PAIRS:
+        distance = dp_levenshtein(a, b)
+        # At the cutoff the exact distance comes back, just past it the cutoff + 1
+        assert similarity.levenshtein(a, b, max_distance=distance) == distance
+        if distance:
+            assert similarity.levenshtein(a, b, max_distance=distance - 1) == distance
+        for max_distance in (0, 1, 5, 20):
+            assert similarity.levenshtein(a, b, max_distance) == min(distance, max_distance + 1)
+
+
+def test_bounded_levenshtein_batch():
+    for max_distance in (0, 3, 12):
+        assert similarity.levenshtein_batch(PAIRS, max_distance) == [
+            min(dp_levenshtein(a, b), max_distance + 1) for a, b in PAIRS
+        ]
+
+
+def test_jaro_winkler_matches_direct():
+    expected = [direct_jaro_winkler(a, b) for a, b in PAIRS]
+    assert similarity.jaro_winkler_batch(PAIRS) == pytest.approx(expected, abs=1e-12)
+    assert [similarity.jaro(a, b) for a, b in PAIRS] == pytest.approx(
+        [direct_jaro(a, b) for a, b in PAIRS], abs=1e-12
+    )
+
+
+def test_jaro_winkler_parameters():
+    pairs = EDGE_PAIRS[:12]
+    assert similarity.jaro_winkler_batch(pairs, prefix_scale=0.2, boost_threshold=0.5) == pytest.approx(
+        [direct_jaro_winkler(a, b, 0.2, 0.5) for a, b in pairs], abs=1e-12
+    )
+
+
+def test_jaro_winkler_known_values():
+    assert similarity.jaro_winkler("martha", "marhta") == pytest.approx(0.9611, abs=1e-4)
+    assert similarity.jaro_winkler("dixon", "dicksonx") == pytest.approx(0.8133, abs=1e-4)
+    assert similarity.jaro_winkler("", "") == 1.0
+    assert similarity.jaro_winkler("", "a") == 0.0
+
+
+def test_jaro_winkler_matrix():
+    queries = [a for a, _ in PAIRS[:40]]
+    choices = [b for _, b in PAIRS[:25]]
+    matrix = similarity.jaro_winkler_matrix(queries, choices)
+    assert len(matrix) == len(queries)
+    for query, row in zip(queries, matrix):
+        assert row == pytest.approx([direct_jaro_winkler(query, choice) for choice in choices], abs=1e-12)